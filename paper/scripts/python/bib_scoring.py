@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Timestamp: "2026-10-19 21:12:40 (ywatanabe)"
+# File: /ssh:sp:/home/ywatanabe/proj/neurovista/paper/scripts/python/bib_scoring.py
+# ----------------------------------------
+from __future__ import annotations
+import os
+__FILE__ = (
+    "./scripts/python/bib_scoring.py"
+)
+__DIR__ = os.path.dirname(__FILE__)
+# ----------------------------------------
+
+"""
+Scoring formulas for explore_bibtex.py
+
+Functionalities:
+  - Scores a whole Papers collection per formula in one vectorized
+    expression over its columns (citation_count, journal_impact_factor,
+    year), with NaN for missing values
+  - Built-in formulas:
+    - linear: weighted citations + IF (weights citations=1,
+      impact_factor=10), the original composite score
+    - citations_per_year: citations / years since publication
+    - log_citations_if: log(1 + citations) * (IF + impact_factor_offset)
+  - Combines formulas as a weighted sum ("citations_per_year 10*linear")
+  - Registers new formulas with @formula
+
+Dependencies:
+  - packages:
+    - numpy
+
+IO:
+  - input-files:
+    - None
+  - output-files:
+    - None
+
+Usage:
+  scoring = Scoring(["log_citations_if", "0.5*citations_per_year"],
+                    weights={"min_age": 2})
+  scores = scoring(papers)  # one float per paper
+"""
+
+import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+FORMULAS: Dict[str, Tuple[Callable, Dict[str, Optional[float]]]] = {}
+
+
+def formula(name: str, **defaults: Optional[float]):
+    """Registers a scoring formula and its tunable weights.
+
+    The decorated function receives the Papers collection and the resolved
+    weights, and returns one float per paper.
+    """
+
+    def register(func: Callable) -> Callable:
+        FORMULAS[name] = (func, defaults)
+        return func
+
+    return register
+
+
+def _filled(papers, name: str) -> np.ndarray:
+    return np.nan_to_num(papers.column(name))
+
+
+@formula("linear", citations=1.0, impact_factor=10.0)
+def linear(papers, w: dict) -> np.ndarray:
+    """The original composite score (missing values count as 0)."""
+    return (
+        _filled(papers, "citation_count") * w["citations"]
+        + _filled(papers, "journal_impact_factor") * w["impact_factor"]
+    )
+
+
+@formula("citations_per_year", min_age=1.0, reference_year=None)
+def citations_per_year(papers, w: dict) -> np.ndarray:
+    """Citations per year since publication; NaN when the year is unknown.
+
+    Ages below `min_age` are raised to it, so this year's papers are not
+    divided by zero. `reference_year` defaults to the current year.
+    """
+    reference_year = w["reference_year"] or datetime.date.today().year
+    age = np.maximum(reference_year - papers.column("year"), w["min_age"])
+    return _filled(papers, "citation_count") / age
+
+
+@formula("log_citations_if", impact_factor_offset=1.0)
+def log_citations_if(papers, w: dict) -> np.ndarray:
+    """log(1 + citations) scaled by impact factor.
+
+    The offset keeps papers in journals without an impact factor ranked by
+    their citations instead of all scoring 0.
+    """
+    return np.log1p(_filled(papers, "citation_count")) * (
+        _filled(papers, "journal_impact_factor") + w["impact_factor_offset"]
+    )
+
+
+def parse_term(term: str) -> Tuple[float, str]:
+    """Parses "name" or "factor*name" into (factor, name)."""
+    factor, _, name = term.rpartition("*")
+    try:
+        return (float(factor) if factor else 1.0), name.strip()
+    except ValueError:
+        raise ValueError(f"Invalid scoring term: {term!r}") from None
+
+
+def parse_weights(items: Iterable[str]) -> Dict[str, float]:
+    """Parses ["key=value", ...] command-line weights."""
+    weights = {}
+    for item in items:
+        key, _, value = item.partition("=")
+        try:
+            weights[key.strip()] = float(value)
+        except ValueError:
+            raise ValueError(
+                f"Invalid weight {item!r}, expected key=value"
+            ) from None
+    return weights
+
+
+class Scoring:
+    """Weighted sum of registered formulas over a whole Papers collection.
+
+    Weights are shared by name across the selected formulas; a weight no
+    selected formula takes is an error rather than silently ignored.
+    """
+
+    def __init__(
+        self,
+        terms: Iterable[Union[str, Tuple[float, str]]] = ("linear",),
+        weights: Optional[Dict[str, float]] = None,
+    ):
+        self.terms: List[Tuple[float, str]] = [
+            parse_term(t) if isinstance(t, str) else tuple(t) for t in terms
+        ]
+        unknown = [name for _, name in self.terms if name not in FORMULAS]
+        if unknown:
+            raise ValueError(
+                f"Unknown scoring formula(s) {', '.join(unknown)}; "
+                f"available: {', '.join(FORMULAS)}"
+            )
+
+        self.weights: Dict[str, Optional[float]] = {}
+        for _, name in self.terms:
+            self.weights.update(FORMULAS[name][1])
+        extra = set(weights or {}) - set(self.weights)
+        if extra:
+            raise ValueError(
+                f"Unknown weight(s) {', '.join(sorted(extra))}; "
+                f"available: {', '.join(self.weights)}"
+            )
+        self.weights.update(weights or {})
+
+    def __call__(self, papers) -> np.ndarray:
+        scores = np.zeros(len(papers))
+        for factor, name in self.terms:
+            scores += factor * FORMULAS[name][0](papers, self.weights)
+        return scores
+
+    def __repr__(self) -> str:
+        return " + ".join(
+            name if factor == 1.0 else f"{factor:g}*{name}"
+            for factor, name in self.terms
+        )
+
+# EOF
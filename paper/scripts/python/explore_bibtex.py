@@ -15,9 +15,12 @@ __DIR__ = os.path.dirname(__FILE__)
 BibTeX Explorer - Analyze and filter bibliography using scitex.scholar
 
 Functionalities:
-  - Loads BibTeX file with Papers.from_bibtex()
-  - Filters by citation count, impact factor, year, keywords
-  - Sorts by multiple criteria
+  - Loads BibTeX file with Papers.from_bibtex(), or streams it entry by
+    entry for very large files (--stream)
+  - Filters by citation count, impact factor, year, keywords (full-text
+    index with AND/OR, phrase and prefix queries, ranked by BM25)
+  - Sorts by multiple criteria, including pluggable score formulas
+    (bib_scoring.py); with --limit only the top rows are fully sorted
   - Compares against currently cited papers in manuscript
   - Identifies high-impact uncited papers
   - Exports filtered results
@@ -25,27 +28,45 @@ Functionalities:
 Dependencies:
   - packages:
     - scitex.scholar
+    - numpy
     - argparse
     - pathlib
 
 IO:
   - input-files:
     - BibTeX file (enriched with citation_count, journal_impact_factor)
-    - Manuscript .tex files (for cited papers comparison)
+    - Manuscript, supplementary and revision .tex files (for cited papers
+      comparison)
 
   - output-files:
     - Filtered results to stdout or file
+    - .<name>.bib.cache.pkl next to the BibTeX file (parsed-entry cache)
+    - .<name>.bib.index.pkl next to the BibTeX file (full-text index)
+    - ./.cited_keys.cache.pkl (cite keys per .tex file)
 """
 
 import argparse
+import bisect
+import difflib
+import hashlib
+import pickle
 import re
 import sys
+import unicodedata
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Set
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Set
+
+import numpy as np
+
+from bib_scoring import FORMULAS, Scoring, parse_weights
 
 # Import bibtexparser
 try:
     import bibtexparser
+    from bibtexparser.bibdatabase import STANDARD_TYPES
+    from bibtexparser.bparser import BibTexParser
 except ImportError:
     print(
         "Error: bibtexparser is required. Install with: pip install bibtexparser"
@@ -75,10 +96,61 @@ class Paper:
 
 
 class Papers:
-    """Lightweight Papers collection."""
+    """Lightweight Papers collection backed by column arrays.
+
+    Numeric fields (year, citation_count, journal_impact_factor) are float
+    arrays with NaN for missing values, so filters compose into one boolean
+    mask instead of rebuilding a list per criterion.
+    """
 
-    def __init__(self, papers: List[Paper]):
+    NUMERIC_FIELDS = ("year", "citation_count", "journal_impact_factor")
+    TEXT_FIELDS = ("key", "title", "journal", "abstract", "doi")
+
+    def __init__(
+        self,
+        papers: List[Paper],
+        columns: Optional[dict] = None,
+        indexes: Optional[dict] = None,
+    ):
         self._papers = papers
+        self._columns = (
+            columns if columns is not None else self._build_columns(papers)
+        )
+        # Indexes over this collection, built on first use and shared with
+        # every `take` result (their document ids are the "row" column)
+        self._indexes = (
+            indexes
+            if indexes is not None
+            else {
+                "build": {
+                    "text": self._build_text_index,
+                    "author": self._build_author_index,
+                }
+            }
+        )
+
+    @classmethod
+    def _build_columns(cls, papers: List[Paper]) -> dict:
+        columns = {}
+        for field in cls.NUMERIC_FIELDS:
+            columns[field] = np.array(
+                [
+                    np.nan if getattr(p, field) is None else getattr(p, field)
+                    for p in papers
+                ],
+                dtype=np.float64,
+            )
+        for field in cls.TEXT_FIELDS:
+            columns[field] = _object_array(
+                [getattr(p, field) or "" for p in papers]
+            )
+        # Document id in the text index shared by derived collections
+        columns["row"] = np.arange(len(papers))
+        # Lowercased journal names for the partial --journal match
+        columns["journal_text"] = _object_array(
+            [(p.journal or "").lower() for p in papers]
+        )
+        return columns
 
     def __len__(self):
         return len(self._papers)
@@ -89,149 +161,169 @@ class Papers:
     def __getitem__(self, index):
         return self._papers[index]
 
+    def column(self, name: str) -> np.ndarray:
+        """Returns a column array (e.g. "citation_count", "key")."""
+        return self._columns[name]
+
+    def take(self, indices: np.ndarray) -> "Papers":
+        """Returns the papers at `indices`, in that order."""
+        indices = np.asarray(indices, dtype=np.intp)
+        return Papers(
+            [self._papers[i] for i in indices],
+            {name: col[indices] for name, col in self._columns.items()},
+            self._indexes,
+        )
+
+    def _index(self, name: str):
+        if name not in self._indexes:
+            self._indexes[name] = self._indexes["build"].pop(name)()
+        return self._indexes[name]
+
+    def _build_text_index(self) -> "TextIndex":
+        return TextIndex.build(
+            [p.title or "", p.abstract or ""] + p.keywords for p in self._papers
+        )
+
+    def text_index(self) -> "TextIndex":
+        """Full-text index over title, abstract and keywords.
+
+        Built (or read from its sidecar) on first use and shared with every
+        collection taken from this one.
+        """
+        return self._index("text")
+
+    def _build_author_index(self) -> "AuthorIndex":
+        return AuthorIndex.build(p.authors for p in self._papers)
+
+    def author_index(self) -> "AuthorIndex":
+        """Normalized author-name index, shared like `text_index`."""
+        return self._index("author")
+
+    def relevance(self, query: str) -> np.ndarray:
+        """BM25 score of each paper for a `TextIndex` query (0 if unmatched)."""
+        _, scores = self.text_index().search(query)
+        return scores[self._columns["row"]]
+
     @classmethod
-    def from_bibtex(cls, filepath: Path) -> "Papers":
-        """Load papers from BibTeX file."""
-        with open(filepath, "r", encoding="utf-8") as f:
-            bib_db = bibtexparser.load(f)
-
-        papers = []
-        for entry in bib_db.entries:
-            # Parse fields
-            authors = []
-            if "author" in entry:
-                authors = [a.strip() for a in entry["author"].split(" and ")]
-
-            year = None
-            if "year" in entry:
-                try:
-                    year = int(entry["year"])
-                except ValueError:
-                    pass
-
-            citation_count = None
-            if "citation_count" in entry:
-                try:
-                    citation_count = int(entry["citation_count"])
-                except ValueError:
-                    pass
-
-            impact_factor = None
-            if "journal_impact_factor" in entry:
-                try:
-                    impact_factor = float(entry["journal_impact_factor"])
-                except ValueError:
-                    pass
-
-            keywords = []
-            if "keywords" in entry:
-                keywords = [k.strip() for k in entry["keywords"].split(",")]
-
-            paper = Paper(
-                key=entry.get("ID", ""),
-                title=entry.get("title", "").strip("{}"),
-                authors=authors,
-                year=year,
-                journal=entry.get("journal", ""),
-                citation_count=citation_count,
-                journal_impact_factor=impact_factor,
-                abstract=entry.get("abstract", ""),
-                doi=entry.get("doi", ""),
-                keywords=keywords,
-                _original_entry=entry,
+    def from_bibtex(cls, filepath: Path, use_cache: bool = True) -> "Papers":
+        """Load papers from BibTeX file (see `load_bib_records`)."""
+        filepath = Path(filepath)
+        records, file_hash = _load_bib_records(filepath, use_cache=use_cache)
+        papers = cls([Paper(**record) for record in records])
+        if file_hash is not None:
+            build = papers._indexes["build"]
+            build["text"] = lambda: load_text_index(
+                filepath, file_hash, papers._build_text_index
             )
-            papers.append(paper)
+        return papers
 
-        return cls(papers)
+    @classmethod
+    def iter_bibtex(
+        cls, filepath: Path, batch_size: int = 1000
+    ) -> Iterator["Papers"]:
+        """Streams a BibTeX file as Papers batches without loading it whole.
+
+        Filter each batch and keep only the matches to bound memory, or
+        `concat` the batches to build the full collection lazily.
+        """
+        for batch in iter_paper_batches(filepath, batch_size=batch_size):
+            yield cls(batch)
+
+    @classmethod
+    def concat(cls, parts: Iterable["Papers"]) -> "Papers":
+        """Joins collections, concatenating their columns."""
+        parts = list(parts)
+        if not parts:
+            return cls([])
+        columns = {
+            name: np.concatenate([part.column(name) for part in parts])
+            for name in parts[0]._columns
+        }
+        # Rows restart at 0: the parts' text indexes are not carried over
+        columns["row"] = np.arange(len(columns["row"]))
+        return cls([paper for part in parts for paper in part], columns)
+
+    def mask(self, **kwargs) -> np.ndarray:
+        """Boolean mask of papers matching all given criteria.
+
+        Numeric bounds exclude papers missing that field. `keyword` is a
+        `TextIndex` query over title, abstract and keywords. `author` (one
+        name) and `authors` (any of several) are looked up in the
+        `AuthorIndex`, loosely if `fuzzy_authors`. `journal` is a
+        case-insensitive substring match.
+        """
+        cols = self._columns
+        mask = np.ones(len(self), dtype=bool)
+
+        # NaN compares False, so missing values drop out of every bound
+        bounds = [
+            ("min_citations", "citation_count", np.greater_equal),
+            ("max_citations", "citation_count", np.less_equal),
+            ("min_impact_factor", "journal_impact_factor", np.greater_equal),
+            ("max_impact_factor", "journal_impact_factor", np.less_equal),
+            ("year_min", "year", np.greater_equal),
+            ("year_max", "year", np.less_equal),
+        ]
+        with np.errstate(invalid="ignore"):
+            for kwarg, field, compare in bounds:
+                if kwargs.get(kwarg) is not None:
+                    mask &= compare(cols[field], kwargs[kwarg])
+            if kwargs.get("min_score") is not None:
+                scores = calculate_scores(self, kwargs.get("scoring"))
+                mask &= scores >= kwargs["min_score"]
+
+        if kwargs.get("keys") is not None:
+            mask &= np.isin(cols["key"], list(kwargs["keys"]))
+        if kwargs.get("exclude_keys") is not None:
+            mask &= ~np.isin(cols["key"], list(kwargs["exclude_keys"]))
+
+        if kwargs.get("keyword"):
+            matched, _ = self.text_index().search(kwargs["keyword"])
+            mask &= matched[cols["row"]]
+
+        fuzzy = bool(kwargs.get("fuzzy_authors"))
+        if kwargs.get("author"):
+            matched = self.author_index().mask([kwargs["author"]], fuzzy)
+            mask &= matched[cols["row"]]
+        if kwargs.get("authors") is not None:
+            matched = self.author_index().mask(kwargs["authors"], fuzzy)
+            mask &= matched[cols["row"]]
+
+        if kwargs.get("journal"):
+            needle = kwargs["journal"].lower()
+            candidates = np.flatnonzero(mask)
+            hits = [needle in text for text in cols["journal_text"][candidates]]
+            mask[candidates] = np.array(hits, dtype=bool)
+        return mask
 
     def filter(self, condition=None, **kwargs) -> "Papers":
-        """Filter papers by condition or criteria."""
-        if condition and callable(condition):
-            filtered = [p for p in self._papers if condition(p)]
-            return Papers(filtered)
-
-        # Apply keyword filters
-        filtered = self._papers
-
-        # Metrics filters
-        if "min_citations" in kwargs and kwargs["min_citations"] is not None:
-            filtered = [
-                p
-                for p in filtered
-                if p.citation_count
-                and p.citation_count >= kwargs["min_citations"]
-            ]
-
-        if "max_citations" in kwargs and kwargs["max_citations"] is not None:
-            filtered = [
-                p
-                for p in filtered
-                if p.citation_count
-                and p.citation_count <= kwargs["max_citations"]
-            ]
-
-        if (
-            "min_impact_factor" in kwargs
-            and kwargs["min_impact_factor"] is not None
-        ):
-            filtered = [
-                p
-                for p in filtered
-                if p.journal_impact_factor
-                and p.journal_impact_factor >= kwargs["min_impact_factor"]
-            ]
-
-        if (
-            "max_impact_factor" in kwargs
-            and kwargs["max_impact_factor"] is not None
-        ):
-            filtered = [
-                p
-                for p in filtered
-                if p.journal_impact_factor
-                and p.journal_impact_factor <= kwargs["max_impact_factor"]
-            ]
-
-        # Year filter
-        if "year_min" in kwargs and kwargs["year_min"] is not None:
-            filtered = [
-                p for p in filtered if p.year and p.year >= kwargs["year_min"]
-            ]
-
-        if "year_max" in kwargs and kwargs["year_max"] is not None:
-            filtered = [
-                p for p in filtered if p.year and p.year <= kwargs["year_max"]
-            ]
-
-        # Text filters
-        if "keyword" in kwargs and kwargs["keyword"]:
-            kw = kwargs["keyword"].lower()
-            filtered = [
-                p
-                for p in filtered
-                if (p.title and kw in p.title.lower())
-                or (p.abstract and kw in p.abstract.lower())
-                or any(kw in k.lower() for k in p.keywords)
-            ]
-
-        if "journal" in kwargs and kwargs["journal"]:
-            j = kwargs["journal"].lower()
-            filtered = [
-                p for p in filtered if p.journal and j in p.journal.lower()
-            ]
-
-        if "author" in kwargs and kwargs["author"]:
-            a = kwargs["author"].lower()
-            filtered = [
-                p
-                for p in filtered
-                if any(a in author.lower() for author in p.authors)
-            ]
-
-        return Papers(filtered)
-
-    def sort_by(self, key_func, reverse=False) -> "Papers":
-        """Sort papers by key function or field name."""
+        """Filter papers by condition or criteria (see `mask`)."""
+        if condition is not None and callable(condition):
+            return self.take(
+                [i for i, p in enumerate(self._papers) if condition(p)]
+            )
+        return self.take(np.flatnonzero(self.mask(**kwargs)))
+
+    def sort_by(self, key_func, reverse=False, limit=None) -> "Papers":
+        """Sort papers by field name, score array or key function.
+
+        Papers missing a numeric field are placed last. With `limit`, only
+        the first `limit` papers of that order are returned; for arrays and
+        numeric fields they are selected with np.argpartition and only
+        those are sorted.
+        """
+        if isinstance(key_func, str) and key_func in self.NUMERIC_FIELDS:
+            key_func = self._columns[key_func]
+        if isinstance(key_func, np.ndarray):
+            if reverse:
+                # Stable, like sorted(..., reverse=True)
+                values = -np.where(np.isnan(key_func), -np.inf, key_func)
+            else:
+                values = np.where(np.isnan(key_func), np.inf, key_func)
+            if limit is not None and limit < len(values):
+                return self.take(_top_k(values, limit))
+            return self.take(np.argsort(values, kind="stable"))
+
         if isinstance(key_func, str):
             # Handle string field names
             field_name = key_func
@@ -243,13 +335,13 @@ class Papers:
                     return float("-inf") if reverse else float("inf")
                 return value
 
-            sorted_papers = sorted(
-                self._papers, key=get_field, reverse=reverse
-            )
+            key = get_field
         else:
-            # Handle callable functions
-            sorted_papers = sorted(self._papers, key=key_func, reverse=reverse)
-        return Papers(sorted_papers)
+            key = key_func
+        order = sorted(
+            range(len(self)), key=lambda i: key(self._papers[i]), reverse=reverse
+        )
+        return self.take(order[:limit])
 
     def save(self, filepath: Path, format="bibtex"):
         """Save papers to file."""
@@ -262,32 +354,799 @@ class Papers:
                 bibtexparser.dump(bib_db, f)
 
 
-def get_cited_papers(manuscript_dir: Path) -> Set[str]:
-    """Extract all cited paper keys from manuscript .tex files.
+def _top_k(values: np.ndarray, k: int) -> np.ndarray:
+    """First k indices of np.argsort(values, kind="stable"), without a full sort."""
+    if k <= 0:
+        return np.zeros(0, dtype=np.intp)
+    head = np.argpartition(values, k - 1)[:k]
+    kth = values[head].max()
+    # Values tied with the k-th are taken in index order, as a stable sort would
+    below = head[values[head] < kth]
+    below = below[np.lexsort((below, values[below]))]
+    ties = np.flatnonzero(values == kth)[: k - len(below)]
+    return np.concatenate([below, ties])
+
+
+def _object_array(values: list) -> np.ndarray:
+    """1-D object array (np.array would split lists into a 2-D array)."""
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+_LATEX_COMMAND = re.compile(r"\\[A-Za-z]+")
+_LATEX_ACCENT = re.compile(r"\\[^A-Za-z\s]|[{}]")
+_WORD = re.compile(r"\w+")
+_QUERY_PART = re.compile(r'"([^"]*)"|(\S+)')
+# Position gap between fields (and keywords) so phrases never span two
+_FIELD_GAP = 64
+# Packs (document, position) into one int64 for phrase intersection
+_POSITION_STRIDE = 1 << 32
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens; LaTeX commands dropped, accents folded."""
+    text = _LATEX_ACCENT.sub("", _LATEX_COMMAND.sub(" ", text))
+    return _WORD.findall(text.lower())
+
+
+def parse_query(query: str) -> List[List[tuple]]:
+    """Splits a search query into OR-groups of AND-ed clauses.
+
+    Each clause is (words, is_prefix). A quoted phrase, or a word that
+    tokenizes into several (e.g. "EEG-based"), becomes a multi-word clause.
+    Bare words match as prefixes, so "seizure" also finds "seizures" as the
+    old substring filter did; a quoted phrase or word is matched exactly
+    unless it ends with * inside the quotes.
 
     Args:
-        manuscript_dir: Directory containing manuscript .tex files
+        query: e.g. 'seizure predict* OR "ictal onset"'
 
     Returns:
-        Set of cited paper keys
+        List of groups, each a list of (tuple of words, bool) clauses
     """
-    cited = set()
-    tex_files = [
-        "abstract.tex",
-        "introduction.tex",
-        "methods.tex",
-        "results.tex",
-        "discussion.tex",
+    groups, clauses = [], []
+    for match in _QUERY_PART.finditer(query):
+        phrase, word = match.groups()
+        if word == "OR":
+            groups.append(clauses)
+            clauses = []
+            continue
+        if word == "AND":
+            continue
+        text = phrase if phrase is not None else word
+        words = tuple(tokenize(text))
+        if words:
+            clauses.append((words, phrase is None or text.endswith("*")))
+    groups.append(clauses)
+    return [clauses for clauses in groups if clauses]
+
+
+class TextIndex:
+    """Inverted index over title, abstract and keywords, ranked by BM25.
+
+    Postings are flat arrays sorted by (term, document, position). Term ids
+    follow the sorted vocabulary, so a prefix query reads one contiguous
+    slice and a phrase query intersects packed (document, position) keys.
+
+    Query syntax: words are AND-ed and match as prefixes, OR separates
+    alternatives, "double quotes" mark an exact word or phrase, and a
+    trailing * inside them ("ictal ons*") makes its last word a prefix.
+    """
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(
+        self,
+        vocab: List[str],
+        term_start: np.ndarray,
+        doc: np.ndarray,
+        pos: np.ndarray,
+        doc_len: np.ndarray,
+    ):
+        self.vocab = vocab
+        self.term_start = term_start
+        self.doc = doc
+        self.pos = pos
+        self.doc_len = doc_len
+        avg_len = doc_len.mean() if len(doc_len) and doc_len.any() else 1.0
+        # BM25 length normalization, fixed per document
+        self._norm = self.K1 * (1 - self.B + self.B * doc_len / avg_len)
+
+    @classmethod
+    def build(cls, documents: Iterable[Iterable[str]]) -> "TextIndex":
+        """Indexes documents, each given as a sequence of field texts."""
+        term_ids = {}
+        terms, positions, doc_len = [], [], []
+        for fields in documents:
+            start, n_tokens = 0, 0
+            for field in fields:
+                tokens = tokenize(field)
+                terms.extend(term_ids.setdefault(t, len(term_ids)) for t in tokens)
+                positions.extend(range(start, start + len(tokens)))
+                start += len(tokens) + _FIELD_GAP
+                n_tokens += len(tokens)
+            doc_len.append(n_tokens)
+
+        vocab = sorted(term_ids)
+        rank = np.empty(len(vocab), dtype=np.int64)
+        rank[[term_ids[t] for t in vocab]] = np.arange(len(vocab))
+        term = rank[np.array(terms, dtype=np.intp)]
+        doc_len = np.array(doc_len, dtype=np.int64)
+        doc = np.repeat(np.arange(len(doc_len), dtype=np.int64), doc_len)
+        # Stable, so each term keeps its (document, position) order
+        order = np.argsort(term, kind="stable")
+        term_start = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(term, minlength=len(vocab)), out=term_start[1:])
+        return cls(
+            vocab,
+            term_start,
+            doc[order],
+            np.array(positions, dtype=np.int64)[order],
+            doc_len.astype(np.float64),
+        )
+
+    def state(self) -> dict:
+        """Plain-data form for pickling, independent of this module's name."""
+        return {
+            "vocab": self.vocab,
+            "term_start": self.term_start,
+            "doc": self.doc,
+            "pos": self.pos,
+            "doc_len": self.doc_len,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "TextIndex":
+        return cls(**state)
+
+    def __len__(self):
+        return len(self.doc_len)
+
+    def _postings(self, word: str, prefix: bool = False):
+        lo = bisect.bisect_left(self.vocab, word)
+        if prefix:
+            hi = bisect.bisect_left(self.vocab, word + "\U0010ffff", lo)
+        else:
+            hi = lo + (lo < len(self.vocab) and self.vocab[lo] == word)
+        start, stop = self.term_start[lo], self.term_start[hi]
+        return self.doc[start:stop], self.pos[start:stop]
+
+    def _term_frequency(self, words: tuple, prefix: bool) -> np.ndarray:
+        """Occurrences of a word, prefix or phrase in every document."""
+        if len(words) == 1:
+            docs, _ = self._postings(words[0], prefix)
+        else:
+            keys = None
+            for offset, word in enumerate(words):
+                last = offset == len(words) - 1
+                docs, pos = self._postings(word, prefix and last)
+                # Shift each word back to the phrase start before matching
+                word_keys = docs * _POSITION_STRIDE + (pos - offset)
+                keys = (
+                    word_keys
+                    if keys is None
+                    else np.intersect1d(keys, word_keys, assume_unique=True)
+                )
+            docs = keys // _POSITION_STRIDE
+        return np.bincount(docs, minlength=len(self))
+
+    def search(self, query: str):
+        """Matches and ranks documents against a query (see `parse_query`).
+
+        Args:
+            query: Query string
+
+        Returns:
+            (matched, scores): boolean mask and BM25 score per document;
+            an empty query matches everything with score 0
+        """
+        n_docs = len(self)
+        groups = parse_query(query)
+        scores = np.zeros(n_docs)
+        if not groups:
+            return np.ones(n_docs, dtype=bool), scores
+
+        matched = np.zeros(n_docs, dtype=bool)
+        for clauses in groups:
+            group_hit = np.ones(n_docs, dtype=bool)
+            group_score = np.zeros(n_docs)
+            for words, prefix in clauses:
+                tf = self._term_frequency(words, prefix)
+                hit = tf > 0
+                group_hit &= hit
+                if not group_hit.any():
+                    break
+                df = np.count_nonzero(hit)
+                idf = np.log1p((n_docs - df + 0.5) / (df + 0.5))
+                group_score += idf * tf * (self.K1 + 1) / (tf + self._norm)
+            matched |= group_hit
+            scores += np.where(group_hit, group_score, 0.0)
+        return matched, scores
+
+
+class AuthorName(NamedTuple):
+    """Normalized author name: lowercase ASCII-folded last name and initials."""
+
+    last: str
+    initials: str
+
+
+def fold_accents(text: str) -> str:
+    """Strips LaTeX accent commands and braces, and Unicode diacritics."""
+    text = _LATEX_ACCENT.sub("", _LATEX_COMMAND.sub(" ", text))
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in text if not unicodedata.combining(c))
+
+
+def normalize_author(name: str) -> AuthorName:
+    """Parses a BibTeX-style author name into an `AuthorName`.
+
+    "Last, First", "von Last, Jr., First" and "First von Last" all resolve
+    to the same last name; a fully braced name ("{WHO Consortium}") is kept
+    whole as a corporate author.
+
+    Args:
+        name: Author name as written in the .bib or .tex file
+
+    Returns:
+        AuthorName, e.g. ("muller", "hj") for "M{\\"u}ller, Hans-J."
+    """
+    name = name.strip()
+    corporate = name.startswith("{") and name.endswith("}")
+    text = " ".join(fold_accents(name).split())
+    if corporate:
+        return AuthorName(text.lower(), "")
+    if "," in text:
+        parts = [part.strip() for part in text.split(",")]
+        last, first = parts[0], parts[-1]
+    else:
+        words = text.split()
+        # The last name starts at the first lowercase "von" word, if any
+        split = len(words) - 1
+        for i, word in enumerate(words[:-1]):
+            if i > 0 and word[:1].islower():
+                split = i
+                break
+        last, first = " ".join(words[split:]), " ".join(words[:split])
+    initials = "".join(w[0] for w in re.split(r"[\s.\-]+", first) if w)
+    return AuthorName(last.strip(" .").lower(), initials.lower())
+
+
+class AuthorIndex:
+    """Papers bucketed by (last name, first initial) of each author.
+
+    A query with a first name or initial reads one bucket; a bare last name
+    reads every bucket of that last name. The fuzzy tier also accepts close
+    spellings of the last name and authors recorded without a first name.
+    """
+
+    def __init__(self, buckets: dict, n_docs: int):
+        self.buckets = buckets
+        self.n_docs = n_docs
+        self.initials_by_last = {}
+        for last, initial in buckets:
+            self.initials_by_last.setdefault(last, []).append(initial)
+        self._lasts = sorted(self.initials_by_last)
+
+    @classmethod
+    def build(cls, author_lists: Iterable[List[str]]) -> "AuthorIndex":
+        """Indexes documents, each given as its list of author names."""
+        buckets = {}
+        n_docs = 0
+        for doc, authors in enumerate(author_lists):
+            n_docs = doc + 1
+            for author in authors:
+                name = normalize_author(author)
+                if name.last:
+                    key = (name.last, name.initials[:1])
+                    buckets.setdefault(key, set()).add(doc)
+        return cls(
+            {key: np.fromiter(docs, np.intp) for key, docs in buckets.items()},
+            n_docs,
+        )
+
+    def keys(self, name: str, fuzzy: bool = False) -> List[tuple]:
+        """Bucket keys matching an author name."""
+        query = normalize_author(name)
+        lasts = [query.last]
+        if fuzzy:
+            lasts += difflib.get_close_matches(
+                query.last, self._lasts, n=5, cutoff=0.85
+            )
+        initials = [query.initials[:1]] if query.initials else None
+        keys = []
+        for last in dict.fromkeys(lasts):
+            for initial in self.initials_by_last.get(last, ()):
+                if (
+                    initials is None
+                    or initial in initials
+                    or (fuzzy and not initial)
+                ):
+                    keys.append((last, initial))
+        return keys
+
+    def mask(self, names: Iterable[str], fuzzy: bool = False) -> np.ndarray:
+        """Boolean mask of documents with any of the given authors."""
+        mask = np.zeros(self.n_docs, dtype=bool)
+        for name in names:
+            for key in self.keys(name, fuzzy):
+                mask[self.buckets[key]] = True
+        return mask
+
+
+class RawEntry(NamedTuple):
+    """One top-level BibTeX item, @type{...} or @type(...), as raw text."""
+
+    type: str  # Lowercased, e.g. "article", "string", "comment"
+    text: str
+    offset: int  # Byte offset of the "@" in the file
+
+
+# Entries start at a line-initial "@", so "foo@bar (2020)" in text between
+# entries is not taken for an @bar(...) entry
+_BIB_OPEN = re.compile(rb"^[ \t]*@[ \t\r\n]*([A-Za-z]+)[ \t\r\n]*([{(])", re.M)
+_BIB_DELIMS = re.compile(rb'[{}()"]')
+
+
+def iter_bibtex_entries(
+    filepath: Path, chunk_size: int = 1 << 20
+) -> Iterator[RawEntry]:
+    """Yields the top-level entries of a BibTeX file one at a time.
+
+    Reads `chunk_size` bytes at a time and tracks brace depth, so values
+    may span lines and contain nested braces; memory is bounded by the
+    largest entry. Entries start at an "@" that begins a line (after
+    optional indentation); other text between entries is skipped as
+    implicit comment.
+
+    Args:
+        filepath: Path to BibTeX file
+        chunk_size: Bytes read per I/O call
+
+    Returns:
+        Iterator of RawEntry, in file order
+    """
+    with open(filepath, "rb") as f:
+        buffer, base, pos, eof = b"", 0, 0, False
+
+        def refill(keep_from: int) -> None:
+            # Drops consumed bytes and appends the next chunk
+            nonlocal buffer, base, eof
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer, base = buffer[keep_from:] + chunk, base + keep_from
+
+        while True:
+            match = _BIB_OPEN.search(buffer, pos)
+            if match is None:
+                if eof:
+                    return
+                # Keep the line of a possibly truncated "@type" (or the last,
+                # partial line), so the next search still sees where it starts
+                at = buffer.rfind(b"@", pos)
+                keep_from = buffer.rfind(b"\n", 0, at if at >= 0 else None) + 1
+                refill(keep_from)
+                pos = max(pos - keep_from, 0)
+                continue
+
+            start = buffer.index(b"@", match.start())
+            entry_type = match.group(1).decode("ascii").lower()
+            paren_delimited = match.group(2) == b"("
+            # Brace depth inside the entry; parens and quotes at depth 0 only
+            # matter for @type(...), where a quoted "(" must not nest
+            braces, parens, quoted, scan = 0, 0, False, match.end()
+            end = None
+            while end is None:
+                for delim in _BIB_DELIMS.finditer(buffer, scan):
+                    char = delim.group()
+                    if char == b"{":
+                        braces += 1
+                    elif char == b"}":
+                        if braces == 0 and not paren_delimited:
+                            end = delim.end()
+                            break
+                        braces -= 1
+                    elif not paren_delimited or braces > 0:
+                        continue
+                    elif char == b'"':
+                        quoted = not quoted
+                    elif not quoted:
+                        if char == b"(":
+                            parens += 1
+                        elif parens == 0:
+                            end = delim.end()
+                            break
+                        else:
+                            parens -= 1
+                if end is None:
+                    if eof:
+                        raise ValueError(
+                            f"Unterminated @{entry_type} at byte {base + start}"
+                        )
+                    scan = len(buffer) - start
+                    refill(start)
+                    start = 0
+
+            yield RawEntry(
+                entry_type, buffer[start:end].decode("utf-8"), base + start
+            )
+            pos = end
+
+
+def iter_paper_batches(
+    filepath: Path, batch_size: int = 1000
+) -> Iterator[List[Paper]]:
+    """Parses a BibTeX file into Papers batch by batch while reading it.
+
+    @string macros apply to the entries after them, as in BibTeX.
+
+    Args:
+        filepath: Path to BibTeX file
+        batch_size: Entries parsed per bibtexparser run
+
+    Returns:
+        Iterator of Paper lists, in file order
+    """
+    macros, blocks = [], []
+
+    def parse() -> List[Paper]:
+        parsed = _parse_blocks(blocks, "\n\n".join(macros))
+        return [Paper(**record) for records in parsed for record in records]
+
+    for entry in iter_bibtex_entries(filepath):
+        if entry.type in _MACRO_TYPES:
+            macros.append(entry.text)
+        elif entry.type != "comment":
+            blocks.append(entry.text)
+            if len(blocks) >= batch_size:
+                yield parse()
+                blocks = []
+    if blocks:
+        yield parse()
+
+
+def _record_from_entry(entry: dict) -> dict:
+    """Derives the Paper fields (authors split, numbers parsed) of an entry."""
+    # Parse fields
+    authors = []
+    if "author" in entry:
+        authors = [a.strip() for a in entry["author"].split(" and ")]
+
+    year = None
+    if "year" in entry:
+        try:
+            year = int(entry["year"])
+        except ValueError:
+            pass
+
+    citation_count = None
+    if "citation_count" in entry:
+        try:
+            citation_count = int(entry["citation_count"])
+        except ValueError:
+            pass
+
+    impact_factor = None
+    if "journal_impact_factor" in entry:
+        try:
+            impact_factor = float(entry["journal_impact_factor"])
+        except ValueError:
+            pass
+
+    keywords = []
+    if "keywords" in entry:
+        keywords = [k.strip() for k in entry["keywords"].split(",")]
+
+    return dict(
+        key=entry.get("ID", ""),
+        title=entry.get("title", "").strip("{}"),
+        authors=authors,
+        year=year,
+        journal=entry.get("journal", ""),
+        citation_count=citation_count,
+        journal_impact_factor=impact_factor,
+        abstract=entry.get("abstract", ""),
+        doi=entry.get("doi", ""),
+        keywords=keywords,
+        _original_entry=entry,
+    )
+
+
+# Bumped whenever _record_from_entry or the cache layout changes
+BIB_CACHE_VERSION = 1
+TEXT_INDEX_VERSION = 1
+_MACRO_TYPES = ("string", "preamble")
+_BIB_HEAD = re.compile(r"@\s*([A-Za-z]+)\s*[{(]\s*([^,\s{}()]*)")
+
+
+def _parse_blocks(blocks: List[str], macros: str) -> List[List[dict]]:
+    """Parses entry blocks, returning the records found in each block.
+
+    Types bibtexparser ignores (@online, @software, ...) are skipped up
+    front, and the rest go through a single parser run. Records are mapped
+    back to their blocks in order by entry key, so a block the parser
+    drops (e.g. a malformed one) just gets no records.
+    """
+    heads = [_BIB_HEAD.match(block) for block in blocks]
+    keys = [
+        head.group(2)
+        if head is not None and head.group(1).lower() in STANDARD_TYPES
+        else None
+        for head in heads
+    ]
+    kept = [block for block, key in zip(blocks, keys) if key is not None]
+    per_block: List[List[dict]] = [[] for _ in blocks]
+    if not kept:
+        return per_block
+
+    entries = bibtexparser.loads(
+        macros + "\n\n" + "\n\n".join(kept), parser=BibTexParser()
+    ).entries
+    positions = defaultdict(deque)
+    for i_block, key in enumerate(keys):
+        if key is not None:
+            positions[key].append(i_block)
+    next_block = 0
+    for entry in entries:
+        candidates = positions[entry.get("ID", "")]
+        while candidates and candidates[0] < next_block:
+            candidates.popleft()
+        if candidates:
+            next_block = candidates.popleft() + 1
+            per_block[next_block - 1].append(_record_from_entry(entry))
+    return per_block
+
+
+def _bib_cache_path(filepath: Path) -> Path:
+    return filepath.with_name(f".{filepath.name}.cache.pkl")
+
+
+def _read_bib_cache(
+    cache_path: Path, version: int = BIB_CACHE_VERSION
+) -> Optional[dict]:
+    try:
+        with open(cache_path, "rb") as f:
+            cache = pickle.load(f)
+    except (
+        OSError,
+        pickle.UnpicklingError,
+        EOFError,
+        AttributeError,
+        ImportError,
+        ValueError,
+    ):
+        return None
+    if not isinstance(cache, dict) or cache.get("version") != version:
+        return None
+    return cache
+
+
+def _write_bib_cache(cache_path: Path, cache: dict) -> None:
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # Read-only bibliography directory: work uncached
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def load_bib_records(filepath: Path, use_cache: bool = True) -> List[dict]:
+    """Returns the Paper fields of every entry, reusing a sidecar cache.
+
+    The cache (.<name>.bib.cache.pkl next to the file) is reused as-is
+    when size and mtime match, or when the content hash matches. Otherwise
+    only entries whose raw text changed are reparsed; a change to any
+    @string/@preamble block invalidates all entries.
+
+    Args:
+        filepath: Path to BibTeX file
+        use_cache: Whether to read and update the sidecar cache
+
+    Returns:
+        List of Paper keyword arguments, in file order
+    """
+    records, _ = _load_bib_records(Path(filepath), use_cache=use_cache)
+    return records
+
+
+def _load_bib_records(filepath: Path, use_cache: bool):
+    """`load_bib_records`, plus the file's SHA-1 when the cache is used."""
+    cache_path = _bib_cache_path(filepath)
+    stat = filepath.stat()
+    stamp = (stat.st_size, stat.st_mtime_ns)
+
+    cache = _read_bib_cache(cache_path) if use_cache else None
+    if cache is not None and cache["stamp"] == stamp:
+        return cache["records"], cache["sha1"]
+
+    raw = filepath.read_bytes()
+    file_hash = hashlib.sha1(raw).hexdigest()
+    if cache is not None and cache["sha1"] == file_hash:
+        cache["stamp"] = stamp
+        _write_bib_cache(cache_path, cache)
+        return cache["records"], file_hash
+
+    entries = list(iter_bibtex_entries(filepath))
+    macros = "\n\n".join(e.text for e in entries if e.type in _MACRO_TYPES)
+    macro_hash = hashlib.sha1(macros.encode()).hexdigest()
+    entry_blocks = [
+        e.text for e in entries if e.type not in _MACRO_TYPES + ("comment",)
     ]
+    block_hashes = [
+        hashlib.sha1((macro_hash + block).encode()).hexdigest()
+        for block in entry_blocks
+    ]
+
+    previous = cache["blocks"] if cache is not None else {}
+    missing = {
+        h: block
+        for h, block in zip(block_hashes, entry_blocks)
+        if h not in previous
+    }
+    parsed = _parse_blocks(list(missing.values()), macros)
+    block_records = {
+        h: previous[h] if h in previous else None for h in block_hashes
+    }
+    block_records.update(zip(missing.keys(), parsed))
+
+    records = [r for h in block_hashes for r in block_records[h]]
+    if use_cache:
+        _write_bib_cache(
+            cache_path,
+            {
+                "version": BIB_CACHE_VERSION,
+                "stamp": stamp,
+                "sha1": file_hash,
+                "blocks": block_records,
+                "records": records,
+                "n_reparsed": len(missing),
+            },
+        )
+        return records, file_hash
+    return records, None
+
+
+def load_text_index(filepath: Path, file_hash: str, build) -> TextIndex:
+    """Returns the text index for this file content, building it if needed.
+
+    The index is kept in .<name>.bib.index.pkl next to the parse cache and
+    reused while the BibTeX content hash is unchanged.
+
+    Args:
+        filepath: Path to BibTeX file
+        file_hash: SHA-1 of the file content (from the parse cache)
+        build: Callable returning a fresh TextIndex
+
+    Returns:
+        TextIndex over the file's papers
+    """
+    cache_path = filepath.with_name(f".{filepath.name}.index.pkl")
+    cache = _read_bib_cache(cache_path, version=TEXT_INDEX_VERSION)
+    if cache is not None and cache["sha1"] == file_hash:
+        return TextIndex.from_state(cache["index"])
+    index = build()
+    _write_bib_cache(
+        cache_path,
+        {
+            "version": TEXT_INDEX_VERSION,
+            "sha1": file_hash,
+            "index": index.state(),
+        },
+    )
+    return index
+
+
+CITE_CACHE_VERSION = 1
+TEX_DIRS = (
+    Path("./01_manuscript/contents"),
+    Path("./02_supplementary/contents"),
+    Path("./03_revision/contents"),
+)
+# natbib (\citep, \citet*, \citealp, \citeauthor, ...) and biblatex
+# (\parencite, \textcite, \autocite, \footcite, multicite \cites, ...)
+# commands with optional (pre)(post) and [pre][post] notes; group 1 holds
+# the argument list, e.g. "[see][p.~3]{a,b}" or "{a}[p.~2]{b}"
+_CITE_COMMAND = re.compile(
+    r"\\(?:[Cc]ite(?!style)[A-Za-z]*|[Pp]arencites?|[Tt]extcites?"
+    r"|[Aa]utocites?|[Ff]ootcites?(?:texts?)?|[Ss]martcites?|[Ss]upercites?"
+    r"|fullcite|nocite)\*?"
+    r"((?:\s*\([^)]*\))*(?:\s*\[[^\]]*\])*\s*\{[^{}]*\}"
+    r"(?:(?:\[[^\]]*\])*\{[^{}]*\})*)"
+)
+_TEX_COMMENT = re.compile(r"(?<!\\)%.*")
+_CITE_NOTE = re.compile(r"\[[^\]]*\]|\([^)]*\)")
+_CITE_KEY = re.compile(r"[^{},\s]+")
+
+
+def iter_tex_files(roots: Iterable[Path]) -> Iterator[Path]:
+    """Every .tex file under `roots`.
 
-    for fname in tex_files:
-        fpath = manuscript_dir / fname
-        if fpath.exists():
-            content = fpath.read_text()
-            matches = re.findall(r"\\cite\{([^}]+)\}", content)
-            for match in matches:
-                cited.update(key.strip() for key in match.split(","))
+    Archived versions, hidden (generated) paths and latexdiff output
+    (*_diff.tex) are skipped.
+    """
+    for root in roots:
+        root = Path(root)
+        if root.is_file():
+            yield root
+            continue
+        for path in sorted(root.rglob("*.tex")):
+            parts = path.relative_to(root).parts
+            if any(p.startswith(".") or p == "archive" for p in parts):
+                continue
+            if path.stem.endswith("_diff"):
+                continue
+            yield path
+
+
+def scan_citations(text: str) -> Set[str]:
+    """Keys cited by any natbib/biblatex cite command in LaTeX source."""
+    text = _TEX_COMMENT.sub("", text)
+    keys = set()
+    for match in _CITE_COMMAND.finditer(text):
+        keys.update(_CITE_KEY.findall(_CITE_NOTE.sub("", match.group(1))))
+    return keys
+
+
+def _scan_tex_file(path: Path) -> Set[str]:
+    return scan_citations(path.read_text(encoding="utf-8", errors="replace"))
+
+
+def get_cited_papers(
+    tex_dirs,
+    cache_path: Optional[Path] = Path("./.cited_keys.cache.pkl"),
+    n_workers: Optional[int] = None,
+) -> Set[str]:
+    """Extract all cited paper keys from every .tex file under `tex_dirs`.
+
+    Files are scanned in a thread pool; keys of each file are cached by
+    (size, mtime) so unchanged files are not reread.
+
+    Args:
+        tex_dirs: Directory (or list of directories/files) to scan
+        cache_path: Per-file cache location; None disables the cache
+        n_workers: Scanner threads (default: ThreadPoolExecutor's)
 
+    Returns:
+        Set of cited paper keys
+    """
+    if isinstance(tex_dirs, (str, Path)):
+        tex_dirs = [tex_dirs]
+    paths = list(iter_tex_files(tex_dirs))
+
+    cache = None
+    if cache_path is not None:
+        cache = _read_bib_cache(Path(cache_path), version=CITE_CACHE_VERSION)
+    files = cache["files"] if cache is not None else {}
+
+    stamps, stale = {}, []
+    for path in paths:
+        stat = path.stat()
+        stamps[path] = (stat.st_size, stat.st_mtime_ns)
+        entry = files.get(str(path))
+        if entry is None or entry[0] != stamps[path]:
+            stale.append(path)
+
+    with ThreadPoolExecutor(max_workers=n_workers) as pool:
+        for path, keys in zip(stale, pool.map(_scan_tex_file, stale)):
+            files[str(path)] = (stamps[path], frozenset(keys))
+
+    if cache_path is not None and (stale or len(files) != len(paths)):
+        _write_bib_cache(
+            Path(cache_path),
+            {
+                "version": CITE_CACHE_VERSION,
+                "files": {str(p): files[str(p)] for p in paths},
+            },
+        )
+
+    cited = set()
+    for path in paths:
+        cited.update(files[str(path)][1])
     return cited
 
 
@@ -298,49 +1157,53 @@ def extract_coauthors_from_tex(authors_tex_path: Path) -> List[str]:
         authors_tex_path: Path to authors.tex file
 
     Returns:
-        List of author names (last names)
+        List of author names ("First Last"), for `AuthorIndex` lookup
     """
     if not authors_tex_path.exists():
         return []
 
     authors = []
-    content = authors_tex_path.read_text()
+    # Drop comments so the commented-out examples are not picked up
+    content = re.sub(r'(?<!\\)%.*', '', authors_tex_path.read_text())
 
     # Extract author names from \author[X]{Name} format
-    author_pattern = r'\\author\[[^\]]+\]\{([^}]+)\}'
+    author_pattern = r'\\author(?:\[[^\]]*\])?\{((?:[^{}]|\{[^{}]*\})*)\}'
     matches = re.findall(author_pattern, content)
 
     for match in matches:
         # Remove ALL LaTeX commands and their arguments (handles nested braces)
-        clean_name = re.sub(r'\\[a-zA-Z]+(?:\{[^}]*\})?', '', match).strip()
-        # Extract last name (assuming format: "First Last" or "First Middle Last")
-        parts = clean_name.split()
-        if parts:
-            last_name = parts[-1]
-            authors.append(last_name)
+        clean_name = re.sub(r'\\[a-zA-Z]+(?:\{[^}]*\})?', '', match)
+        # Keep the full name: first initials disambiguate short last names
+        clean_name = " ".join(clean_name.strip("[] ").split())
+        if clean_name:
+            authors.append(clean_name)
 
     return authors
 
 
-def calculate_score(paper: Paper, weights: dict = None) -> float:
-    """Calculate composite score for ranking papers.
+def calculate_scores(
+    papers: Papers, scoring: Optional[Scoring] = None
+) -> np.ndarray:
+    """Composite score of every paper, in one pass over the columns.
 
     Args:
-        paper: Paper object
-        weights: Dictionary with 'citations' and 'impact_factor' weights
+        papers: Papers collection
+        scoring: Formulas and weights (default: the linear score,
+            citations + impact factor × 10)
 
     Returns:
-        Composite score
+        Composite score per paper
     """
-    if weights is None:
-        weights = {"citations": 1.0, "impact_factor": 10.0}
+    return (scoring or Scoring())(papers)
 
-    citations = paper.citation_count if paper.citation_count else 0
-    impact = paper.journal_impact_factor if paper.journal_impact_factor else 0
 
-    return (citations * weights["citations"]) + (
-        impact * weights["impact_factor"]
-    )
+def format_score(score: float) -> str:
+    """Score column text: one decimal only for small fractional scores."""
+    if np.isnan(score):
+        return "N/A"
+    if abs(score) >= 100 or score == round(score):
+        return f"{score:.0f}"
+    return f"{score:.1f}"
 
 
 def print_papers_table(
@@ -348,6 +1211,8 @@ def print_papers_table(
     cited_keys: Optional[Set[str]] = None,
     show_score: bool = True,
     max_papers: Optional[int] = None,
+    scoring: Optional[Scoring] = None,
+    n_total: Optional[int] = None,
 ):
     """Print papers in formatted table.
 
@@ -356,11 +1221,81 @@ def print_papers_table(
         cited_keys: Set of already cited paper keys (to mark them)
         show_score: Whether to show composite score
         max_papers: Maximum number of papers to display
+        scoring: Formulas for the score column (default: linear)
+        n_total: Number of matching papers, if `papers` is only the top rows
     """
     if len(papers) == 0:
         print("No papers match the criteria.")
         return
 
+    print_table_header(show_score)
+
+    # Print papers
+    count = 0
+    scores = calculate_scores(papers, scoring) if show_score else None
+    for i, paper in enumerate(papers):
+        if max_papers and count >= max_papers:
+            break
+        score = scores[i] if show_score else None
+        print(format_paper_row(paper, cited_keys, show_score, score))
+        count += 1
+
+    print("=" * 145)
+    print(f"Showing {count} of {n_total or len(papers)} papers")
+
+
+def stream_papers_table(
+    filepath: Path,
+    criteria: dict,
+    coauthors: Optional[List[str]] = None,
+    cited_keys: Optional[Set[str]] = None,
+    show_score: bool = True,
+    max_papers: Optional[int] = None,
+    batch_size: int = 1000,
+    scoring: Optional[Scoring] = None,
+) -> Papers:
+    """Filter a BibTeX file while reading it, printing matches as found.
+
+    Rows are printed in file order, one parsed batch at a time, and reading
+    stops once `max_papers` matches were shown. Only matches are kept.
+
+    Args:
+        filepath: Path to BibTeX file
+        criteria: Keyword arguments for Papers.mask
+        coauthors: Co-author names; None disables the co-author filter
+        cited_keys: Set of already cited paper keys (to mark them)
+        show_score: Whether to show composite score
+        max_papers: Stop after this many matches
+        batch_size: Entries parsed per batch
+        scoring: Formulas for the score column (default: linear)
+
+    Returns:
+        Papers that matched
+    """
+    print_table_header(show_score)
+    matches, n_read, count = [], 0, 0
+    for batch in Papers.iter_bibtex(filepath, batch_size=batch_size):
+        n_read += len(batch)
+        hits = np.flatnonzero(batch.mask(**criteria, authors=coauthors))
+        if max_papers:
+            hits = hits[: max_papers - count]
+        hits = batch.take(hits)
+        scores = calculate_scores(hits, scoring)
+        for paper, score in zip(hits, scores):
+            row = format_paper_row(paper, cited_keys, show_score, score)
+            print(row, flush=True)
+        matches.append(hits)
+        count += len(hits)
+        if max_papers and count >= max_papers:
+            break
+
+    print("=" * 145)
+    print(f"Showing {count} matches from the first {n_read} papers read")
+    return Papers.concat(matches)
+
+
+def print_table_header(show_score: bool = True):
+    """Print the column header of the papers table."""
     # Prepare header
     header_parts = [
         ("Key", 40),
@@ -379,48 +1314,46 @@ def print_papers_table(
     print(header.rstrip())
     print("-" * 145)
 
-    # Print papers
-    count = 0
-    for paper in papers:
-        if max_papers and count >= max_papers:
-            break
 
-        # Check if cited
-        is_cited = cited_keys and paper.key in cited_keys
-        prefix = "✓ " if is_cited else "  "
-
-        # Format fields
-        key = (paper.key[:38] + "..") if len(paper.key) > 40 else paper.key
-        cites = str(paper.citation_count) if paper.citation_count else "N/A"
-        impact = (
-            f"{paper.journal_impact_factor:.1f}"
-            if paper.journal_impact_factor
-            else "N/A"
-        )
-        score = f"{calculate_score(paper):.0f}" if show_score else ""
-        year = str(paper.year) if paper.year else "N/A"
-        journal = (
-            (paper.journal[:23] + "..")
-            if paper.journal and len(paper.journal) > 25
-            else (paper.journal or "N/A")
-        )
-        title = (
-            (paper.title[:48] + "..")
-            if paper.title and len(paper.title) > 50
-            else (paper.title or "No title")
-        )
-
-        # Build row
-        row = f"{prefix}{key:<38} {cites:<7} {impact:<6} "
-        if show_score:
-            row += f"{score:<8} "
-        row += f"{year:<6} {journal:<25} {title}"
+def format_paper_row(
+    paper: Paper,
+    cited_keys: Optional[Set[str]] = None,
+    show_score: bool = True,
+    score: Optional[float] = None,
+) -> str:
+    """Format one paper as a row of the papers table (see `calculate_scores`)."""
+    # Check if cited
+    is_cited = cited_keys and paper.key in cited_keys
+    prefix = "✓ " if is_cited else "  "
+
+    # Format fields
+    key = (paper.key[:38] + "..") if len(paper.key) > 40 else paper.key
+    cites = str(paper.citation_count) if paper.citation_count else "N/A"
+    impact = (
+        f"{paper.journal_impact_factor:.1f}"
+        if paper.journal_impact_factor
+        else "N/A"
+    )
+    score = format_score(score) if show_score and score is not None else ""
+    year = str(paper.year) if paper.year else "N/A"
+    journal = (
+        (paper.journal[:23] + "..")
+        if paper.journal and len(paper.journal) > 25
+        else (paper.journal or "N/A")
+    )
+    title = (
+        (paper.title[:48] + "..")
+        if paper.title and len(paper.title) > 50
+        else (paper.title or "No title")
+    )
 
-        print(row)
-        count += 1
+    # Build row
+    row = f"{prefix}{key:<38} {cites:<7} {impact:<6} "
+    if show_score:
+        row += f"{score:<8} "
+    row += f"{year:<6} {journal:<25} {title}"
 
-    print("=" * 145)
-    print(f"Showing {count} of {len(papers)} papers")
+    return row
 
 
 def print_summary_stats(papers: Papers, cited_keys: Optional[Set[str]] = None):
@@ -435,25 +1368,15 @@ def print_summary_stats(papers: Papers, cited_keys: Optional[Set[str]] = None):
     print("=" * 80)
 
     total = len(papers)
-    with_citations = len(
-        papers.filter(
-            lambda p: p.citation_count is not None and p.citation_count > 0
-        )
-    )
-    with_impact = len(
-        papers.filter(
-            lambda p: p.journal_impact_factor is not None
-            and p.journal_impact_factor > 0
-        )
-    )
-    with_both = len(
-        papers.filter(
-            lambda p: p.citation_count is not None
-            and p.citation_count > 0
-            and p.journal_impact_factor is not None
-            and p.journal_impact_factor > 0
-        )
-    )
+    citation_col = papers.column("citation_count")
+    impact_col = papers.column("journal_impact_factor")
+    # NaN > 0 is False, so missing values count as absent
+    with np.errstate(invalid="ignore"):
+        has_citations = citation_col > 0
+        has_impact = impact_col > 0
+    with_citations = int(has_citations.sum())
+    with_impact = int(has_impact.sum())
+    with_both = int((has_citations & has_impact).sum())
 
     print(f"Total papers: {total}")
     print(
@@ -467,7 +1390,7 @@ def print_summary_stats(papers: Papers, cited_keys: Optional[Set[str]] = None):
     )
 
     if cited_keys:
-        cited_count = sum(1 for p in papers if p.key in cited_keys)
+        cited_count = int(np.isin(papers.column("key"), list(cited_keys)).sum())
         uncited_count = total - cited_count
         print(
             f"\nCited in manuscript: {cited_count} ({cited_count/total*100:.1f}%)"
@@ -477,24 +1400,22 @@ def print_summary_stats(papers: Papers, cited_keys: Optional[Set[str]] = None):
         )
 
     # Citation statistics
-    citations = [p.citation_count for p in papers if p.citation_count]
-    if citations:
+    citations = np.sort(citation_col[has_citations]).astype(int)
+    if len(citations):
         print(f"\nCitation count statistics:")
-        print(f"  Min: {min(citations)}")
-        print(f"  Max: {max(citations)}")
-        print(f"  Mean: {sum(citations)/len(citations):.1f}")
-        print(f"  Median: {sorted(citations)[len(citations)//2]}")
+        print(f"  Min: {citations[0]}")
+        print(f"  Max: {citations[-1]}")
+        print(f"  Mean: {citations.mean():.1f}")
+        print(f"  Median: {citations[len(citations)//2]}")
 
     # Impact factor statistics
-    impacts = [
-        p.journal_impact_factor for p in papers if p.journal_impact_factor
-    ]
-    if impacts:
+    impacts = np.sort(impact_col[has_impact])
+    if len(impacts):
         print(f"\nImpact factor statistics:")
-        print(f"  Min: {min(impacts):.1f}")
-        print(f"  Max: {max(impacts):.1f}")
-        print(f"  Mean: {sum(impacts)/len(impacts):.1f}")
-        print(f"  Median: {sorted(impacts)[len(impacts)//2]:.1f}")
+        print(f"  Min: {impacts[0]:.1f}")
+        print(f"  Max: {impacts[-1]:.1f}")
+        print(f"  Mean: {impacts.mean():.1f}")
+        print(f"  Median: {impacts[len(impacts)//2]:.1f}")
 
     print()
 
@@ -517,6 +1438,9 @@ Examples:
   # Filter by year and keyword
   %(prog)s bibliography.bib --year-min 2020 --keyword "seizure"
 
+  # Rank full-text matches (AND by default; OR, "exact phrases" and prefix*)
+  %(prog)s bibliography.bib --keyword 'predict* "ictal onset" OR forecast*' --sort relevance
+
   # Sort by different criteria
   %(prog)s bibliography.bib --sort citation_count --reverse
   %(prog)s bibliography.bib --sort journal_impact_factor --reverse
@@ -541,6 +1465,23 @@ Examples:
     parser.add_argument(
         "--min-score", type=float, help="Minimum composite score"
     )
+    parser.add_argument(
+        "--scoring",
+        nargs="+",
+        default=["linear"],
+        metavar="[FACTOR*]FORMULA",
+        help="Composite score as a weighted sum of formulas "
+        f"({', '.join(FORMULAS)}; default: linear)",
+    )
+    parser.add_argument(
+        "--score-weights",
+        nargs="+",
+        default=[],
+        metavar="KEY=VALUE",
+        help="Formula weights, e.g. citations=1 impact_factor=10 (linear), "
+        "min_age=1 reference_year=2025 (citations_per_year), "
+        "impact_factor_offset=1 (log_citations_if)",
+    )
     parser.add_argument(
         "--year-min", type=int, help="Minimum publication year"
     )
@@ -548,13 +1489,19 @@ Examples:
         "--year-max", type=int, help="Maximum publication year"
     )
     parser.add_argument(
-        "--keyword", type=str, help="Filter by keyword in title/abstract"
+        "--keyword",
+        type=str,
+        help='Full-text query over title/abstract/keywords: words are ANDed '
+        'and match as prefixes (seizure also finds seizures); OR, exact '
+        '"phrase" or "word", and "phrase prefix*" are supported',
     )
     parser.add_argument(
         "--journal", type=str, help="Filter by journal name (partial match)"
     )
     parser.add_argument(
-        "--author", type=str, help="Filter by author name (partial match)"
+        "--author",
+        type=str,
+        help='Filter by author name ("Last", "Last, First" or "First Last")',
     )
     parser.add_argument(
         "--co-authors",
@@ -567,13 +1514,23 @@ Examples:
         default=Path("./shared/authors.tex"),
         help="Path to authors.tex file (default: ./shared/authors.tex)",
     )
+    parser.add_argument(
+        "--fuzzy-authors",
+        action="store_true",
+        help="Also match close spellings of author last names and authors "
+        "recorded without a first name",
+    )
 
     # Comparison arguments
     parser.add_argument(
+        "--tex-dirs",
         "--manuscript-dir",
+        dest="tex_dirs",
         type=Path,
-        default=Path("./01_manuscript/contents"),
-        help="Directory with manuscript .tex files (default: ./01_manuscript/contents)",
+        nargs="+",
+        default=list(TEX_DIRS),
+        help="Directories scanned recursively for citations in .tex files "
+        "(default: the manuscript, supplementary and revision contents)",
     )
     parser.add_argument(
         "--cited",
@@ -596,14 +1553,34 @@ Examples:
             "year",
             "title",
             "score",
+            "relevance",
         ],
         default="score",
-        help="Sort papers by field (default: score)",
+        help="Sort papers by field (default: score); relevance ranks "
+        "--keyword matches by BM25",
     )
     parser.add_argument(
         "--reverse", action="store_true", help="Sort in descending order"
     )
 
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Reparse the whole BibTeX file without the sidecar caches",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Filter while reading and print matches in file order as they are "
+        "found (no sorting; stops after --limit matches)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1000,
+        help="Entries parsed per batch with --stream (default: 1000)",
+    )
+
     # Display arguments
     parser.add_argument(
         "--limit", type=int, help="Maximum number of papers to display"
@@ -634,106 +1611,132 @@ Examples:
         print("Error: Cannot use --cited and --uncited together")
         sys.exit(1)
 
-    # Load papers
-    print(f"Loading papers from {args.bibtex_file}...")
+    if args.sort == "relevance" and not args.keyword:
+        print("Error: --sort relevance requires --keyword")
+        sys.exit(1)
+
     try:
-        papers = Papers.from_bibtex(args.bibtex_file)
-        print(f"✓ Loaded {len(papers)} papers\n")
-    except Exception as e:
-        print(f"Error loading BibTeX file: {e}")
+        scoring = Scoring(args.scoring, parse_weights(args.score_weights))
+    except ValueError as e:
+        print(f"Error: {e}")
         sys.exit(1)
 
     # Get cited papers if needed
     cited_keys = None
-    if args.cited or args.uncited or args.manuscript_dir.exists():
-        if args.manuscript_dir.exists():
-            cited_keys = get_cited_papers(args.manuscript_dir)
-            print(f"✓ Found {len(cited_keys)} cited papers in manuscript\n")
-        else:
-            print(
-                f"Warning: Manuscript directory not found: {args.manuscript_dir}\n"
-            )
-
-    # Apply filters
-    filtered = papers
-
-    # Metrics filters
-    if args.min_citations or args.max_citations:
-        filtered = filtered.filter(
-            min_citations=args.min_citations, max_citations=args.max_citations
-        )
-
-    if args.min_if or args.max_if:
-        filtered = filtered.filter(
-            min_impact_factor=args.min_if, max_impact_factor=args.max_if
-        )
-
-    # Score filter (custom)
-    if args.min_score:
-        filtered = filtered.filter(
-            lambda p: calculate_score(p) >= args.min_score
+    tex_dirs = [d for d in args.tex_dirs if d.exists()]
+    if tex_dirs:
+        cited_keys = get_cited_papers(
+            tex_dirs,
+            cache_path=None if args.no_cache else Path("./.cited_keys.cache.pkl"),
         )
-
-    # Year filter
-    if args.year_min or args.year_max:
-        filtered = filtered.filter(
-            year_min=args.year_min, year_max=args.year_max
+        print(f"✓ Found {len(cited_keys)} cited papers in manuscript\n")
+    elif args.cited or args.uncited:
+        print(
+            "Warning: No manuscript directory found: "
+            f"{', '.join(map(str, args.tex_dirs))}\n"
         )
 
-    # Text filters
-    if args.keyword:
-        filtered = filtered.filter(keyword=args.keyword)
-
-    if args.journal:
-        filtered = filtered.filter(journal=args.journal)
-
-    if args.author:
-        filtered = filtered.filter(author=args.author)
-
     # Co-authors filter
+    coauthors = None
     if args.co_authors:
         if args.authors_tex.exists():
             coauthors = extract_coauthors_from_tex(args.authors_tex)
             print(f"✓ Found co-authors: {', '.join(coauthors)}\n")
-            # Filter papers where any co-author appears
-            filtered = filtered.filter(
-                lambda p: any(
-                    any(coauthor.lower() in author.lower() for author in p.authors)
-                    for coauthor in coauthors
-                )
-            )
         else:
             print(f"Warning: authors.tex not found at {args.authors_tex}\n")
 
+    # Apply filters: all criteria compose into a single mask
+    criteria = dict(
+        min_citations=args.min_citations,
+        max_citations=args.max_citations,
+        min_impact_factor=args.min_if,
+        max_impact_factor=args.max_if,
+        min_score=args.min_score,
+        scoring=scoring,
+        year_min=args.year_min,
+        year_max=args.year_max,
+        keyword=args.keyword,
+        journal=args.journal,
+        author=args.author,
+        fuzzy_authors=args.fuzzy_authors,
+    )
+
     # Cited/uncited filter
     if args.cited and cited_keys:
-        filtered = filtered.filter(lambda p: p.key in cited_keys)
+        criteria["keys"] = cited_keys
     elif args.uncited and cited_keys:
-        filtered = filtered.filter(lambda p: p.key not in cited_keys)
-
-    print(f"Applied filters: {len(papers)} → {len(filtered)} papers\n")
-
-    # Sort
-    if args.sort == "score":
-        # Sort by composite score (custom)
-        filtered = filtered.sort_by(
-            lambda p: calculate_score(p),
-            reverse=args.reverse or True,  # Default descending for score
-        )
+        criteria["exclude_keys"] = cited_keys
+
+    if args.stream:
+        print(f"Streaming papers from {args.bibtex_file}...\n")
+        try:
+            filtered = stream_papers_table(
+                args.bibtex_file,
+                criteria,
+                coauthors=coauthors,
+                cited_keys=cited_keys,
+                show_score=not args.no_score,
+                max_papers=args.limit,
+                batch_size=args.batch_size,
+                scoring=scoring,
+            )
+        except Exception as e:
+            print(f"Error reading BibTeX file: {e}")
+            sys.exit(1)
+        if args.stats:
+            print_summary_stats(filtered, cited_keys)
     else:
-        filtered = filtered.sort_by(args.sort, reverse=args.reverse)
+        # Load papers
+        print(f"Loading papers from {args.bibtex_file}...")
+        try:
+            papers = Papers.from_bibtex(
+                args.bibtex_file, use_cache=not args.no_cache
+            )
+            print(f"✓ Loaded {len(papers)} papers\n")
+        except Exception as e:
+            print(f"Error loading BibTeX file: {e}")
+            sys.exit(1)
 
-    # Show statistics
-    if args.stats:
-        print_summary_stats(filtered, cited_keys)
+        filtered = papers.take(
+            np.flatnonzero(papers.mask(**criteria, authors=coauthors))
+        )
 
-    # Display results
-    print_papers_table(
-        filtered,
-        cited_keys=cited_keys,
-        show_score=not args.no_score,
-        max_papers=args.limit,
-    )
+        print(f"Applied filters: {len(papers)} → {len(filtered)} papers\n")
+
+        # Sort; with --limit only the top rows are ordered, unless the
+        # whole sorted selection is exported
+        limit = None if args.output else args.limit
+        if args.sort == "score":
+            # Sort by composite score (custom)
+            shown = filtered.sort_by(
+                calculate_scores(filtered, scoring),
+                reverse=args.reverse or True,  # Default descending for score
+                limit=limit,
+            )
+        elif args.sort == "relevance":
+            shown = filtered.sort_by(
+                filtered.relevance(args.keyword), reverse=True, limit=limit
+            )
+        else:
+            shown = filtered.sort_by(
+                args.sort, reverse=args.reverse, limit=limit
+            )
+        if args.output:
+            filtered = shown
+
+        # Show statistics
+        if args.stats:
+            print_summary_stats(filtered, cited_keys)
+
+        # Display results
+        print_papers_table(
+            shown,
+            cited_keys=cited_keys,
+            show_score=not args.no_score,
+            max_papers=args.limit,
+            scoring=scoring,
+            n_total=len(filtered),
+        )
 
     # Export if requested
     if args.output:
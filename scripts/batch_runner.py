@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Timestamp: "2026-10-19 22:14:05 (ywatanabe)"
+# File: /home/ywatanabe/proj/scitex_template_research/scripts/batch_runner.py
+# ----------------------------------------
+from __future__ import annotations
+import os
+__FILE__ = (
+    "./scripts/batch_runner.py"
+)
+__DIR__ = os.path.dirname(__FILE__)
+# ----------------------------------------
+
+"""
+Functionality:
+    - Runs a script's main() once per argument set in one warm session, so
+      interpreter start-up, imports and session start/close are paid once
+    - Optionally fans calls out to forked worker processes
+    - Isolates each call in its own output directory, log and seed
+Input:
+    - File (or '-' for stdin) with one argument set per line
+Output:
+    - <batch_dir>/<index>/log.txt (and whatever main writes to args.out_dir)
+    - <batch_dir>/status.csv
+Prerequisites:
+    - scitex package
+    - numpy
+    - pandas
+
+Usage:
+    if args.batch:
+        exit_status = run_batch(
+            args.batch,
+            main,
+            parse_args,
+            batch_dir=os.path.join(CONFIG.SDIR, "batch"),
+            n_workers=args.batch_workers,
+        )
+"""
+
+"""Imports"""
+import contextlib
+import functools
+import multiprocessing
+import random
+import shlex
+import sys
+import time
+import traceback
+from typing import Callable, Dict, Iterator, List, Tuple
+
+import numpy as np
+import pandas as pd
+from scitex import logging
+
+logger = logging.getLogger(__name__)
+
+"""Functions & Classes"""
+def iter_arg_sets(source: str) -> Iterator[List[str]]:
+    """Yields one argv per non-empty, non-comment line of a file or stdin."""
+    f = sys.stdin if source == "-" else open(source)
+    try:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield shlex.split(line)
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def to_exit_code(status) -> int:
+    """Maps a main() return value or SystemExit code to a process exit code.
+
+    As for the interpreter itself, None is 0 and anything that is not an
+    int (e.g. sys.exit("message")) is 1.
+    """
+    if status is None:
+        return 0
+    return status if isinstance(status, int) else 1
+
+
+def run_one(
+    job: Tuple[int, List[str]],
+    main: Callable,
+    parse_args: Callable,
+    batch_dir: str,
+) -> Dict:
+    """Runs main() for one argv in its own subdirectory; never raises."""
+    index, argv = job
+    out_dir = os.path.join(batch_dir, f"{index:06d}")
+    os.makedirs(out_dir, exist_ok=True)
+    # Seeded by position so results do not depend on order or worker
+    random.seed(index)
+    np.random.seed(index)
+
+    start = time.perf_counter()
+    with open(os.path.join(out_dir, "log.txt"), "w") as log, \
+            contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+        try:
+            args = parse_args(argv)
+            args.out_dir = out_dir
+            exit_status = main(args)
+        except SystemExit as err:
+            # argparse errors exit with 2
+            exit_status = err.code
+        except Exception:
+            traceback.print_exc()
+            exit_status = 1
+    return {
+        "index": index,
+        "args": shlex.join(argv),
+        "exit_status": to_exit_code(exit_status),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def run_batch(
+    source: str,
+    main: Callable,
+    parse_args: Callable,
+    batch_dir: str,
+    n_workers: int = 1,
+) -> int:
+    """Runs main() over every argument set in `source` in warm processes.
+
+    Each call gets <batch_dir>/<index>/ with its log, and
+    <batch_dir>/status.csv lists every call's exit status. Returns 1 if any
+    call failed.
+    """
+    jobs = enumerate(iter_arg_sets(source))
+    run = functools.partial(
+        run_one, main=main, parse_args=parse_args, batch_dir=batch_dir
+    )
+
+    if n_workers > 1:
+        # Forked workers inherit the started session and loaded modules
+        pool = multiprocessing.get_context("fork").Pool(n_workers)
+        results_iter = pool.imap_unordered(run, jobs)
+    else:
+        pool = None
+        results_iter = map(run, jobs)
+
+    results = []
+    try:
+        for result in results_iter:
+            results.append(result)
+            if result["exit_status"] != 0:
+                logger.warning(
+                    f"[{result['index']}] exit {result['exit_status']}: {result['args']}"
+                )
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    status = pd.DataFrame(
+        results, columns=["index", "args", "exit_status", "seconds"]
+    ).sort_values("index", ignore_index=True)
+    os.makedirs(batch_dir, exist_ok=True)
+    status_path = os.path.join(batch_dir, "status.csv")
+    status.to_csv(status_path, index=False)
+    n_failed = int((status["exit_status"] != 0).sum())
+    logger.info(f"Batch: {len(status)} calls, {n_failed} failed ({status_path})")
+    return int(n_failed > 0)
+
+# EOF
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Timestamp: "2026-10-19 12:58:09 (ywatanabe)"
+# File: /home/ywatanabe/proj/scitex_template_research/scripts/mnist/bootstrap_metrics.py
+# ----------------------------------------
+from __future__ import annotations
+import os
+__FILE__ = (
+    "./scripts/mnist/bootstrap_metrics.py"
+)
+__DIR__ = os.path.dirname(__FILE__)
+# ----------------------------------------
+
+"""
+Functionality:
+    - Computes bootstrap confidence intervals of classification metrics
+      (accuracy, per-class F1, macro F1) for all resamples at once
+Input:
+    - True labels and predictions
+Output:
+    - Point estimates and percentile confidence intervals
+Prerequisites:
+    - numpy
+    - pandas
+    - joblib
+"""
+
+"""Imports"""
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+
+"""Functions & Classes"""
+def batched_confusion_matrices(
+    labels: np.ndarray, predictions: np.ndarray, n_classes: int
+) -> np.ndarray:
+    """Returns (B, K, K) confusion matrices for (B, n) label/prediction rows.
+
+    Each (resample, true, pred) triple is mapped to one flat bin, so a
+    single `bincount` fills all B matrices.
+    """
+    n_boot = labels.shape[0]
+    offsets = np.arange(n_boot)[:, None] * (n_classes * n_classes)
+    flat = offsets + labels * n_classes + predictions
+    return np.bincount(
+        flat.ravel(), minlength=n_boot * n_classes * n_classes
+    ).reshape(n_boot, n_classes, n_classes)
+
+
+def metrics_from_confusion(cms: np.ndarray) -> Dict[str, np.ndarray]:
+    """Accuracy, per-class F1 and macro F1 of (B, K, K) confusion matrices.
+
+    Macro F1 averages over the classes present in either labels or
+    predictions of each resample, as `classification_report` does.
+    """
+    tp = np.diagonal(cms, axis1=1, axis2=2).astype(np.float64)
+    support = cms.sum(axis=2)
+    predicted = cms.sum(axis=1)
+    denom = support + predicted
+
+    f1 = np.divide(2 * tp, denom, out=np.zeros_like(tp), where=denom > 0)
+    present = denom > 0
+    return {
+        "accuracy": tp.sum(axis=1) / cms.sum(axis=(1, 2)),
+        "f1": f1,
+        "macro_f1": f1.sum(axis=1) / np.maximum(present.sum(axis=1), 1),
+    }
+
+
+def _bootstrap_chunk(
+    labels: np.ndarray,
+    predictions: np.ndarray,
+    n_classes: int,
+    n_boot: int,
+    seed: np.random.SeedSequence,
+) -> Dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    indices = rng.integers(0, len(labels), size=(n_boot, len(labels)))
+    cms = batched_confusion_matrices(
+        labels[indices], predictions[indices], n_classes
+    )
+    return metrics_from_confusion(cms)
+
+
+def bootstrap_metrics(
+    labels: np.ndarray,
+    predictions: np.ndarray,
+    n_boot: int = 1000,
+    alpha: float = 0.05,
+    random_state: Optional[int] = None,
+    chunk_size: int = 250,
+    n_jobs: int = 1,
+) -> pd.DataFrame:
+    """Percentile bootstrap CIs of accuracy, macro F1 and per-class F1.
+
+    Resamples are drawn in chunks of `chunk_size` index rows to bound
+    memory. Each chunk has its own spawned seed, so results do not depend
+    on `n_jobs`.
+    """
+    classes, encoded = np.unique(
+        np.concatenate([labels, predictions]), return_inverse=True
+    )
+    encoded_labels = encoded[: len(labels)]
+    encoded_predictions = encoded[len(labels) :]
+    n_classes = len(classes)
+
+    chunk_sizes = [
+        min(chunk_size, n_boot - start) for start in range(0, n_boot, chunk_size)
+    ]
+    seeds = np.random.SeedSequence(random_state).spawn(len(chunk_sizes))
+    chunks = Parallel(n_jobs=n_jobs)(
+        delayed(_bootstrap_chunk)(
+            encoded_labels, encoded_predictions, n_classes, size, seed
+        )
+        for size, seed in zip(chunk_sizes, seeds)
+    )
+    resampled = {
+        key: np.concatenate([chunk[key] for chunk in chunks])
+        for key in chunks[0]
+    }
+
+    point = metrics_from_confusion(
+        batched_confusion_matrices(
+            encoded_labels[None], encoded_predictions[None], n_classes
+        )
+    )
+
+    names = ["accuracy", "macro_f1"] + [f"f1_{c}" for c in classes]
+    estimates = np.concatenate(
+        [point["accuracy"], point["macro_f1"], point["f1"][0]]
+    )
+    samples = np.column_stack(
+        [resampled["accuracy"], resampled["macro_f1"], resampled["f1"]]
+    )
+    lower, upper = np.percentile(
+        samples, [100 * alpha / 2, 100 * (1 - alpha / 2)], axis=0
+    )
+    return pd.DataFrame(
+        {
+            "metric": names,
+            "estimate": estimates,
+            "ci_lower": lower,
+            "ci_upper": upper,
+        }
+    )
+
+# EOF
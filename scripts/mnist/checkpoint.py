@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Timestamp: "2026-10-19 11:05:22 (ywatanabe)"
+# File: /home/ywatanabe/proj/scitex_template_research/scripts/mnist/checkpoint.py
+# ----------------------------------------
+from __future__ import annotations
+import os
+__FILE__ = (
+    "./scripts/mnist/checkpoint.py"
+)
+__DIR__ = os.path.dirname(__FILE__)
+# ----------------------------------------
+
+"""
+Functionality:
+    - Periodically saves resumable state of a scitex script atomically
+    - Detects sessions left in RUNNING by a crashed/preempted launch
+    - Restores state (including RNG states) on the next launch, only if it
+      was computed from the same args and input data (`key`)
+Input:
+    - Script path (/path/to/file.py -> /path/to/file_out/checkpoints/)
+    - Arbitrary picklable state (model, epoch, partial results, ...)
+Output:
+    - /path/to/file_out/checkpoints/<name>.pkl
+Prerequisites:
+    - numpy
+    - (optional) PyTorch
+
+Usage:
+    ckpt = Checkpointer(
+        __file__,
+        name="train",
+        current_id=CONFIG.ID,
+        key=fingerprint({"lr": args.lr}, train_data),
+    )
+    state = ckpt.load() or {"epoch": 0}
+    for epoch in range(state["epoch"], n_epochs):
+        ...
+        ckpt.maybe_save(lambda: {"epoch": epoch + 1, "model": model})
+    ckpt.clear()  # on success
+"""
+
+"""Imports"""
+import hashlib
+import logging
+import pickle
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+from io_paths import get_out_dir
+
+logger = logging.getLogger(__name__)
+
+"""Functions & Classes"""
+def find_incomplete_sessions(
+    out_dir: str, current_id: Optional[str] = None
+) -> List[str]:
+    """Lists session directories left under `out_dir/RUNNING`.
+
+    scitex moves a session from RUNNING to FINISHED_SUCCESS/FAILED in
+    `session.close`, so anything remaining there other than the current
+    session (`CONFIG.ID`) was interrupted.
+    """
+    running_dir = os.path.join(out_dir, "RUNNING")
+    if not os.path.isdir(running_dir):
+        return []
+    return sorted(
+        os.path.join(running_dir, name)
+        for name in os.listdir(running_dir)
+        if name != current_id
+        and os.path.isdir(os.path.join(running_dir, name))
+    )
+
+
+def fingerprint(*parts: Any) -> str:
+    """SHA-1 of what a checkpoint is computed from (args, input data, ...).
+
+    Arrays, and anything exposing `__array__` such as torch tensors, count
+    by dtype, shape and contents; dicts by their sorted items; anything
+    else by its repr.
+    """
+    sha1 = hashlib.sha1()
+    for part in parts:
+        if isinstance(part, dict):
+            sha1.update(repr(sorted(part.items())).encode())
+        elif hasattr(part, "__array__"):
+            array = np.ascontiguousarray(part)
+            sha1.update(f"{array.dtype.str}{array.shape}".encode())
+            sha1.update(array.reshape(-1).view(np.uint8))
+        else:
+            sha1.update(repr(part).encode())
+        sha1.update(b"\0")
+    return sha1.hexdigest()
+
+
+def get_rng_states() -> Dict[str, Any]:
+    states = {
+        "random": random.getstate(),
+        "numpy": np.random.get_state(),
+    }
+    if "torch" in sys.modules:
+        import torch
+
+        states["torch"] = torch.get_rng_state()
+    return states
+
+
+def set_rng_states(states: Dict[str, Any]) -> None:
+    random.setstate(states["random"])
+    np.random.set_state(states["numpy"])
+    if "torch" in states and "torch" in sys.modules:
+        import torch
+
+        torch.set_rng_state(states["torch"])
+
+
+class Checkpointer:
+    """Atomic, periodic checkpointing into the `_out` directory of a script.
+
+    `key` (see `fingerprint`) is stored with every save; a checkpoint whose
+    key differs, e.g. after the args or input data changed, is discarded
+    instead of resumed.
+    """
+
+    def __init__(
+        self,
+        file: str,
+        name: str = "checkpoint",
+        interval_sec: float = 300.0,
+        resume: bool = True,
+        current_id: Optional[str] = None,
+        key: Optional[str] = None,
+    ):
+        self.out_dir = get_out_dir(file)
+        self.key = key
+        self.current_id = current_id
+        self.path = os.path.join(self.out_dir, "checkpoints", f"{name}.pkl")
+        self.interval_sec = interval_sec
+        self.resume = resume
+        self._last_saved = time.monotonic()
+
+    def save(self, state: Dict[str, Any]) -> str:
+        """Writes state to a temporary file and renames it into place.
+
+        `os.replace` is atomic on POSIX, so a crash mid-write leaves the
+        previous checkpoint intact.
+        """
+        payload = {
+            "state": state,
+            "key": self.key,
+            "rng_states": get_rng_states(),
+            "saved_at": time.time(),
+        }
+        ckpt_dir = os.path.dirname(self.path)
+        os.makedirs(ckpt_dir, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=ckpt_dir, suffix=".tmp", delete=False
+        ) as f:
+            try:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+                f.flush()
+                os.fsync(f.fileno())
+            except BaseException:
+                os.remove(f.name)
+                raise
+        os.replace(f.name, self.path)
+        self._last_saved = time.monotonic()
+        logger.info(f"Checkpoint saved: {self.path}")
+        return self.path
+
+    def maybe_save(
+        self, get_state: Callable[[], Dict[str, Any]], force: bool = False
+    ) -> bool:
+        """Saves `get_state()` if `interval_sec` has elapsed since the last save."""
+        if not force and time.monotonic() - self._last_saved < self.interval_sec:
+            return False
+        self.save(get_state())
+        return True
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Returns the saved state (restoring RNG states) or None."""
+        if not self.resume or not os.path.exists(self.path):
+            return None
+
+        incomplete = find_incomplete_sessions(self.out_dir, self.current_id)
+        if incomplete:
+            logger.warning(
+                f"Found {len(incomplete)} incomplete session(s): {incomplete}"
+            )
+
+        with open(self.path, "rb") as f:
+            payload = pickle.load(f)
+        if payload.get("key") != self.key:
+            logger.warning(
+                f"Discarding checkpoint computed from different args or "
+                f"input data: {self.path}"
+            )
+            self.clear()
+            return None
+        set_rng_states(payload["rng_states"])
+        logger.warning(
+            f"Resuming from checkpoint saved at "
+            f"{time.ctime(payload['saved_at'])}: {self.path}"
+        )
+        return payload["state"]
+
+    def clear(self) -> None:
+        """Removes the checkpoint once the run has completed."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+# EOF
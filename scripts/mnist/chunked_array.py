@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Timestamp: "2026-10-19 16:42:08 (ywatanabe)"
+# File: /home/ywatanabe/proj/scitex_template_research/scripts/mnist/chunked_array.py
+# ----------------------------------------
+from __future__ import annotations
+import os
+__FILE__ = (
+    "./scripts/mnist/chunked_array.py"
+)
+__DIR__ = os.path.dirname(__FILE__)
+# ----------------------------------------
+
+"""
+Functionality:
+    - Stores arrays as fixed-size row chunks, each compressed independently
+    - Slices decompress only the chunks they touch, in parallel
+    - Resolves a logical .npy path to its .npc sibling when only that exists
+Input:
+    - Any array-like with a leading row axis (including memmaps)
+Output:
+    - <name>.npc: magic, compressed chunks, JSON index, index length, magic
+Prerequisites:
+    - numpy
+    - zstandard or lz4 (optional; zlib, lzma and bz2 are always available)
+
+Usage:
+    save_chunked("./data/mnist/train_flattened.npc", data, codec="zlib")
+    data = ChunkedArray("./data/mnist/train_flattened.npc")
+    batch = data[np.random.permutation(len(data))[:64]]  # touches <= 64 chunks
+"""
+
+"""Imports"""
+import bz2
+import json
+import lzma
+import struct
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+"""Parameters"""
+MAGIC = b"NPCHUNK1"
+SUFFIX = ".npc"
+_TRAILER = struct.Struct("<Q8s")
+
+"""Functions & Classes"""
+# name -> (compress(raw, level), decompress(blob), default level)
+CODECS: Dict[str, Tuple[Callable, Callable, Optional[int]]] = {
+    "none": (lambda raw, level: raw, lambda blob: blob, None),
+    "zlib": (zlib.compress, zlib.decompress, 6),
+    "lzma": (
+        lambda raw, level: lzma.compress(raw, preset=level),
+        lzma.decompress,
+        6,
+    ),
+    "bz2": (bz2.compress, bz2.decompress, 9),
+}
+
+try:
+    import zstandard
+
+    CODECS["zstd"] = (
+        lambda raw, level: zstandard.ZstdCompressor(level=level).compress(raw),
+        lambda blob: zstandard.ZstdDecompressor().decompress(blob),
+        3,
+    )
+except ImportError:
+    pass
+
+try:
+    import lz4.frame
+
+    CODECS["lz4"] = (
+        lambda raw, level: lz4.frame.compress(raw, compression_level=level),
+        lz4.frame.decompress,
+        0,
+    )
+except ImportError:
+    pass
+
+
+def chunked_path(path: str) -> str:
+    """Returns the .npc sibling of a logical array path."""
+    return os.path.splitext(path)[0] + SUFFIX
+
+
+def resolve_array_path(path: str) -> str:
+    """Returns `path` or its .npc sibling, whichever was written last."""
+    npc_path = chunked_path(path)
+    if os.path.exists(npc_path) and (
+        not os.path.exists(path)
+        or os.path.getmtime(npc_path) >= os.path.getmtime(path)
+    ):
+        return npc_path
+    return path
+
+
+def open_array(path: str, n_jobs: Optional[int] = None, cache_mb: float = 256.0) -> Any:
+    """Opens an array for random row access without reading it whole.
+
+    Returns a ChunkedArray for .npc files and a read-only memmap otherwise.
+    """
+    path = resolve_array_path(path)
+    if path.endswith(SUFFIX):
+        return ChunkedArray(path, n_jobs=n_jobs, cache_mb=cache_mb)
+    return np.load(path, mmap_mode="r")
+
+
+def _shuffle_bytes(chunk: np.ndarray) -> bytes:
+    # Grouping the k-th byte of every element makes floats compress far better
+    raw = np.ascontiguousarray(chunk).view(np.uint8)
+    return raw.reshape(-1, chunk.dtype.itemsize).T.tobytes()
+
+
+def _unshuffle_bytes(raw: bytes, dtype: np.dtype) -> np.ndarray:
+    planes = np.frombuffer(raw, dtype=np.uint8).reshape(dtype.itemsize, -1)
+    return np.ascontiguousarray(planes.T).view(dtype).ravel()
+
+
+def save_chunked(
+    path: str,
+    array: Any,
+    chunk_rows: int = 4096,
+    codec: str = "zlib",
+    level: Optional[int] = None,
+    shuffle: bool = True,
+    n_jobs: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Writes `array` as independently compressed row chunks.
+
+    Chunks are compressed in a thread pool (the codecs release the GIL) and
+    written in order; the file is moved into place only once complete.
+    Returns the index written to the file.
+    """
+    if codec not in CODECS:
+        raise ValueError(f"Unknown codec '{codec}'; available: {sorted(CODECS)}")
+    compress, _, default_level = CODECS[codec]
+    level = default_level if level is None else level
+    dtype = np.dtype(array.dtype)
+    shape = tuple(int(n) for n in array.shape)
+    shuffle = shuffle and dtype.itemsize > 1
+
+    def encode(start: int) -> bytes:
+        chunk = np.ascontiguousarray(array[start : start + chunk_rows])
+        raw = _shuffle_bytes(chunk) if shuffle else chunk.tobytes()
+        return compress(raw, level)
+
+    index = {
+        "shape": list(shape),
+        "dtype": dtype.str,
+        "chunk_rows": chunk_rows,
+        "codec": codec,
+        "shuffle": shuffle,
+        "offsets": [],
+        "sizes": [],
+    }
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f, ThreadPoolExecutor(n_jobs) as pool:
+        f.write(MAGIC)
+        starts = range(0, shape[0], chunk_rows)
+        # map() yields in submission order, so chunks land sequentially
+        for blob in pool.map(encode, starts):
+            index["offsets"].append(f.tell())
+            index["sizes"].append(len(blob))
+            f.write(blob)
+        header = json.dumps(index).encode()
+        f.write(header)
+        f.write(_TRAILER.pack(len(header), MAGIC))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return index
+
+
+class ChunkedArray:
+    """Read-only, lazily decompressed view of a .npc file.
+
+    Supports `len`, `shape`, `dtype` and numpy-style indexing whose first
+    element selects rows (int, slice, integer or boolean array); remaining
+    index elements are applied to the decoded rows. Recently decoded chunks
+    are kept up to `cache_mb`, so repeated random batches stay cheap. Not
+    safe to index from several threads at once.
+    """
+
+    def __init__(
+        self, path: str, n_jobs: Optional[int] = None, cache_mb: float = 256.0
+    ):
+        self.path = path
+        self.n_jobs = n_jobs
+        # Decoded chunks kept for repeated random batches, least recent first
+        self.cache_mb = cache_mb
+        self._cache: OrderedDict[int, np.ndarray] = OrderedDict()
+        self._cache_nbytes = 0
+        with open(path, "rb") as f:
+            f.seek(-_TRAILER.size, os.SEEK_END)
+            header_size, magic = _TRAILER.unpack(f.read(_TRAILER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a chunked array file")
+            f.seek(-_TRAILER.size - header_size, os.SEEK_END)
+            index = json.loads(f.read(header_size))
+        self.shape = tuple(index["shape"])
+        self.dtype = np.dtype(index["dtype"])
+        self.chunk_rows = index["chunk_rows"]
+        self.codec = index["codec"]
+        self.shuffle = index["shuffle"]
+        self._offsets = index["offsets"]
+        self._sizes = index["sizes"]
+        self._decompress = CODECS[self.codec][1]
+        self._row_shape = self.shape[1:]
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __repr__(self) -> str:
+        return (
+            f"ChunkedArray({self.path!r}, shape={self.shape}, "
+            f"dtype={self.dtype}, codec={self.codec}, "
+            f"ratio={self.nbytes / max(self.compressed_nbytes, 1):.1f}x)"
+        )
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    @property
+    def nbytes(self) -> int:
+        return int(np.prod(self.shape)) * self.dtype.itemsize
+
+    @property
+    def compressed_nbytes(self) -> int:
+        return int(sum(self._sizes))
+
+    @property
+    def n_chunks(self) -> int:
+        return len(self._offsets)
+
+    def read_chunk(self, i_chunk: int) -> np.ndarray:
+        """Decodes one chunk into a (rows, *row_shape) array."""
+        # os.pread keeps concurrent reads on one descriptor position-free
+        fd = os.open(self.path, os.O_RDONLY)
+        try:
+            blob = os.pread(fd, self._sizes[i_chunk], self._offsets[i_chunk])
+        finally:
+            os.close(fd)
+        raw = self._decompress(blob)
+        if self.shuffle:
+            flat = _unshuffle_bytes(raw, self.dtype)
+        else:
+            flat = np.frombuffer(raw, dtype=self.dtype)
+        return flat.reshape((-1,) + self._row_shape)
+
+    def _read_chunks(self, chunk_ids: np.ndarray) -> Dict[int, np.ndarray]:
+        chunks = {}
+        missing = []
+        for i_chunk in (int(i) for i in chunk_ids):
+            if i_chunk in self._cache:
+                self._cache.move_to_end(i_chunk)
+                chunks[i_chunk] = self._cache[i_chunk]
+            else:
+                missing.append(i_chunk)
+        if len(missing) == 1:
+            chunks[missing[0]] = self.read_chunk(missing[0])
+        elif missing:
+            with ThreadPoolExecutor(self.n_jobs) as pool:
+                chunks.update(zip(missing, pool.map(self.read_chunk, missing)))
+        for i_chunk in missing:
+            self._cache_chunk(i_chunk, chunks[i_chunk])
+        return chunks
+
+    def _cache_chunk(self, i_chunk: int, chunk: np.ndarray) -> None:
+        limit = self.cache_mb * 1e6
+        if chunk.nbytes > limit:
+            return
+        self._cache[i_chunk] = chunk
+        self._cache_nbytes += chunk.nbytes
+        while self._cache_nbytes > limit:
+            _, evicted = self._cache.popitem(last=False)
+            self._cache_nbytes -= evicted.nbytes
+
+    def _read_rows(self, rows: np.ndarray) -> np.ndarray:
+        chunk_of_row = rows // self.chunk_rows
+        chunks = self._read_chunks(np.unique(chunk_of_row))
+        out = np.empty((len(rows),) + self._row_shape, dtype=self.dtype)
+        for i_chunk, chunk in chunks.items():
+            mask = chunk_of_row == i_chunk
+            out[mask] = chunk[rows[mask] - i_chunk * self.chunk_rows]
+        return out
+
+    def _read_slice(self, start: int, stop: int) -> np.ndarray:
+        if stop <= start:
+            return np.empty((0,) + self._row_shape, dtype=self.dtype)
+        first, last = start // self.chunk_rows, (stop - 1) // self.chunk_rows
+        chunks = self._read_chunks(np.arange(first, last + 1))
+        joined = np.concatenate([chunks[i] for i in range(first, last + 1)])
+        offset = first * self.chunk_rows
+        return joined[start - offset : stop - offset]
+
+    def __getitem__(self, key: Any) -> np.ndarray:
+        if not isinstance(key, tuple):
+            key = (key,)
+        row_key, rest = key[0], key[1:]
+        n_rows = self.shape[0]
+        # Number of leading output axes produced by the row selection
+        n_lead = 1
+
+        if isinstance(row_key, slice):
+            start, stop, step = row_key.indices(n_rows)
+            if step == 1:
+                out = self._read_slice(start, stop)
+            else:
+                out = self._read_rows(np.arange(start, stop, step))
+        elif row_key is Ellipsis:
+            out, rest, n_lead = self._read_slice(0, n_rows), key, 0
+        elif np.isscalar(row_key) and np.issubdtype(type(row_key), np.integer):
+            row = int(row_key) + n_rows if row_key < 0 else int(row_key)
+            if not 0 <= row < n_rows:
+                raise IndexError(f"index {row_key} out of range for {n_rows} rows")
+            out, n_lead = self._read_rows(np.array([row]))[0], 0
+        else:
+            rows = np.asarray(row_key)
+            if rows.dtype == bool:
+                rows = np.flatnonzero(rows)
+            rows = np.where(rows < 0, rows + n_rows, rows).astype(np.int64)
+            if rows.size and (rows.min() < 0 or rows.max() >= n_rows):
+                raise IndexError(f"index out of range for {n_rows} rows")
+            out = self._read_rows(rows.ravel()).reshape(
+                rows.shape + self._row_shape
+            )
+            n_lead = rows.ndim
+        return out[(slice(None),) * n_lead + rest] if rest else out
+
+    def read(self) -> np.ndarray:
+        """Decodes the whole array."""
+        return self[:]
+
+    def __array__(self, dtype: Optional[np.dtype] = None, copy: Any = None) -> np.ndarray:
+        out = self.read()
+        return out if dtype is None else out.astype(dtype, copy=False)
+
+# EOF
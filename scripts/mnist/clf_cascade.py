@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Timestamp: "2026-10-19 14:05:33 (ywatanabe)"
+# File: /home/ywatanabe/proj/scitex_template_research/scripts/mnist/clf_cascade.py
+# ----------------------------------------
+from __future__ import annotations
+import os
+__FILE__ = (
+    "./scripts/mnist/clf_cascade.py"
+)
+__DIR__ = os.path.dirname(__FILE__)
+# ----------------------------------------
+
+"""
+Functionality:
+    - Trains a cheap first-stage classifier (linear or PCA+kNN)
+    - Forwards only low-margin samples to the SVM saved by clf_svm.py
+    - Compares forwarded fraction, accuracy and throughput with SVM-only
+Input:
+    - Flattened MNIST data
+    - Trained SVM model
+Output:
+    - First-stage model
+    - Cascade vs SVM-only comparison table
+Prerequisites:
+    - scitex package
+    - scikit-learn
+"""
+
+"""Imports"""
+import argparse
+import time
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+import scitex
+from config_compiler import load_config
+from dataset_host import load_array
+from sklearn.base import ClassifierMixin
+from sklearn.decomposition import PCA
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import accuracy_score
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import make_pipeline
+
+"""Parameters"""
+# All static values come from CFG; the session CONFIG only for ID and SDIR
+CFG = load_config()
+
+"""Functions & Classes"""
+def train_first_stage(
+    kind: str, features: np.ndarray, labels: np.ndarray
+) -> ClassifierMixin:
+    if kind == "linear":
+        model = SGDClassifier(
+            loss="log_loss", random_state=CFG.MNIST.RANDOM_STATE
+        )
+    else:
+        model = make_pipeline(
+            PCA(
+                n_components=CFG.MNIST.CASCADE.PCA_N_COMPONENTS,
+                random_state=CFG.MNIST.RANDOM_STATE,
+            ),
+            KNeighborsClassifier(n_neighbors=CFG.MNIST.CASCADE.KNN_N_NEIGHBORS),
+        )
+    model.fit(features, labels)
+    return model
+
+
+def top2_margin(proba: np.ndarray) -> np.ndarray:
+    """Difference between the two largest class probabilities per row."""
+    top2 = np.partition(proba, -2, axis=1)[:, -2:]
+    return top2[:, 1] - top2[:, 0]
+
+
+def cascade_predict(
+    first_stage: ClassifierMixin,
+    svm: ClassifierMixin,
+    features: np.ndarray,
+    min_margin: float,
+) -> Dict[str, np.ndarray]:
+    proba = first_stage.predict_proba(features)
+    predictions = first_stage.classes_[proba.argmax(axis=1)]
+    forwarded = top2_margin(proba) < min_margin
+    if forwarded.any():
+        predictions[forwarded] = svm.predict(features[forwarded])
+    return {"predictions": predictions, "forwarded": forwarded}
+
+
+def compare(
+    first_stage: ClassifierMixin,
+    svm: ClassifierMixin,
+    features: np.ndarray,
+    labels: np.ndarray,
+    margins: list,
+) -> pd.DataFrame:
+    start = time.perf_counter()
+    svm_predictions = svm.predict(features)
+    svm_time = time.perf_counter() - start
+
+    rows = [
+        {
+            "mode": "svm",
+            "min_margin": np.nan,
+            "forwarded_fraction": 1.0,
+            "accuracy": accuracy_score(labels, svm_predictions),
+            "samples_per_sec": len(features) / svm_time,
+            "speedup": 1.0,
+        }
+    ]
+    for min_margin in margins:
+        start = time.perf_counter()
+        outputs = cascade_predict(first_stage, svm, features, min_margin)
+        elapsed = time.perf_counter() - start
+        rows.append(
+            {
+                "mode": "cascade",
+                "min_margin": min_margin,
+                "forwarded_fraction": outputs["forwarded"].mean(),
+                "accuracy": accuracy_score(labels, outputs["predictions"]),
+                "samples_per_sec": len(features) / elapsed,
+                "speedup": svm_time / elapsed,
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def main(args: argparse.Namespace) -> Optional[int]:
+    train_data = load_array(
+        CFG.PATH.MNIST.FLATTENED.TRAIN, CFG.PATH.MNIST.SHM_REGISTRY
+    )
+    train_labels = load_array(
+        CFG.PATH.MNIST.LABELS.TRAIN, CFG.PATH.MNIST.SHM_REGISTRY
+    )
+    test_data = load_array(
+        CFG.PATH.MNIST.FLATTENED.TEST, CFG.PATH.MNIST.SHM_REGISTRY
+    )
+    test_labels = load_array(
+        CFG.PATH.MNIST.LABELS.TEST, CFG.PATH.MNIST.SHM_REGISTRY
+    )
+
+    svm = scitex.io.load(CFG.PATH.MNIST.MODEL_SVM)
+    first_stage = train_first_stage(args.first_stage, train_data, train_labels)
+    scitex.io.save(
+        first_stage, f"./first_stage_{args.first_stage}.pkl", symlink_from_cwd=True
+    )
+
+    margins = args.margins or [CFG.MNIST.CASCADE.MIN_MARGIN]
+    results = compare(first_stage, svm, test_data, test_labels, margins)
+    scitex.io.save(results, "./cascade_vs_svm.csv", symlink_from_cwd=True)
+    scitex.str.printc(results.to_string(index=False), c="green")
+    return 0
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Confidence-gated cascade of a cheap classifier and the SVM"
+    )
+    parser.add_argument(
+        "--first-stage",
+        type=str,
+        choices=["linear", "pca_knn"],
+        default="linear",
+        help="First-stage classifier (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--margins",
+        type=float,
+        nargs="+",
+        default=None,
+        help="Top-2 probability margins below which samples are forwarded; "
+        "CFG.MNIST.CASCADE.MIN_MARGIN if unset (default: %(default)s)",
+    )
+    args = parser.parse_args()
+    scitex.str.printc(args, c="yellow")
+    return args
+
+
+def run_session() -> None:
+    """Initialize scitex framework, run main function, and cleanup.
+
+    scitex framework manages:
+      - Parameters defined in yaml files under `./config dir`
+      - Setting saving directory (/path/to/file.py -> /path/to/file.py_out/)
+      - Symlink for `./data` directory
+      - Logging timestamp, stdout, stderr, and parameters
+      - Matplotlib configurations (also, `scitex.plt` will track plotting data)
+      - Random seeds
+
+    THUS, DO NOT MODIFY THIS RUN_MAIN FUNCTION
+    """
+    import sys  # DO NOT CHANGE THIS
+
+    import matplotlib.pyplot as plt  # DO NOT CHANGE THIS
+
+    global CONFIG, CC, sys, plt
+    args = parse_args()
+    CONFIG, sys.stdout, sys.stderr, plt, CC, rng = scitex.session.start(
+        sys,
+        plt,
+        args=args,
+        file=__file__,
+        agg=True,
+    )
+
+    exit_status = main(args)
+
+    scitex.session.close(
+        CONFIG,
+        exit_status=exit_status,
+    )
+
+
+if __name__ == "__main__":
+    run_session()
+
+# EOF
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Timestamp: "2026-10-19 10:41:08 (ywatanabe)"
+# File: /home/ywatanabe/proj/scitex_template_research/scripts/mnist/clf_cnn.py
+# ----------------------------------------
+from __future__ import annotations
+import os
+__FILE__ = (
+    "./scripts/mnist/clf_cnn.py"
+)
+__DIR__ = os.path.dirname(__FILE__)
+# ----------------------------------------
+
+"""
+Functionality:
+    - Trains and evaluates a small CNN classifier on MNIST on CPU
+    - Reports training throughput (images/sec) per epoch
+Input:
+    - MNIST data loaders
+Output:
+    - Trained CNN weights
+    - Classification metrics
+Prerequisites:
+    - scitex package
+    - PyTorch
+    - scikit-learn
+"""
+
+"""Imports"""
+import argparse
+import time
+from contextlib import nullcontext
+from typing import Dict, Optional
+
+import numpy as np
+import scitex
+import torch
+from checkpoint import Checkpointer, fingerprint
+from config_compiler import load_config
+from thread_budget import ThreadBudget, get_cpu_allowance
+import torch.nn as nn
+import torch.nn.functional as F
+from sklearn.metrics import classification_report
+from torch.utils.data import DataLoader
+from tensor_dataset import NormalizedMNIST, make_loader
+
+"""Parameters"""
+# All static values come from CFG; the session CONFIG only for ID and SDIR
+CFG = load_config()
+
+"""Functions & Classes"""
+class SmallCNN(nn.Module):
+    def __init__(self, n_classes: int = 10):
+        super().__init__()
+        self.conv1 = nn.Conv2d(1, 16, kernel_size=5)
+        self.conv2 = nn.Conv2d(16, 32, kernel_size=5)
+        self.fc1 = nn.Linear(32 * 4 * 4, 128)
+        self.fc2 = nn.Linear(128, n_classes)
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        x = F.max_pool2d(F.relu(self.conv1(x)), 2)
+        x = F.max_pool2d(F.relu(self.conv2(x)), 2)
+        x = torch.flatten(x, 1)
+        x = F.relu(self.fc1(x))
+        return self.fc2(x)
+
+
+def configure_interop_threads(n_interop_threads: int) -> None:
+    """Sets the torch inter-op pool; intra-op threads come from the budget."""
+    try:
+        torch.set_interop_threads(n_interop_threads)
+    except RuntimeError:
+        # Inter-op pool can only be sized once per process
+        pass
+
+
+def create_loaders(args: argparse.Namespace) -> Dict[str, DataLoader]:
+    """Rebuilds the saved loaders with optional worker prefetching."""
+    loader_kwargs = {}
+    if args.num_workers > 0:
+        loader_kwargs = dict(
+            num_workers=args.num_workers,
+            persistent_workers=True,
+            prefetch_factor=args.prefetch_factor,
+        )
+
+    # Loaders saved before the tensor fast path hold torchvision datasets
+    mean = CFG.MNIST.NORMALIZE.MEAN
+    std = CFG.MNIST.NORMALIZE.STD
+    train_dataset = NormalizedMNIST.from_mnist(
+        scitex.io.load(CFG.PATH.MNIST.LOADER.TRAIN).dataset, mean, std
+    )
+    test_dataset = NormalizedMNIST.from_mnist(
+        scitex.io.load(CFG.PATH.MNIST.LOADER.TEST).dataset, mean, std
+    )
+    train_loader = make_loader(
+        train_dataset,
+        batch_size=CFG.MNIST.BATCH_SIZE.TRAIN,
+        shuffle=True,
+        **loader_kwargs,
+    )
+    test_loader = make_loader(
+        test_dataset,
+        batch_size=CFG.MNIST.BATCH_SIZE.TEST,
+        **loader_kwargs,
+    )
+    return {"train": train_loader, "test": test_loader}
+
+
+def build_model(
+    args: argparse.Namespace, state_dict: Optional[Dict] = None
+) -> nn.Module:
+    model = SmallCNN(n_classes=len(CFG.MNIST.LABELS))
+    if state_dict is not None:
+        model.load_state_dict(state_dict)
+    model = model.to(memory_format=torch.channels_last)
+    if args.compile and hasattr(torch, "compile"):
+        model = torch.compile(model)
+    return model
+
+
+def autocast(enabled: bool):
+    if enabled:
+        return torch.autocast("cpu", dtype=torch.bfloat16)
+    return nullcontext()
+
+
+def train_cnn(
+    model: nn.Module,
+    loader: DataLoader,
+    args: argparse.Namespace,
+    ckpt: Checkpointer,
+    state: Optional[Dict] = None,
+) -> nn.Module:
+    optimizer = torch.optim.Adam(model.parameters(), lr=args.lr)
+    start_epoch = 0
+    if state is not None:
+        optimizer.load_state_dict(state["optimizer"])
+        start_epoch = state["epoch"]
+
+    model.train()
+    for epoch in range(start_epoch, CFG.MNIST.N_EPOCHS):
+        n_images = 0
+        running_loss = 0.0
+        start = time.perf_counter()
+        for images, labels in loader:
+            images = images.contiguous(memory_format=torch.channels_last)
+            optimizer.zero_grad(set_to_none=True)
+            with autocast(args.bf16):
+                loss = F.cross_entropy(model(images), labels)
+            loss.backward()
+            optimizer.step()
+            n_images += len(labels)
+            running_loss += loss.item() * len(labels)
+        elapsed = time.perf_counter() - start
+
+        scitex.str.printc(
+            f"Epoch {epoch + 1}/{CFG.MNIST.N_EPOCHS}: "
+            f"loss {running_loss / n_images:.4f}, "
+            f"{n_images / elapsed:,.0f} images/sec ({elapsed:.1f} s)",
+            c="yellow",
+        )
+        ckpt.maybe_save(
+            lambda: {
+                "epoch": epoch + 1,
+                "model": getattr(model, "_orig_mod", model).state_dict(),
+                "optimizer": optimizer.state_dict(),
+            }
+        )
+    return model
+
+
+@torch.no_grad()
+def predict(
+    model: nn.Module, loader: DataLoader, args: argparse.Namespace
+) -> Dict[str, np.ndarray]:
+    model.eval()
+    predictions, labels = [], []
+    for images, batch_labels in loader:
+        images = images.contiguous(memory_format=torch.channels_last)
+        with autocast(args.bf16):
+            logits = model(images)
+        predictions.append(logits.argmax(dim=1).numpy())
+        labels.append(batch_labels.numpy())
+    return {
+        "predictions": np.concatenate(predictions),
+        "labels": np.concatenate(labels),
+    }
+
+
+def evaluate(
+    model: nn.Module, loader: DataLoader, args: argparse.Namespace
+) -> Dict[str, float]:
+    outputs = predict(model, loader, args)
+    report = classification_report(
+        outputs["labels"], outputs["predictions"], output_dict=True
+    )
+
+    scitex.io.save(
+        report, "./classification_report.csv", symlink_from_cwd=True
+    )
+    scitex.io.save(
+        outputs["predictions"], "./predictions.npy", symlink_from_cwd=True
+    )
+    scitex.io.save(outputs["labels"], "./labels.npy", symlink_from_cwd=True)
+
+    return {
+        "accuracy": report["accuracy"],
+        "macro_f1": report["macro avg"]["f1-score"],
+    }
+
+
+def main(args: argparse.Namespace) -> Optional[int]:
+    configure_interop_threads(args.n_interop_threads)
+    budget = ThreadBudget(
+        args.n_threads or get_cpu_allowance(CFG.RESOURCES.N_CPUS)
+    )
+    loaders = create_loaders(args)
+
+    ckpt = Checkpointer(
+        __file__,
+        name="train_cnn",
+        interval_sec=args.checkpoint_interval,
+        resume=not args.no_resume,
+        current_id=CONFIG.ID,
+        key=fingerprint(
+            {"lr": args.lr, "bf16": args.bf16, "compile": args.compile},
+            CFG.MNIST.BATCH_SIZE.TRAIN,
+            loaders["train"].dataset.data,
+            loaders["train"].dataset.targets,
+        ),
+    )
+    state = ckpt.load()
+    model = build_model(args, state_dict=state and state["model"])
+
+    # torch intra-op threads are the outer layer; MKL/OpenMP follow them
+    with budget.section("train_cnn", outer=budget.n_cpus, blas=budget.n_cpus):
+        start = time.perf_counter()
+        model = train_cnn(model, loaders["train"], args, ckpt, state=state)
+        train_time = time.perf_counter() - start
+        metrics = evaluate(model, loaders["test"], args)
+
+    scitex.str.printc(
+        f"Test Accuracy: {metrics['accuracy']:.4f}, Macro F1: {metrics['macro_f1']:.4f}, "
+        f"Training time: {train_time:.1f} s",
+        c="green",
+    )
+
+    # Unwrap torch.compile so the saved state_dict keys match SmallCNN
+    model = getattr(model, "_orig_mod", model)
+    scitex.io.save(
+        model.state_dict(),
+        CFG.PATH.MNIST.MODEL_CNN,
+        symlink_from_cwd=True,
+    )
+    ckpt.clear()
+    return 0
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Train CNN classifier on MNIST (CPU)"
+    )
+    parser.add_argument(
+        "--lr",
+        type=float,
+        default=1e-3,
+        help="Learning rate (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--num-workers",
+        type=int,
+        default=0,
+        help="DataLoader worker processes; batches are in-memory tensor slices, so 0 is usually fastest (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--prefetch-factor",
+        type=int,
+        default=4,
+        help="Batches prefetched per worker (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--n-threads",
+        type=int,
+        default=None,
+        help="torch intra-op threads; the session CPU allowance if unset (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--n-interop-threads",
+        type=int,
+        default=1,
+        help="torch inter-op threads (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--bf16",
+        action="store_true",
+        default=False,
+        help="Use bfloat16 autocast on CPU (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--compile",
+        action="store_true",
+        default=False,
+        help="Use torch.compile when available (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--checkpoint-interval",
+        type=float,
+        default=300.0,
+        help="Minimum seconds between epoch checkpoints (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        default=False,
+        help="Ignore checkpoints left by an interrupted run (default: %(default)s)",
+    )
+    args = parser.parse_args()
+    scitex.str.printc(args, c="yellow")
+    return args
+
+
+def run_session() -> None:
+    """Initialize scitex framework, run main function, and cleanup.
+
+    scitex framework manages:
+      - Parameters defined in yaml files under `./config dir`
+      - Setting saving directory (/path/to/file.py -> /path/to/file.py_out/)
+      - Symlink for `./data` directory
+      - Logging timestamp, stdout, stderr, and parameters
+      - Matplotlib configurations (also, `scitex.plt` will track plotting data)
+      - Random seeds
+
+    THUS, DO NOT MODIFY THIS RUN_MAIN FUNCTION
+    """
+    import sys  # DO NOT CHANGE THIS
+
+    import matplotlib.pyplot as plt  # DO NOT CHANGE THIS
+
+    global CONFIG, CC, sys, plt
+    args = parse_args()
+    CONFIG, sys.stdout, sys.stderr, plt, CC, rng = scitex.session.start(
+        sys,
+        plt,
+        args=args,
+        file=__file__,
+        agg=True,
+    )
+
+    exit_status = main(args)
+
+    scitex.session.close(
+        CONFIG,
+        exit_status=exit_status,
+    )
+
+
+if __name__ == "__main__":
+    run_session()
+
+# EOF
@@ -19,6 +19,7 @@ Input:
 Output:
     - Trained SVM model
     - Classification metrics
+    - One-vs-rest decision scores (float32)
 Prerequisites:
     - scitex package
     - scikit-learn
@@ -26,18 +27,27 @@ Prerequisites:
 
 """Imports"""
 import argparse
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 import numpy as np
 import scitex
+from bootstrap_metrics import bootstrap_metrics
+from checkpoint import Checkpointer, fingerprint
+from config_compiler import load_config
+from dataset_host import load_array
+from feature_store import FeatureStore
 from sklearn.metrics import classification_report
 from sklearn.svm import SVC
+from svm_predictor import BlockedRBFPredictor
+from thread_budget import ThreadBudget, get_cpu_allowance
 
 """Parameters"""
+# All static values come from CFG; the session CONFIG only for ID and SDIR
+CFG = load_config()
 
 """Functions & Classes"""
 def train_svm(features: np.ndarray, labels: np.ndarray) -> SVC:
-    model = SVC(kernel="rbf", random_state=CONFIG.MNIST.RANDOM_STATE)
+    model = SVC(kernel="rbf", random_state=CFG.MNIST.RANDOM_STATE)
     model.fit(features, labels)
     return model
 
@@ -46,39 +56,145 @@ def evaluate(
     model: SVC,
     features: np.ndarray,
     labels: np.ndarray,
+    n_bootstrap: int = 1000,
 ) -> Dict[str, float]:
-    predictions = model.predict(features)
+    # One kernel pass for both outputs: one-vs-rest scores are votes plus a
+    # confidence term in (-1/3, 1/3), so rounding recovers the votes that
+    # predict() uses. Scores are kept for ROC/PR analysis in plot_roc_pr.py
+    scores = model.decision_function(features)
+    predictions = model.classes_[np.rint(scores).argmax(axis=1)]
+    scores = scores.astype(np.float32)
     report = classification_report(labels, predictions, output_dict=True)
+    ci = bootstrap_metrics(
+        labels,
+        predictions,
+        n_boot=n_bootstrap,
+        random_state=CFG.MNIST.RANDOM_STATE,
+    ).set_index("metric")
 
     scitex.io.save(
         report, "./classification_report.csv", symlink_from_cwd=True
     )
     scitex.io.save(predictions, "./predictions.npy", symlink_from_cwd=True)
+    scitex.io.save(scores, "./decision_scores.npy", symlink_from_cwd=True)
     scitex.io.save(labels, "./labels.npy", symlink_from_cwd=True)
+    scitex.io.save(ci, "./bootstrap_ci.csv", symlink_from_cwd=True)
 
     return {
         "accuracy": report["accuracy"],
+        "accuracy_ci": tuple(ci.loc["accuracy", ["ci_lower", "ci_upper"]]),
         "macro_f1": report["macro avg"]["f1-score"],
+        "macro_f1_ci": tuple(ci.loc["macro_f1", ["ci_lower", "ci_upper"]]),
     }
 
 
-def main(args: argparse.Namespace) -> Optional[int]:
-    train_data = scitex.io.load(CONFIG.PATH.MNIST.FLATTENED.TRAIN)
-    train_labels = scitex.io.load(CONFIG.PATH.MNIST.LABELS.TRAIN)
-    test_data = scitex.io.load(CONFIG.PATH.MNIST.FLATTENED.TEST)
-    test_labels = scitex.io.load(CONFIG.PATH.MNIST.LABELS.TEST)
+def load_features(features: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns (train, test) raw pixels or stored features by name."""
+    if features == "raw":
+        return (
+            load_array(
+                CFG.PATH.MNIST.FLATTENED.TRAIN,
+                CFG.PATH.MNIST.SHM_REGISTRY,
+            ),
+            load_array(
+                CFG.PATH.MNIST.FLATTENED.TEST,
+                CFG.PATH.MNIST.SHM_REGISTRY,
+            ),
+        )
+    store = FeatureStore(CFG.PATH.MNIST.FEATURES)
+    return store.load(features, "train"), store.load(features, "test")
 
-    model = train_svm(train_data, train_labels)
-    metrics = evaluate(model, test_data, test_labels)
 
+def to_numpy_engine(
+    model: SVC, features: np.ndarray, args: argparse.Namespace
+) -> BlockedRBFPredictor:
+    """Wraps the SVC in the blocked NumPy engine after checking it agrees."""
+    predictor = BlockedRBFPredictor.from_svc(
+        model, dtype=args.engine_dtype, n_jobs=args.engine_n_jobs
+    )
+    check = predictor.verify(model, features[: args.n_verify])
     scitex.str.printc(
-        f"Test Accuracy: {metrics['accuracy']:.4f}, Macro F1: {metrics['macro_f1']:.4f}",
+        f"NumPy engine ({args.engine_dtype}) vs libsvm on {args.n_verify} samples: "
+        f"max |decision diff| {check['max_abs_diff']:.2e}, "
+        f"agreement {check['agreement']:.4f}, speedup {check['speedup']:.1f}x",
+        c="yellow" if check["within_tolerance"] else "red",
+    )
+    return predictor
+
+
+def print_metrics(metrics: Dict[str, float]) -> None:
+    scitex.str.printc(
+        f"Test Accuracy: {metrics['accuracy']:.4f} "
+        f"(95% CI {metrics['accuracy_ci'][0]:.4f}-{metrics['accuracy_ci'][1]:.4f}), "
+        f"Macro F1: {metrics['macro_f1']:.4f} "
+        f"(95% CI {metrics['macro_f1_ci'][0]:.4f}-{metrics['macro_f1_ci'][1]:.4f})",
         c="green",
     )
 
+
+def get_model_path(features: str) -> str:
+    path = CFG.PATH.MNIST.MODEL_SVM
+    if features == "raw":
+        return path
+    return path.replace(".pkl", f"_{features}.pkl")
+
+
+def main(args: argparse.Namespace) -> Optional[int]:
+    train_data, test_data = load_features(args.features)
+    train_labels = load_array(
+        CFG.PATH.MNIST.LABELS.TRAIN, CFG.PATH.MNIST.SHM_REGISTRY
+    )
+    test_labels = load_array(
+        CFG.PATH.MNIST.LABELS.TEST, CFG.PATH.MNIST.SHM_REGISTRY
+    )
+
+    if args.model:
+        # Evaluate a saved model (e.g. from compress_svm.py) without training
+        model = scitex.io.load(args.model)
+        if args.engine == "numpy" and isinstance(model, SVC):
+            model = to_numpy_engine(model, test_data, args)
+        metrics = evaluate(
+            model, test_data, test_labels, n_bootstrap=args.n_bootstrap
+        )
+        print_metrics(metrics)
+        return 0
+
+    ckpt = Checkpointer(
+        __file__,
+        name=f"train_svm_{args.features}",
+        resume=not args.no_resume,
+        current_id=CONFIG.ID,
+        key=fingerprint(
+            {
+                "features": args.features,
+                "random_state": CFG.MNIST.RANDOM_STATE,
+            },
+            train_data,
+            train_labels,
+        ),
+    )
+    state = ckpt.load() or {}
+    model = state.get("model")
+    budget = ThreadBudget(get_cpu_allowance(CFG.RESOURCES.N_CPUS))
+    if model is None:
+        # libsvm is single-threaded
+        with budget.section("train_svm", outer=1, blas=1):
+            model = train_svm(train_data, train_labels)
+        ckpt.save({"model": model})
+
+    predictor = model
+    with budget.section("evaluate", outer=args.engine_n_jobs):
+        if args.engine == "numpy":
+            predictor = to_numpy_engine(model, test_data, args)
+        metrics = evaluate(
+            predictor, test_data, test_labels, n_bootstrap=args.n_bootstrap
+        )
+    print_metrics(metrics)
+
     scitex.io.save(
-        model, eval(CONFIG.PATH.MNIST.MODEL_SVM), symlink_from_cwd=True
+        model, get_model_path(args.features), symlink_from_cwd=True
     )
+    ckpt.clear()
     return 0
 
 
@@ -86,6 +202,57 @@ def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Train SVM classifier on MNIST"
     )
+    parser.add_argument(
+        "--features",
+        type=str,
+        choices=["raw", "pca", "hog", "pooled"],
+        default="raw",
+        help="Input representation; non-raw ones come from extract_features.py (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--model",
+        type=str,
+        default=None,
+        help="Evaluate this saved model (e.g. the compressed SVM) instead of training (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--engine",
+        type=str,
+        choices=["libsvm", "numpy"],
+        default="libsvm",
+        help="Prediction engine; numpy computes RBF kernels as blocked GEMMs (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--engine-dtype",
+        type=str,
+        choices=["float64", "float32", "float16"],
+        default="float32",
+        help="Support vector storage dtype of the numpy engine (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--engine-n-jobs",
+        type=int,
+        default=1,
+        help="Threads over sample blocks in the numpy engine (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--n-verify",
+        type=int,
+        default=1000,
+        help="Samples used to verify the numpy engine against libsvm (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--n-bootstrap",
+        type=int,
+        default=1000,
+        help="Bootstrap resamples for metric confidence intervals (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        default=False,
+        help="Ignore checkpoints left by an interrupted run (default: %(default)s)",
+    )
     args = parser.parse_args()
     scitex.str.printc(args, c="yellow")
     return args
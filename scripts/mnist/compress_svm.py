@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Timestamp: "2026-10-19 15:02:46 (ywatanabe)"
+# File: /home/ywatanabe/proj/scitex_template_research/scripts/mnist/compress_svm.py
+# ----------------------------------------
+from __future__ import annotations
+import os
+__FILE__ = (
+    "./scripts/mnist/compress_svm.py"
+)
+__DIR__ = os.path.dirname(__FILE__)
+# ----------------------------------------
+
+"""
+Functionality:
+    - Compresses the SVM trained by clf_svm.py into reduced-set models
+    - Reports size/accuracy/speed tradeoff across reduction ratios
+Input:
+    - Trained SVM model
+    - Flattened MNIST test data
+Output:
+    - Compressed SVM model (CFG.MNIST.SVM_REDUCTION.RATIO)
+    - Tradeoff table
+Prerequisites:
+    - scitex package
+    - scikit-learn
+"""
+
+"""Imports"""
+import argparse
+import time
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import scitex
+from config_compiler import load_config
+from dataset_host import load_array
+from svm_reduction import ReducedSetSVC
+
+"""Parameters"""
+# All static values come from CFG; the session CONFIG only for ID and SDIR
+CFG = load_config()
+
+"""Functions & Classes"""
+def summarize(model, features: np.ndarray, labels: np.ndarray, reference: np.ndarray) -> dict:
+    start = time.perf_counter()
+    predictions = model.predict(features)
+    elapsed = time.perf_counter() - start
+    return {
+        "accuracy": np.mean(predictions == labels),
+        "agreement_with_svm": np.mean(predictions == reference),
+        "samples_per_sec": len(features) / elapsed,
+    }
+
+
+def main(args: argparse.Namespace) -> Optional[int]:
+    test_data = load_array(
+        CFG.PATH.MNIST.FLATTENED.TEST, CFG.PATH.MNIST.SHM_REGISTRY
+    )
+    test_labels = load_array(
+        CFG.PATH.MNIST.LABELS.TEST, CFG.PATH.MNIST.SHM_REGISTRY
+    )
+    svm = scitex.io.load(CFG.PATH.MNIST.MODEL_SVM)
+    reference = svm.predict(test_data)
+
+    svm_nbytes = svm.support_vectors_.nbytes + svm.dual_coef_.nbytes
+    rows = [
+        {
+            "ratio": 1.0,
+            "n_basis": len(svm.support_vectors_),
+            "size_mb": svm_nbytes / 1e6,
+            **summarize(svm, test_data, test_labels, reference),
+        }
+    ]
+    ratios = sorted(set(args.ratios or []) | {CFG.MNIST.SVM_REDUCTION.RATIO})
+    for ratio in ratios:
+        model = ReducedSetSVC.from_svc(
+            svm,
+            ratio=ratio,
+            ridge=CFG.MNIST.SVM_REDUCTION.RIDGE,
+            random_state=CFG.MNIST.RANDOM_STATE,
+        )
+        rows.append(
+            {
+                "ratio": ratio,
+                "n_basis": model.n_basis,
+                "size_mb": model.nbytes / 1e6,
+                **summarize(model, test_data, test_labels, reference),
+            }
+        )
+        if ratio == CFG.MNIST.SVM_REDUCTION.RATIO:
+            scitex.io.save(
+                model,
+                CFG.PATH.MNIST.MODEL_SVM_REDUCED,
+                symlink_from_cwd=True,
+            )
+
+    results = pd.DataFrame(rows)
+    results["speedup"] = results.samples_per_sec / results.samples_per_sec[0]
+    scitex.io.save(results, "./compression_tradeoff.csv", symlink_from_cwd=True)
+    scitex.str.printc(results.to_string(index=False), c="green")
+    return 0
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Compress the trained SVM into a reduced set of basis vectors"
+    )
+    parser.add_argument(
+        "--ratios",
+        type=float,
+        nargs="+",
+        default=None,
+        help="Additional fractions of support vectors to keep per class for the "
+        "tradeoff table (default: %(default)s)",
+    )
+    args = parser.parse_args()
+    scitex.str.printc(args, c="yellow")
+    return args
+
+
+def run_session() -> None:
+    """Initialize scitex framework, run main function, and cleanup.
+
+    scitex framework manages:
+      - Parameters defined in yaml files under `./config dir`
+      - Setting saving directory (/path/to/file.py -> /path/to/file.py_out/)
+      - Symlink for `./data` directory
+      - Logging timestamp, stdout, stderr, and parameters
+      - Matplotlib configurations (also, `scitex.plt` will track plotting data)
+      - Random seeds
+
+    THUS, DO NOT MODIFY THIS RUN_MAIN FUNCTION
+    """
+    import sys  # DO NOT CHANGE THIS
+
+    import matplotlib.pyplot as plt  # DO NOT CHANGE THIS
+
+    global CONFIG, CC, sys, plt
+    args = parse_args()
+    CONFIG, sys.stdout, sys.stderr, plt, CC, rng = scitex.session.start(
+        sys,
+        plt,
+        args=args,
+        file=__file__,
+        agg=True,
+    )
+
+    exit_status = main(args)
+
+    scitex.session.close(
+        CONFIG,
+        exit_status=exit_status,
+    )
+
+
+if __name__ == "__main__":
+    run_session()
+
+# EOF
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Timestamp: "2026-10-19 17:58:44 (ywatanabe)"
+# File: /home/ywatanabe/proj/scitex_template_research/scripts/mnist/config_compiler.py
+# ----------------------------------------
+from __future__ import annotations
+import os
+__FILE__ = (
+    "./scripts/mnist/config_compiler.py"
+)
+__DIR__ = os.path.dirname(__FILE__)
+# ----------------------------------------
+
+"""
+Functionality:
+    - Compiles ./config/*.yaml into one frozen, fully resolved config
+    - Resolves f"...{CONFIG.A.B}..." references and Python literals such as
+      "(0.1307,)" without eval
+    - Caches the compiled config keyed on the YAML files' mtimes and hashes
+    - Note: scitex.session.start still loads ./config for the session
+      CONFIG; scripts read static values from CFG and CONFIG only for the
+      session keys (ID, SDIR)
+Input:
+    - ./config/*.yaml
+Output:
+    - ./config/.compiled.pkl (cache)
+Prerequisites:
+    - pyyaml
+
+Usage:
+    CFG = load_config()
+    CFG.PATH.MNIST.MODEL_SVM  # "./data/mnist/models//mnist_svm.pkl"
+    CFG.MNIST.NORMALIZE.MEAN  # (0.1307,)
+"""
+
+"""Imports"""
+import ast
+import glob
+import hashlib
+import pickle
+import re
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import yaml
+
+"""Parameters"""
+CACHE_VERSION = 1
+_REFERENCE = re.compile(r"\{CONFIG\.([A-Za-z0-9_.]+)\}")
+_LITERAL_START = ("(", "[", "{")
+
+"""Functions & Classes"""
+class FrozenConfig(Mapping):
+    """Read-only nested mapping with attribute access (CFG.PATH.MNIST.RAW)."""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: Dict[str, Any]):
+        object.__setattr__(self, "_data", dict(data))
+
+    def __getattr__(self, key: str) -> Any:
+        try:
+            return self._data[key]
+        except KeyError:
+            raise AttributeError(f"No config key '{key}'") from None
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        raise AttributeError("FrozenConfig is read-only")
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"FrozenConfig({self._data!r})"
+
+    def __reduce__(self):
+        return (FrozenConfig, (self._data,))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            key: value.to_dict() if isinstance(value, FrozenConfig) else value
+            for key, value in self._data.items()
+        }
+
+
+class ConfigError(ValueError):
+    """Raised for unknown, circular or unsupported references."""
+
+
+def _lookup(tree: Dict, dotted: str) -> Any:
+    node = tree
+    for key in dotted.split("."):
+        if not isinstance(node, dict) or key not in node:
+            raise ConfigError(f"Unknown reference CONFIG.{dotted}")
+        node = node[key]
+    return node
+
+
+def _resolve_string(value: str, tree: Dict, stack: Tuple[str, ...]) -> Any:
+    text = value.strip()
+    if len(text) >= 3 and text[0] == "f" and text[1] in "\"'" and text[-1] == text[1]:
+        body = text[2:-1]
+
+        def substitute(match: re.Match) -> str:
+            dotted = match.group(1)
+            if dotted in stack:
+                cycle = " -> ".join(stack + (dotted,))
+                raise ConfigError(f"Circular reference: {cycle}")
+            target = _resolve(_lookup(tree, dotted), tree, stack + (dotted,))
+            return str(target)
+
+        unsupported = _REFERENCE.sub("", body).replace("{{", "").replace("}}", "")
+        if "{" in unsupported or "}" in unsupported:
+            raise ConfigError(
+                f"Only {{CONFIG.KEY}} references are allowed in f-strings: {value}"
+            )
+        resolved = _REFERENCE.sub(substitute, body)
+        return resolved.replace("{{", "{").replace("}}", "}")
+    if text.startswith(_LITERAL_START):
+        try:
+            return _freeze(ast.literal_eval(text))
+        except (ValueError, SyntaxError):
+            return value
+    return value
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return FrozenConfig({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+def _resolve(value: Any, tree: Dict, stack: Tuple[str, ...] = ()) -> Any:
+    if isinstance(value, dict):
+        return FrozenConfig(
+            {k: _resolve(v, tree, stack) for k, v in value.items()}
+        )
+    if isinstance(value, list):
+        return tuple(_resolve(v, tree, stack) for v in value)
+    if isinstance(value, str):
+        return _resolve_string(value, tree, stack)
+    return value
+
+
+def compile_config(paths: List[str]) -> FrozenConfig:
+    """Parses and merges the YAML files, then resolves every value."""
+    tree: Dict[str, Any] = {}
+    for path in paths:
+        with open(path) as f:
+            tree.update(yaml.safe_load(f) or {})
+    return _resolve(tree, tree)
+
+
+def _hash_file(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _stamps(paths: List[str]) -> Dict[str, Tuple[int, int]]:
+    stamps = {}
+    for path in paths:
+        stat = os.stat(path)
+        stamps[path] = (stat.st_mtime_ns, stat.st_size)
+    return stamps
+
+
+def _read_cache(cache_path: str) -> Optional[Dict]:
+    try:
+        with open(cache_path, "rb") as f:
+            cache = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+        return None
+    return cache
+
+
+def _write_cache(cache_path: str, cache: Dict) -> None:
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # A read-only checkout still gets a compiled config, just uncached
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def load_config(
+    config_dir: str = "./config", cache_path: Optional[str] = None
+) -> FrozenConfig:
+    """Returns the compiled config, reusing the cache when the YAML is unchanged.
+
+    Unchanged (mtime, size) skips hashing and YAML parsing entirely; touched
+    but identical files are confirmed by SHA-1 and only restamped.
+    """
+    cache_path = cache_path or os.path.join(config_dir, ".compiled.pkl")
+    paths = sorted(glob.glob(os.path.join(config_dir, "*.yaml")))
+    stamps = _stamps(paths)
+
+    cache = _read_cache(cache_path)
+    if cache is not None and cache["stamps"] == stamps:
+        return cache["config"]
+
+    hashes = {path: _hash_file(path) for path in paths}
+    if cache is not None and cache["hashes"] == hashes:
+        cache["stamps"] = stamps
+        _write_cache(cache_path, cache)
+        return cache["config"]
+
+    config = compile_config(paths)
+    _write_cache(
+        cache_path,
+        {
+            "version": CACHE_VERSION,
+            "stamps": stamps,
+            "hashes": hashes,
+            "config": config,
+        },
+    )
+    return config
+
+# EOF
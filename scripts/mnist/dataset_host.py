@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Timestamp: "2026-10-19 11:32:47 (ywatanabe)"
+# File: /home/ywatanabe/proj/scitex_template_research/scripts/mnist/dataset_host.py
+# ----------------------------------------
+from __future__ import annotations
+import os
+__FILE__ = (
+    "./scripts/mnist/dataset_host.py"
+)
+__DIR__ = os.path.dirname(__FILE__)
+# ----------------------------------------
+
+"""
+Functionality:
+    - Hosts the configured MNIST arrays once in shared memory
+    - Lets concurrently running stages attach to them zero-copy by name
+    - Tracks attached client processes and cleans up segments on exit
+Input:
+    - CFG.PATH.MNIST.FLATTENED.*
+    - CFG.PATH.MNIST.LABELS.*
+Output:
+    - Shared memory segments (/dev/shm/mnist_*)
+    - Registry (CFG.PATH.MNIST.SHM_REGISTRY)
+Prerequisites:
+    - scitex package
+    - numpy
+
+Usage:
+    ./scripts/mnist/dataset_host.py &
+    ./scripts/mnist/plot_umap_space.py & ./scripts/mnist/clf_svm.py
+    # Consumers call load_array(path, CFG.PATH.MNIST.SHM_REGISTRY), which
+    # falls back to scitex.io.load when no host is running.
+"""
+
+"""Imports"""
+import argparse
+import atexit
+import fcntl
+import json
+import signal
+import time
+from contextlib import contextmanager
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import scitex
+
+from chunked_array import SUFFIX as CHUNKED_SUFFIX
+from chunked_array import ChunkedArray, resolve_array_path
+from config_compiler import load_config
+
+"""Parameters"""
+# All static values come from CFG; the session CONFIG only for ID and SDIR
+CFG = load_config()
+# Segments attached by this process; kept alive so the views stay valid
+_ATTACHED: Dict[str, SharedMemory] = {}
+
+"""Functions & Classes"""
+@contextmanager
+def locked_registry(registry_path: str, create: bool = False) -> Iterator[Optional[Dict]]:
+    """Yields the registry dict under an exclusive lock; changes are written back."""
+    if not create and not os.path.exists(registry_path):
+        yield None
+        return
+
+    os.makedirs(os.path.dirname(os.path.abspath(registry_path)), exist_ok=True)
+    with open(registry_path + ".lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            registry = {"host_pid": None, "arrays": {}}
+            if os.path.exists(registry_path):
+                with open(registry_path) as f:
+                    registry = json.load(f)
+            yield registry
+            tmp_path = registry_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(registry, f, indent=2)
+            os.replace(tmp_path, registry_path)
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _array_key(path: str) -> str:
+    # Symlinked ./data paths and the *_out targets resolve to the same key
+    return os.path.realpath(path)
+
+
+def _is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _attach_untracked(name: str) -> SharedMemory:
+    """Attaches without registering with this process's resource tracker.
+
+    Otherwise the tracker of a client would unlink the host's segment when
+    the client exits.
+    """
+    shm = SharedMemory(name=name)
+    try:
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
+    return shm
+
+
+def _detach(key: str, registry_path: str) -> None:
+    shm = _ATTACHED.pop(key, None)
+    if shm is None:
+        return
+    shm.close()
+    with locked_registry(registry_path) as registry:
+        if registry and key in registry["arrays"]:
+            clients = registry["arrays"][key]["clients"]
+            if os.getpid() in clients:
+                clients.remove(os.getpid())
+
+
+def attach(path: str, registry_path: str) -> Optional[np.ndarray]:
+    """Returns a read-only zero-copy view of a hosted array, or None."""
+    key = _array_key(path)
+    with locked_registry(registry_path) as registry:
+        if registry is None or key not in registry["arrays"]:
+            return None
+        if not _is_alive(registry["host_pid"]):
+            return None
+        entry = registry["arrays"][key]
+        if key not in _ATTACHED:
+            _ATTACHED[key] = _attach_untracked(entry["shm_name"])
+            entry["clients"].append(os.getpid())
+            atexit.register(_detach, key, registry_path)
+
+    array = np.ndarray(
+        tuple(entry["shape"]),
+        dtype=np.dtype(entry["dtype"]),
+        buffer=_ATTACHED[key].buf,
+    )
+    array.flags.writeable = False
+    return array
+
+
+def read_array(path: str) -> np.ndarray:
+    """Loads `path`, or decodes its .npc sibling when that is newer."""
+    resolved = resolve_array_path(path)
+    if resolved.endswith(CHUNKED_SUFFIX):
+        return ChunkedArray(resolved).read()
+    return scitex.io.load(path)
+
+
+def load_array(path: str, registry_path: Optional[str] = None) -> np.ndarray:
+    """Attaches to the hosted copy of `path` if available, else loads it."""
+    if registry_path:
+        array = attach(path, registry_path)
+        if array is not None:
+            return array
+    return read_array(path)
+
+
+class SharedArrayHost:
+    """Owns the shared memory segments and the registry describing them."""
+
+    def __init__(self, registry_path: str):
+        self.registry_path = registry_path
+        self._segments: Dict[str, SharedMemory] = {}
+
+    def add(self, path: str) -> None:
+        key = _array_key(path)
+        if key in self._segments:
+            return
+        data = np.ascontiguousarray(read_array(path))
+        shm = SharedMemory(create=True, size=max(data.nbytes, 1))
+        np.ndarray(data.shape, dtype=data.dtype, buffer=shm.buf)[...] = data
+        self._segments[key] = shm
+
+        with locked_registry(self.registry_path, create=True) as registry:
+            registry["host_pid"] = os.getpid()
+            registry["arrays"][key] = {
+                "shm_name": shm.name,
+                "shape": list(data.shape),
+                "dtype": data.dtype.str,
+                "clients": [],
+            }
+        scitex.str.printc(
+            f"Hosting {path} as {shm.name} ({data.nbytes / 1e6:.1f} MB)",
+            c="yellow",
+        )
+
+    def prune_clients(self) -> List[int]:
+        """Drops dead client pids; returns the live ones."""
+        with locked_registry(self.registry_path) as registry:
+            if registry is None:
+                return []
+            live = set()
+            for entry in registry["arrays"].values():
+                entry["clients"] = [
+                    pid for pid in entry["clients"] if _is_alive(pid)
+                ]
+                live.update(entry["clients"])
+        return sorted(live)
+
+    def serve(self, poll_sec: float = 1.0, idle_timeout: Optional[float] = None) -> None:
+        """Blocks until SIGINT/SIGTERM, or until no client was attached for
+        `idle_timeout` seconds (counted from startup if none ever attached)."""
+        stop = []
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: stop.append(True))
+
+        idle_since = time.monotonic()
+        while not stop:
+            if self.prune_clients():
+                idle_since = time.monotonic()
+            elif (
+                idle_timeout is not None
+                and time.monotonic() - idle_since > idle_timeout
+            ):
+                break
+            time.sleep(poll_sec)
+
+    def close(self) -> None:
+        for shm in self._segments.values():
+            shm.close()
+            shm.unlink()
+        self._segments.clear()
+        # The .lock file stays: other processes may hold or be waiting on
+        # its flock, and removing it would let a new one lock another inode
+        with open(self.registry_path + ".lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            if os.path.exists(self.registry_path):
+                os.remove(self.registry_path)
+
+
+def main(args: argparse.Namespace) -> Optional[int]:
+    host = SharedArrayHost(CFG.PATH.MNIST.SHM_REGISTRY)
+    try:
+        for group in (CFG.PATH.MNIST.FLATTENED, CFG.PATH.MNIST.LABELS):
+            for path in group.values():
+                host.add(path)
+        scitex.str.printc(
+            f"Registry: {CFG.PATH.MNIST.SHM_REGISTRY}", c="green"
+        )
+        host.serve(poll_sec=args.poll_sec, idle_timeout=args.idle_timeout)
+    finally:
+        host.close()
+    return 0
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Host MNIST arrays in shared memory for concurrent stages"
+    )
+    parser.add_argument(
+        "--poll-sec",
+        type=float,
+        default=1.0,
+        help="Interval for pruning dead clients (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=None,
+        help="Exit after this many seconds without attached clients, counted from startup if none ever attached; serve until signalled if unset (default: %(default)s)",
+    )
+    args = parser.parse_args()
+    scitex.str.printc(args, c="yellow")
+    return args
+
+
+def run_session() -> None:
+    """Initialize scitex framework, run main function, and cleanup.
+
+    scitex framework manages:
+      - Parameters defined in yaml files under `./config dir`
+      - Setting saving directory (/path/to/file.py -> /path/to/file.py_out/)
+      - Symlink for `./data` directory
+      - Logging timestamp, stdout, stderr, and parameters
+      - Matplotlib configurations (also, `scitex.plt` will track plotting data)
+      - Random seeds
+
+    THUS, DO NOT MODIFY THIS RUN_MAIN FUNCTION
+    """
+    import sys  # DO NOT CHANGE THIS
+
+    import matplotlib.pyplot as plt  # DO NOT CHANGE THIS
+
+    global CONFIG, CC, sys, plt
+    args = parse_args()
+    CONFIG, sys.stdout, sys.stderr, plt, CC, rng = scitex.session.start(
+        sys,
+        plt,
+        args=args,
+        file=__file__,
+        agg=True,
+    )
+
+    exit_status = main(args)
+
+    scitex.session.close(
+        CONFIG,
+        exit_status=exit_status,
+    )
+
+
+if __name__ == "__main__":
+    run_session()
+
+# EOF
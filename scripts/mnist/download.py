@@ -20,48 +20,54 @@ Prerequisites:
 
 """Imports"""
 import argparse
+import os
 from typing import Dict, Optional
 
 import scitex
 import numpy as np
 import torch
 from torch.utils.data import DataLoader
-from torchvision import datasets, transforms
+from torchvision import datasets
+
+from chunked_array import chunked_path, save_chunked
+from config_compiler import load_config
+from io_paths import get_out_dir, link_from_cwd
+from tensor_dataset import NormalizedMNIST, make_loader
 
 """Parameters"""
+# All static values come from CFG; the session CONFIG only for ID and SDIR
+CFG = load_config()
 
 """Functions & Classes"""
 
 
 def download_mnist() -> Dict[str, torch.utils.data.Dataset]:
-    transform = transforms.Compose(
-        [
-            transforms.ToTensor(),
-            transforms.Normalize(
-                eval(CONFIG.MNIST.NORMALIZE.MEAN),
-                eval(CONFIG.MNIST.NORMALIZE.STD),
-            ),
-        ]
-    )
     train_dataset = datasets.MNIST(
-        CONFIG.PATH.MNIST.RAW, train=True, download=True, transform=transform
-    )
-    test_dataset = datasets.MNIST(
-        CONFIG.PATH.MNIST.RAW, train=False, transform=transform
+        CFG.PATH.MNIST.RAW, train=True, download=True
     )
+    test_dataset = datasets.MNIST(CFG.PATH.MNIST.RAW, train=False)
     return {"train": train_dataset, "test": test_dataset}
 
 
 def create_loaders(
     datasets: Dict[str, torch.utils.data.Dataset]
 ) -> Dict[str, DataLoader]:
-    train_loader = DataLoader(
-        datasets["train"],
-        batch_size=CONFIG.MNIST.BATCH_SIZE.TRAIN,
+    # Normalizing the uint8 tensors once replaces per-item ToTensor/Normalize
+    normalized = {
+        split: NormalizedMNIST.from_mnist(
+            dataset,
+            mean=CFG.MNIST.NORMALIZE.MEAN,
+            std=CFG.MNIST.NORMALIZE.STD,
+        )
+        for split, dataset in datasets.items()
+    }
+    train_loader = make_loader(
+        normalized["train"],
+        batch_size=CFG.MNIST.BATCH_SIZE.TRAIN,
         shuffle=True,
     )
-    test_loader = DataLoader(
-        datasets["test"], batch_size=CONFIG.MNIST.BATCH_SIZE.TEST
+    test_loader = make_loader(
+        normalized["test"], batch_size=CFG.MNIST.BATCH_SIZE.TEST
     )
 
     return {"train": train_loader, "test": test_loader}
@@ -87,38 +93,58 @@ def main(args: argparse.Namespace) -> Optional[int]:
     flat_data = prepare_flattened_data(datasets)
 
     scitex.io.save(
-        loaders["train"], CONFIG.PATH.MNIST.LOADER.TRAIN, symlink_from_cwd=True
-    )
-    scitex.io.save(
-        loaders["test"], CONFIG.PATH.MNIST.LOADER.TEST, symlink_from_cwd=True
-    )
-    scitex.io.save(
-        flat_data["data"]["train"],
-        CONFIG.PATH.MNIST.FLATTENED.TRAIN,
-        symlink_from_cwd=True,
-    )
-    scitex.io.save(
-        flat_data["data"]["test"],
-        CONFIG.PATH.MNIST.FLATTENED.TEST,
-        symlink_from_cwd=True,
+        loaders["train"], CFG.PATH.MNIST.LOADER.TRAIN, symlink_from_cwd=True
     )
     scitex.io.save(
-        flat_data["labels"]["train"],
-        CONFIG.PATH.MNIST.LABELS.TRAIN,
-        symlink_from_cwd=True,
-    )
-    scitex.io.save(
-        flat_data["labels"]["test"],
-        CONFIG.PATH.MNIST.LABELS.TEST,
-        symlink_from_cwd=True,
+        loaders["test"], CFG.PATH.MNIST.LOADER.TEST, symlink_from_cwd=True
     )
+    arrays = [
+        (flat_data["data"]["train"], CFG.PATH.MNIST.FLATTENED.TRAIN),
+        (flat_data["data"]["test"], CFG.PATH.MNIST.FLATTENED.TEST),
+        (flat_data["labels"]["train"], CFG.PATH.MNIST.LABELS.TRAIN),
+        (flat_data["labels"]["test"], CFG.PATH.MNIST.LABELS.TEST),
+    ]
+    for array, path in arrays:
+        if args.storage == "chunked":
+            save_chunked_array(array, path)
+        else:
+            scitex.io.save(array, path, symlink_from_cwd=True)
     return 0
 
 
+def save_chunked_array(array: np.ndarray, path: str) -> None:
+    """Saves `array` next to its configured .npy path as a .npc file.
+
+    Like scitex.io.save, the file goes under this script's output directory
+    and is linked from the cwd. An existing .npy is kept; readers pick
+    whichever of the two was written last (resolve_array_path).
+    """
+    cfg = CFG.MNIST.STORAGE
+    npc_path = chunked_path(path)
+    out_path = os.path.join(get_out_dir(__file__), npc_path)
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    save_chunked(
+        out_path,
+        array,
+        chunk_rows=cfg.CHUNK_ROWS,
+        codec=cfg.CODEC,
+        level=cfg.LEVEL,
+    )
+    link_from_cwd(npc_path, out_path)
+    ratio = array.nbytes / max(os.path.getsize(out_path), 1)
+    scitex.str.printc(f"Saved to: {out_path} ({ratio:.1f}x smaller)", c="yellow")
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Download and preprocess MNIST dataset"
     )
+    parser.add_argument(
+        "--storage",
+        choices=["npy", "chunked"],
+        default="npy",
+        help="Array format; chunked writes compressed .npc files read lazily by row (default: %(default)s)",
+    )
     args = parser.parse_args()
     scitex.str.printc(args, c="yellow")
     return args
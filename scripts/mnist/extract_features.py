@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Timestamp: "2026-10-19 12:26:40 (ywatanabe)"
+# File: /home/ywatanabe/proj/scitex_template_research/scripts/mnist/extract_features.py
+# ----------------------------------------
+from __future__ import annotations
+import os
+__FILE__ = (
+    "./scripts/mnist/extract_features.py"
+)
+__DIR__ = os.path.dirname(__FILE__)
+# ----------------------------------------
+
+"""
+Functionality:
+    - Computes reusable feature representations of MNIST in chunks
+      - pca: incremental PCA to CFG.MNIST.FEATURES.PCA.N_COMPONENTS dims
+      - hog: histograms of oriented gradients
+      - pooled: average-pooled pixels
+    - Stores them in the feature store, skipping already computed inputs
+Input:
+    - Flattened MNIST data
+Output:
+    - Memory-mappable feature arrays under CFG.PATH.MNIST.FEATURES
+    - Fitted PCA model
+Prerequisites:
+    - scitex package
+    - scikit-learn
+"""
+
+"""Imports"""
+import argparse
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import scitex
+from chunked_array import open_array, resolve_array_path
+from config_compiler import load_config
+from feature_store import FeatureStore
+from sklearn.decomposition import IncrementalPCA
+
+"""Parameters"""
+# All static values come from CFG; the session CONFIG only for ID and SDIR
+CFG = load_config()
+# Bump when an extractor's output changes to invalidate stored features
+VERSIONS = {"pca": 1, "hog": 1, "pooled": 1}
+
+"""Functions & Classes"""
+def pool_pixels(chunk: np.ndarray, pool_size: int) -> np.ndarray:
+    n_px = 28 // pool_size * pool_size
+    images = chunk.reshape(-1, 28, 28)[:, :n_px, :n_px]
+    n_cells = n_px // pool_size
+    return (
+        images.reshape(-1, n_cells, pool_size, n_cells, pool_size)
+        .mean(axis=(2, 4))
+        .reshape(len(chunk), -1)
+    )
+
+
+def hog(chunk: np.ndarray, cell_size: int, n_bins: int) -> np.ndarray:
+    """Unsigned-gradient HOG with 2x2-cell L2-normalized blocks."""
+    images = chunk.reshape(-1, 28, 28).astype(np.float32)
+    gy, gx = np.gradient(images, axis=(1, 2))
+    magnitude = np.hypot(gx, gy)
+    orientation = np.rad2deg(np.arctan2(gy, gx)) % 180.0
+    bins = np.minimum((orientation / (180.0 / n_bins)).astype(np.int64), n_bins - 1)
+
+    # Magnitude-weighted one-hot, summed over the pixels of each cell
+    n_cells = 28 // cell_size
+    n_px = n_cells * cell_size
+    one_hot = (bins[..., None] == np.arange(n_bins)) * magnitude[..., None]
+    cells = (
+        one_hot[:, :n_px, :n_px]
+        .reshape(-1, n_cells, cell_size, n_cells, cell_size, n_bins)
+        .sum(axis=(2, 4))
+    )
+
+    blocks = np.concatenate(
+        [
+            cells[:, :-1, :-1],
+            cells[:, 1:, :-1],
+            cells[:, :-1, 1:],
+            cells[:, 1:, 1:],
+        ],
+        axis=-1,
+    )
+    blocks /= np.linalg.norm(blocks, axis=-1, keepdims=True) + 1e-6
+    return blocks.reshape(len(chunk), -1)
+
+
+def fit_pca(
+    data: np.ndarray, n_components: int, chunk_size: int
+) -> IncrementalPCA:
+    pca = IncrementalPCA(n_components=n_components)
+    for start in range(0, len(data), chunk_size):
+        pca.partial_fit(np.asarray(data[start : start + chunk_size]))
+    return pca
+
+
+def extract(
+    store: FeatureStore,
+    name: str,
+    split: str,
+    input_path: str,
+    params: Dict,
+    transform: Callable[[np.ndarray], np.ndarray],
+    chunk_size: int,
+    fit_inputs: Optional[Dict[str, str]] = None,
+) -> None:
+    """Runs `transform` chunk by chunk into the store unless already stored."""
+    key = store.lookup(name, input_path, VERSIONS[name], params, fit_inputs)
+    if key is not None:
+        store.set_current(name, split, key)
+        scitex.str.printc(f"{name}/{split}: cached ({key})", c="yellow")
+        return
+
+    data = open_array(input_path)
+    n_features = transform(np.asarray(data[:1])).shape[1]
+    out = store.create(
+        name,
+        split,
+        input_path,
+        VERSIONS[name],
+        params,
+        shape=(len(data), n_features),
+        fit_inputs=fit_inputs,
+    )
+    for start in range(0, len(data), chunk_size):
+        out[start : start + chunk_size] = transform(
+            np.asarray(data[start : start + chunk_size])
+        )
+    path = store.commit(out)
+    scitex.str.printc(f"{name}/{split}: {path} {out.shape}", c="green")
+
+
+def main(args: argparse.Namespace) -> Optional[int]:
+    store = FeatureStore(CFG.PATH.MNIST.FEATURES)
+    cfg = CFG.MNIST.FEATURES
+    # Hashes are taken of whichever file holds the data (.npy or .npc)
+    inputs = {
+        "train": resolve_array_path(CFG.PATH.MNIST.FLATTENED.TRAIN),
+        "test": resolve_array_path(CFG.PATH.MNIST.FLATTENED.TEST),
+    }
+
+    if "pooled" in args.features:
+        params = {"pool_size": cfg.POOLED.POOL_SIZE}
+        for split, path in inputs.items():
+            extract(
+                store,
+                "pooled",
+                split,
+                path,
+                params,
+                lambda x: pool_pixels(x, cfg.POOLED.POOL_SIZE),
+                cfg.CHUNK_SIZE,
+            )
+
+    if "hog" in args.features:
+        params = {"cell_size": cfg.HOG.CELL_SIZE, "n_bins": cfg.HOG.N_BINS}
+        for split, path in inputs.items():
+            extract(
+                store,
+                "hog",
+                split,
+                path,
+                params,
+                lambda x: hog(x, cfg.HOG.CELL_SIZE, cfg.HOG.N_BINS),
+                cfg.CHUNK_SIZE,
+            )
+
+    if "pca" in args.features:
+        # Test features depend on the train data the projection was fit on
+        params = {"n_components": cfg.PCA.N_COMPONENTS}
+        fit_inputs = {"fit_on": inputs["train"]}
+        missing = [
+            split
+            for split, path in inputs.items()
+            if store.lookup("pca", path, VERSIONS["pca"], params, fit_inputs)
+            is None
+        ]
+        pca = None
+        if missing:
+            pca = fit_pca(
+                open_array(inputs["train"]),
+                cfg.PCA.N_COMPONENTS,
+                cfg.CHUNK_SIZE,
+            )
+            scitex.io.save(pca, "./pca.pkl", symlink_from_cwd=True)
+        for split, path in inputs.items():
+            extract(
+                store,
+                "pca",
+                split,
+                path,
+                params,
+                lambda x: pca.transform(x),
+                cfg.CHUNK_SIZE,
+                fit_inputs=fit_inputs,
+            )
+    return 0
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Extract cached feature representations of MNIST"
+    )
+    parser.add_argument(
+        "--features",
+        nargs="+",
+        choices=sorted(VERSIONS),
+        default=sorted(VERSIONS),
+        help="Representations to compute (default: %(default)s)",
+    )
+    args = parser.parse_args()
+    scitex.str.printc(args, c="yellow")
+    return args
+
+
+def run_session() -> None:
+    """Initialize scitex framework, run main function, and cleanup.
+
+    scitex framework manages:
+      - Parameters defined in yaml files under `./config dir`
+      - Setting saving directory (/path/to/file.py -> /path/to/file.py_out/)
+      - Symlink for `./data` directory
+      - Logging timestamp, stdout, stderr, and parameters
+      - Matplotlib configurations (also, `scitex.plt` will track plotting data)
+      - Random seeds
+
+    THUS, DO NOT MODIFY THIS RUN_MAIN FUNCTION
+    """
+    import sys  # DO NOT CHANGE THIS
+
+    import matplotlib.pyplot as plt  # DO NOT CHANGE THIS
+
+    global CONFIG, CC, sys, plt
+    args = parse_args()
+    CONFIG, sys.stdout, sys.stderr, plt, CC, rng = scitex.session.start(
+        sys,
+        plt,
+        args=args,
+        file=__file__,
+        agg=True,
+    )
+
+    exit_status = main(args)
+
+    scitex.session.close(
+        CONFIG,
+        exit_status=exit_status,
+    )
+
+
+if __name__ == "__main__":
+    run_session()
+
+# EOF
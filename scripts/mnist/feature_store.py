@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Timestamp: "2026-10-19 12:03:15 (ywatanabe)"
+# File: /home/ywatanabe/proj/scitex_template_research/scripts/mnist/feature_store.py
+# ----------------------------------------
+from __future__ import annotations
+import os
+__FILE__ = (
+    "./scripts/mnist/feature_store.py"
+)
+__DIR__ = os.path.dirname(__FILE__)
+# ----------------------------------------
+
+"""
+Functionality:
+    - Stores feature arrays as versioned, memory-mappable .npy files
+    - Keys each array by the input file hash, extractor version and parameters
+    - Resolves features by name and split for downstream consumers, and
+      refuses ones whose input data, or the data their extractor was fit
+      on (e.g. PCA fit on train), changed since extraction
+Input:
+    - Feature arrays computed by ./scripts/mnist/extract_features.py
+Output:
+    - <root>/<name>/<key>.npy, <root>/<name>/<key>.json
+    - <root>/manifest.json
+Prerequisites:
+    - numpy
+
+Usage:
+    store = FeatureStore(CFG.PATH.MNIST.FEATURES)
+    train_pca = store.load("pca", "train")  # memory-mapped
+"""
+
+"""Imports"""
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+"""Functions & Classes"""
+def hash_file(path: str, chunk_size: int = 1 << 24) -> str:
+    """Returns the SHA-1 of a file's content, read in chunks."""
+    sha = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def make_key(input_hash: str, version: int, params: Dict[str, Any]) -> str:
+    payload = json.dumps(
+        {"input": input_hash, "version": version, "params": params},
+        sort_keys=True,
+    )
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+
+class FeatureStore:
+    """Directory of feature arrays plus a manifest of the current keys."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.manifest_path = os.path.join(root, "manifest.json")
+        # Input hashes are cached on (size, mtime) to avoid rehashing
+        self._hash_cache_path = os.path.join(root, "input_hashes.json")
+        self._pending = None
+
+    def _read_json(self, path: str) -> Dict:
+        if not os.path.exists(path):
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def _write_json(self, obj: Dict, path: str) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(obj, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def input_hash(self, path: str) -> str:
+        stat = os.stat(path)
+        real_path = os.path.realpath(path)
+        cache = self._read_json(self._hash_cache_path)
+        entry = cache.get(real_path)
+        if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+            return entry["sha1"]
+        sha1 = hash_file(path)
+        cache[real_path] = {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "sha1": sha1,
+        }
+        self._write_json(cache, self._hash_cache_path)
+        return sha1
+
+    def array_path(self, name: str, key: str) -> str:
+        return os.path.join(self.root, name, f"{key}.npy")
+
+    def _key_params(
+        self, params: Dict[str, Any], fit_inputs: Optional[Dict[str, str]]
+    ) -> Dict[str, Any]:
+        """`params` plus the hash of each file the extractor was fit on."""
+        return {
+            **params,
+            **{
+                param: self.input_hash(path)
+                for param, path in (fit_inputs or {}).items()
+            },
+        }
+
+    def lookup(
+        self,
+        name: str,
+        input_path: str,
+        version: int,
+        params: Dict[str, Any],
+        fit_inputs: Optional[Dict[str, str]] = None,
+    ) -> Optional[str]:
+        """Returns the key if features for these inputs are already stored.
+
+        `fit_inputs` maps a parameter name to a file the extractor was fit
+        on; its content hash becomes part of the key.
+        """
+        key = make_key(
+            self.input_hash(input_path),
+            version,
+            self._key_params(params, fit_inputs),
+        )
+        if os.path.exists(self.array_path(name, key)):
+            return key
+        return None
+
+    def create(
+        self,
+        name: str,
+        split: str,
+        input_path: str,
+        version: int,
+        params: Dict[str, Any],
+        shape: tuple,
+        dtype: str = "float32",
+        fit_inputs: Optional[Dict[str, str]] = None,
+    ) -> np.memmap:
+        """Returns a writable .npy memmap to be filled chunk by chunk.
+
+        Call `commit` once filled to make it visible through `load`.
+        """
+        key = make_key(
+            self.input_hash(input_path),
+            version,
+            self._key_params(params, fit_inputs),
+        )
+        path = self.array_path(name, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._pending = {
+            "name": name,
+            "split": split,
+            "key": key,
+            "meta": {
+                "input_path": os.path.realpath(input_path),
+                "version": version,
+                "params": params,
+                "fit_inputs": {
+                    param: os.path.realpath(path)
+                    for param, path in (fit_inputs or {}).items()
+                },
+                "shape": list(shape),
+                "dtype": dtype,
+            },
+        }
+        return np.lib.format.open_memmap(
+            path + ".tmp", mode="w+", dtype=dtype, shape=shape
+        )
+
+    def commit(self, array: np.memmap) -> str:
+        pending = self._pending
+        name, split, key = pending["name"], pending["split"], pending["key"]
+        path = self.array_path(name, key)
+        array.flush()
+        del array
+        os.replace(path + ".tmp", path)
+        self._write_json(
+            pending["meta"], os.path.join(self.root, name, f"{key}.json")
+        )
+        self.set_current(name, split, key)
+        return path
+
+    def set_current(self, name: str, split: str, key: str) -> None:
+        manifest = self._read_json(self.manifest_path)
+        manifest.setdefault(name, {})[split] = key
+        self._write_json(manifest, self.manifest_path)
+
+    def load(self, name: str, split: str, mmap_mode: Optional[str] = "r") -> np.ndarray:
+        """Loads the current features registered for (name, split).
+
+        Raises ValueError if the input data, or the data the extractor was
+        fit on, changed since they were extracted, rather than returning
+        stale features.
+        """
+        manifest = self._read_json(self.manifest_path)
+        try:
+            key = manifest[name][split]
+        except KeyError:
+            raise KeyError(
+                f"No '{name}' features for split '{split}' in {self.root}. "
+                "Run ./scripts/mnist/extract_features.py first."
+            )
+        meta = self._read_json(os.path.join(self.root, name, f"{key}.json"))
+        input_path = meta.get("input_path")
+        fit_inputs = meta.get("fit_inputs", {})
+        for path in [input_path, *fit_inputs.values()]:
+            if not path or not os.path.exists(path):
+                raise ValueError(
+                    f"Input of the '{name}' {split} features is missing "
+                    f"({path}). Rerun ./scripts/mnist/extract_features.py."
+                )
+        current_key = make_key(
+            self.input_hash(input_path),
+            meta["version"],
+            self._key_params(meta["params"], fit_inputs),
+        )
+        if current_key != key:
+            changed = ", ".join([input_path, *fit_inputs.values()])
+            raise ValueError(
+                f"'{name}' {split} features are stale: {changed} changed "
+                "since extraction. Rerun ./scripts/mnist/extract_features.py."
+            )
+        return np.load(self.array_path(name, key), mmap_mode=mmap_mode)
+
+# EOF
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Timestamp: "2026-10-20 09:12:30 (ywatanabe)"
+# File: /home/ywatanabe/proj/scitex_template_research/scripts/mnist/io_paths.py
+# ----------------------------------------
+from __future__ import annotations
+import os
+__FILE__ = (
+    "./scripts/mnist/io_paths.py"
+)
+__DIR__ = os.path.dirname(__FILE__)
+# ----------------------------------------
+
+"""
+Functionality:
+    - Resolves the scitex output directory of a script
+    - Links files written there from the cwd, as scitex.io.save does, for
+      outputs that are written without scitex.io.save
+Input:
+    - Script path (/path/to/file.py -> /path/to/file_out/)
+Output:
+    - Symlinks under the cwd
+Prerequisites:
+    - None
+
+Usage:
+    out_path = os.path.join(get_out_dir(__file__), "./data/array.npc")
+    save_chunked(out_path, array)
+    link_from_cwd("./data/array.npc", out_path)
+"""
+
+"""Functions & Classes"""
+def get_out_dir(file: str) -> str:
+    """Returns the scitex output directory of a script (file.py -> file_out)."""
+    return os.path.splitext(file)[0] + "_out"
+
+
+def link_from_cwd(path: str, out_path: str) -> None:
+    """Links the relative `path` under the cwd to `out_path`, as scitex does."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if os.path.lexists(path):
+        os.remove(path)
+    os.symlink(os.path.abspath(out_path), path)
+
+# EOF
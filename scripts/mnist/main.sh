@@ -33,9 +33,14 @@ cleanup() {
 main() {
     ./scripts/mnist/download.py
     ./scripts/mnist/plot_digits.py
+    ./scripts/mnist/extract_features.py
     ./scripts/mnist/plot_umap_space.py
     ./scripts/mnist/clf_svm.py
+    ./scripts/mnist/compress_svm.py
+    ./scripts/mnist/clf_cascade.py
+    ./scripts/mnist/clf_cnn.py
     ./scripts/mnist/clf_svm_plot_conf_mat.py
+    ./scripts/mnist/plot_roc_pr.py
 }
 
 cleanup
@@ -30,9 +30,12 @@ from typing import Optional
 import numpy as np
 import scitex
 import seaborn as sns
+from config_compiler import load_config
 from sklearn.metrics import confusion_matrix
 
 """Parameters"""
+# All static values come from CFG; the session CONFIG only for ID and SDIR
+CFG = load_config()
 
 """Functions & Classes"""
 def plot_confusion_matrix(labels: np.ndarray, predictions: np.ndarray) -> None:
@@ -42,7 +45,7 @@ def plot_confusion_matrix(labels: np.ndarray, predictions: np.ndarray) -> None:
     ax.set_xyt("Predicted", "True", "Confusion Matrix")
     scitex.io.save(
         fig,
-        CONFIG.PATH.MNIST.FIGURES + "confusion_matrix.jpg",
+        CFG.PATH.MNIST.FIGURES + "confusion_matrix.jpg",
         symlink_from_cwd=True,
     )
 
@@ -12,6 +12,7 @@ Input:
     - MNIST dataset
 Output:
     - Sample image plots
+    - Single-image montage of large sample sheets (--montage)
 Prerequisites:
     - scitex package
     - PyTorch
@@ -22,10 +23,18 @@ import argparse
 from typing import Optional
 
 import matplotlib.pyplot as plt
+import numpy as np
 import scitex
+from chunked_array import open_array
+from config_compiler import load_config
+from io_paths import get_out_dir
+from plot_export import save_figure, wait_for_exports
+from sampling import select_exemplars
 from torch.utils.data import DataLoader
 
 """Parameters"""
+# All static values come from CFG; the session CONFIG only for ID and SDIR
+CFG = load_config()
 
 """Functions & Classes"""
 
@@ -41,37 +50,182 @@ def plot_samples(loader: DataLoader, n_samples: int = 25) -> None:
             # ax.axis("off")
 
     plt.tight_layout()
-    scitex.io.save(fig, CONFIG.PATH.MNIST.FIGURES + "mnist_samples.jpg", symlink_from_cwd=True)
+    scitex.io.save(fig, CFG.PATH.MNIST.FIGURES + "mnist_samples.jpg", symlink_from_cwd=True)
 
 
-def plot_label_examples(loader: DataLoader) -> None:
-    images, labels = next(iter(loader))
-    fig, axes = scitex.plt.subplots(2, 5, figsize=(15, 6))
+def plot_label_examples(
+    data: np.ndarray, labels: np.ndarray, n_per_class: int = 1
+) -> None:
+    indices = select_exemplars(
+        labels, n_per_class, random_state=CFG.MNIST.RANDOM_STATE
+    )
+    # Sorted fancy indexing reads only the selected rows (or their chunks)
+    read_order = np.argsort(indices)
+    images = np.empty((len(indices), 28, 28), dtype=data.dtype)
+    images[read_order] = data[indices[read_order]].reshape(-1, 28, 28)
+    selected_labels = np.asarray(labels)[indices]
+
+    missing = sorted(set(CFG.MNIST.LABELS) - set(selected_labels.tolist()))
+    if missing:
+        scitex.str.printc(f"No examples found for labels: {missing}", c="red")
+
+    if n_per_class == 1:
+        fig, axes = scitex.plt.subplots(2, 5, figsize=(15, 6))
+        for idx, (img, label) in enumerate(zip(images, selected_labels)):
+            row, col = idx // 5, idx % 5
+            axes[row, col].imshow(img, cmap="gray")
+            axes[row, col].set_title(f"Digit: {label}")
+            # axes[row, col].axis("off")
+    else:
+        # One montage row per class; short classes leave blank tiles
+        classes, starts, counts = np.unique(
+            selected_labels, return_index=True, return_counts=True
+        )
+        rank = np.arange(len(indices)) - np.repeat(starts, counts)
+        grid = np.zeros((len(classes) * n_per_class, 28, 28), dtype=images.dtype)
+        grid[np.searchsorted(classes, selected_labels) * n_per_class + rank] = images
+
+        fig, ax = scitex.plt.subplots(figsize=(15, 15 * len(classes) / n_per_class))
+        ax.imshow(tile_images(grid, n_per_class), cmap="gray", interpolation="nearest")
+        ax.set_yticks((np.arange(len(classes)) + 0.5) * 29)
+        ax.set_yticklabels(classes)
+        ax.set_xticks([])
+        ax.set_ylabel("Digit")
+
+    plt.tight_layout()
+    scitex.io.save(fig, CFG.PATH.MNIST.FIGURES + "mnist_digits.jpg", symlink_from_cwd=True)
+
+
+def tile_images(
+    images: np.ndarray, n_cols: int, pad: int = 1, fill: float = 0.0
+) -> np.ndarray:
+    """Tiles (N, H, W) images into a single (rows * H, n_cols * W) array.
+
+    Images are written into a padded (rows * n_cols, H + pad, W + pad)
+    buffer, viewed as (rows, n_cols, H + pad, W + pad) and transposed to
+    (rows, H + pad, n_cols, W + pad), which only swaps strides. The final
+    reshape is the single copy.
+    """
+    n_images, height, width = images.shape
+    n_rows = -(-n_images // n_cols)
+    tile_h, tile_w = height + pad, width + pad
+
+    buffer = np.full(
+        (n_rows * n_cols, tile_h, tile_w), fill, dtype=images.dtype
+    )
+    buffer[:n_images, :height, :width] = images
+
+    return (
+        buffer.reshape(n_rows, n_cols, tile_h, tile_w)
+        .transpose(0, 2, 1, 3)
+        .reshape(n_rows * tile_h, n_cols * tile_w)
+    )
+
+
+def overlay_labels(
+    ax, labels: np.ndarray, n_cols: int, tile_h: int, tile_w: int
+) -> None:
+    """Draws digit labels at the top-left of each tile.
+
+    One scatter call per class with a mathtext marker, so the number of
+    artists is bounded by the number of classes, not by the number of tiles.
+    """
+    labels = np.asarray(labels)
+    positions = np.arange(len(labels))
+    xs = (positions % n_cols) * tile_w + 0.2 * tile_w
+    ys = (positions // n_cols) * tile_h + 0.2 * tile_h
+    fig_width_pt = ax.get_figure().get_size_inches()[0] * 72
+    marker_size = (0.3 * fig_width_pt / n_cols) ** 2
+
+    for label in np.unique(labels):
+        mask = labels == label
+        ax.scatter(
+            xs[mask],
+            ys[mask],
+            marker=f"${label}$",
+            s=marker_size,
+            c="yellow",
+            linewidths=0,
+        )
+
 
-    label_examples = {}
-    for img, label in zip(images, labels):
-        if label.item() not in label_examples and len(label_examples) < 10:
-            label_examples[label.item()] = img
+def plot_montage(
+    data: np.ndarray,
+    labels: np.ndarray,
+    n_cols: int = 50,
+    show_labels: bool = True,
+) -> None:
+    n_samples = min(n_cols * n_cols, len(data))
+    images = np.asarray(data[:n_samples]).reshape(n_samples, 28, 28)
+    pad = 1
+    montage = tile_images(images, n_cols, pad=pad)
 
-    for idx, (label, img) in enumerate(sorted(label_examples.items())):
-        row, col = idx // 5, idx % 5
-        axes[row, col].imshow(img.squeeze(), cmap="gray")
-        axes[row, col].set_title(f"Digit: {label}")
-        # axes[row, col].axis("off")
+    fig, ax = scitex.plt.subplots(figsize=(10, 10))
+    ax.imshow(montage, cmap="gray", interpolation="nearest")
+    if show_labels:
+        overlay_labels(ax, labels[:n_samples], n_cols, 28 + pad, 28 + pad)
+    ax.set_title(f"MNIST Samples (n = {n_samples})")
+    ax.set_xticks([])
+    ax.set_yticks([])
 
     plt.tight_layout()
-    scitex.io.save(fig, CONFIG.PATH.MNIST.FIGURES + "mnist_digits.jpg", symlink_from_cwd=True)
+    save_figure(
+        fig,
+        CFG.PATH.MNIST.FIGURES + "mnist_montage.jpg",
+        out_dir=get_out_dir(__file__),
+        threshold_mb=CFG.PLOT.DATA_EXPORT.BINARY_THRESHOLD_MB,
+    )
 
 
 def main(args: argparse.Namespace) -> Optional[int]:
-    train_loader = scitex.io.load(CONFIG.PATH.MNIST.LOADER.TRAIN)
+    if args.montage:
+        train_data = open_array(CFG.PATH.MNIST.FLATTENED.TRAIN)
+        train_labels = open_array(CFG.PATH.MNIST.LABELS.TRAIN)
+        plot_montage(
+            train_data,
+            train_labels,
+            n_cols=args.n_cols,
+            show_labels=not args.no_labels,
+        )
+        wait_for_exports()
+        return 0
+
+    train_loader = scitex.io.load(CFG.PATH.MNIST.LOADER.TRAIN)
     plot_samples(train_loader)
-    plot_label_examples(train_loader)
+
+    # Memory-mapped so exemplar selection only touches the selected rows
+    train_data = open_array(CFG.PATH.MNIST.FLATTENED.TRAIN)
+    train_labels = open_array(CFG.PATH.MNIST.LABELS.TRAIN)
+    plot_label_examples(train_data, train_labels, n_per_class=args.n_per_class)
     return 0
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Visualize MNIST samples")
+    parser.add_argument(
+        "--n-per-class",
+        type=int,
+        default=1,
+        help="Number of exemplars per digit in the label examples figure (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--montage",
+        action="store_true",
+        default=False,
+        help="Render an n_cols x n_cols sample sheet as a single image (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--n-cols",
+        type=int,
+        default=50,
+        help="Number of digits per row/column in montage mode (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-labels",
+        action="store_true",
+        default=False,
+        help="Do not overlay labels in montage mode (default: %(default)s)",
+    )
     args = parser.parse_args()
     scitex.str.printc(args, c="yellow")
     return args
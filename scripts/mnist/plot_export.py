@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Timestamp: "2026-10-19 16:22:10 (ywatanabe)"
+# File: /home/ywatanabe/proj/scitex_template_research/scripts/mnist/plot_export.py
+# ----------------------------------------
+from __future__ import annotations
+import os
+__FILE__ = (
+    "./scripts/mnist/plot_export.py"
+)
+__DIR__ = os.path.dirname(__FILE__)
+# ----------------------------------------
+
+"""
+Functionality:
+    - Saves scitex.plt figures, exporting the tracked plotting data once as
+      - CSV (as scitex does) when small
+      - Compressed columnar .npz when above a size threshold, written in a
+        background thread
+    - Saves into the calling script's output directory, as scitex.io.save
+      does for relative paths from the script itself
+    - Reads either export back as the same DataFrame
+Input:
+    - scitex.plt figure
+Output:
+    - /path/to/figure.jpg
+    - /path/to/figure.csv or /path/to/figure.npz
+Prerequisites:
+    - scitex package
+    - numpy
+    - pandas
+
+Usage:
+    save_figure(
+        fig,
+        CFG.PATH.MNIST.FIGURES + "umap.jpg",
+        out_dir=get_out_dir(__file__),
+        threshold_mb=1.0,
+    )
+    ...
+    wait_for_exports()  # before session.close
+"""
+
+"""Imports"""
+import atexit
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List
+
+import numpy as np
+import pandas as pd
+import scitex
+from io_paths import link_from_cwd
+from matplotlib.figure import Figure
+
+"""Parameters"""
+_EXECUTOR = ThreadPoolExecutor(max_workers=1)
+_PENDING: List[Future] = []
+_COLUMNS_KEY = "__columns__"
+
+"""Functions & Classes"""
+def to_columnar(df: pd.DataFrame) -> dict:
+    """One array per column plus the column order; objects become strings."""
+    arrays = {
+        f"col_{ii}": (
+            df[col].to_numpy()
+            if df[col].dtype.kind in "biufcM"
+            else np.asarray(df[col].astype(str), dtype=str)
+        )
+        for ii, col in enumerate(df.columns)
+    }
+    arrays[_COLUMNS_KEY] = np.array([str(col) for col in df.columns])
+    return arrays
+
+
+def from_columnar(arrays) -> pd.DataFrame:
+    columns = list(arrays[_COLUMNS_KEY])
+    return pd.DataFrame(
+        {col: arrays[f"col_{ii}"] for ii, col in enumerate(columns)},
+        columns=columns,
+    )
+
+
+def _matplotlib_figure(fig) -> Figure:
+    """The matplotlib figure behind a scitex.plt figure wrapper.
+
+    Saving the wrapper itself would make scitex.io.save export the plotting
+    data again, so an unknown wrapper layout is an error, not a fallback.
+    """
+    if isinstance(fig, Figure):
+        return fig
+    # Not public in scitex.plt; checked so a rename cannot pass silently
+    mpl_fig = getattr(fig, "_fig_mpl", None)
+    if not isinstance(mpl_fig, Figure):
+        raise TypeError(
+            f"Cannot find the matplotlib figure of {type(fig).__name__} "
+            "(expected scitex.plt's _fig_mpl); update _matplotlib_figure"
+        )
+    return mpl_fig
+
+
+def _write_sidecar(
+    arrays: dict, path: str, out_path: str, symlink_from_cwd: bool
+) -> None:
+    np.savez_compressed(out_path, **arrays)
+    if symlink_from_cwd:
+        link_from_cwd(path, out_path)
+
+
+def save_figure(
+    fig,
+    path: str,
+    out_dir: str,
+    threshold_mb: float = 1.0,
+    symlink_from_cwd: bool = True,
+) -> None:
+    """Saves `fig`; plotted data above `threshold_mb` goes to a .npz sidecar.
+
+    A relative `path` is resolved against `out_dir`, the calling script's
+    output directory (get_out_dir(__file__)); scitex.io.save would resolve
+    it against this module instead. The plotting data is exported once and
+    written here, so the image is saved from the underlying matplotlib
+    figure, which scitex.io.save writes without a CSV export.
+    """
+    out_path = os.path.join(out_dir, path)
+    link = symlink_from_cwd and not os.path.isabs(path)
+    df = fig.export_as_csv() if hasattr(fig, "export_as_csv") else None
+    image = fig if df is None else _matplotlib_figure(fig)
+    scitex.io.save(image, out_path, symlink_from_cwd=False)
+    if link:
+        link_from_cwd(path, out_path)
+    if df is None or df.empty:
+        return
+
+    if df.memory_usage(deep=True).sum() / 1e6 <= threshold_mb:
+        csv_path = os.path.splitext(path)[0] + ".csv"
+        df.to_csv(os.path.join(out_dir, csv_path))
+        if link:
+            link_from_cwd(csv_path, os.path.join(out_dir, csv_path))
+        return
+
+    sidecar_path = os.path.splitext(path)[0] + ".npz"
+    _PENDING.append(
+        _EXECUTOR.submit(
+            _write_sidecar,
+            to_columnar(df),
+            sidecar_path,
+            os.path.join(out_dir, sidecar_path),
+            link,
+        )
+    )
+
+
+def wait_for_exports() -> None:
+    """Blocks until deferred sidecar writes have finished."""
+    while _PENDING:
+        _PENDING.pop(0).result()
+
+
+def load_plot_data(path: str) -> pd.DataFrame:
+    """Loads a .csv or .npz plotting-data export as a DataFrame."""
+    if path.endswith(".npz"):
+        with np.load(path, allow_pickle=False) as arrays:
+            return from_columnar(arrays)
+    df = pd.read_csv(path)
+    # Drop the unnamed index column written by DataFrame.to_csv
+    if len(df.columns) and str(df.columns[0]).startswith("Unnamed: 0"):
+        df = df.drop(columns=df.columns[0])
+    return df
+
+
+atexit.register(wait_for_exports)
+
+# EOF
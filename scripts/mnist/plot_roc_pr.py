@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Timestamp: "2026-10-19 13:41:17 (ywatanabe)"
+# File: /home/ywatanabe/proj/scitex_template_research/scripts/mnist/plot_roc_pr.py
+# ----------------------------------------
+from __future__ import annotations
+import os
+__FILE__ = (
+    "./scripts/mnist/plot_roc_pr.py"
+)
+__DIR__ = os.path.dirname(__FILE__)
+# ----------------------------------------
+
+"""
+Functionality:
+- Plots one-vs-rest ROC and precision-recall curves from cached decision scores
+Input:
+- Decision scores and labels from SVM classifier
+Output:
+- ROC and precision-recall plots
+- Per-class ROC AUC and average precision
+Prerequisites:
+- scitex package
+"""
+
+"""Imports"""
+import argparse
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+import scitex
+from config_compiler import load_config
+from roc_pr import one_vs_rest_curves
+
+"""Parameters"""
+# All static values come from CFG; the session CONFIG only for ID and SDIR
+CFG = load_config()
+
+"""Functions & Classes"""
+def plot_curves(curves: Dict) -> None:
+    fig, axes = scitex.plt.subplots(1, 2, figsize=(16, 7))
+    for cls, curve in curves.items():
+        axes[0].plot(
+            curve["fpr"], curve["tpr"], label=f"{cls} (AUC={curve['auc']:.3f})"
+        )
+        axes[1].plot(
+            curve["recall"],
+            curve["precision"],
+            label=f"{cls} (AP={curve['ap']:.3f})",
+        )
+    axes[0].set_xyt("False Positive Rate", "True Positive Rate", "ROC (one-vs-rest)")
+    axes[1].set_xyt("Recall", "Precision", "Precision-Recall (one-vs-rest)")
+    for ax in axes:
+        ax.legend()
+    scitex.io.save(
+        fig,
+        CFG.PATH.MNIST.FIGURES + "roc_pr.jpg",
+        symlink_from_cwd=True,
+    )
+
+
+def main(args: argparse.Namespace) -> Optional[int]:
+    scores = scitex.io.load("./scripts/mnist/clf_svm_out/decision_scores.npy")
+    labels = scitex.io.load("./scripts/mnist/clf_svm_out/labels.npy")
+    curves = one_vs_rest_curves(labels, scores, CFG.MNIST.LABELS)
+    plot_curves(curves)
+
+    summary = pd.DataFrame(
+        {
+            "label": list(curves),
+            "roc_auc": [curve["auc"] for curve in curves.values()],
+            "average_precision": [curve["ap"] for curve in curves.values()],
+        }
+    )
+    scitex.io.save(summary, "./roc_pr_summary.csv", symlink_from_cwd=True)
+    scitex.str.printc(
+        f"Macro ROC AUC: {summary.roc_auc.mean():.4f}, "
+        f"Macro AP: {summary.average_precision.mean():.4f}",
+        c="green",
+    )
+    return 0
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Plot ROC and PR curves")
+    args = parser.parse_args()
+    scitex.str.printc(args, c="yellow")
+    return args
+
+
+def run_session() -> None:
+    import sys
+
+    import matplotlib.pyplot as plt
+
+    global CONFIG, CC, sys, plt
+    args = parse_args()
+    CONFIG, sys.stdout, sys.stderr, plt, CC, rng = scitex.session.start(
+        sys,
+        plt,
+        args=args,
+        file=__file__,
+        agg=True,
+    )
+    exit_status = main(args)
+    scitex.session.close(
+        CONFIG,
+        exit_status=exit_status,
+    )
+
+
+if __name__ == "__main__":
+    run_session()
+
+# EOF
@@ -12,6 +12,8 @@ Input:
     - MNIST dataset
 Output:
     - UMAP visualization plots
+    - Memory-mapped embedding (--mode subsample)
+    - Embedding preservation metrics (--evaluate-preservation)
 Prerequisites:
     - scitex package
     - umap-learn
@@ -19,25 +21,143 @@ Prerequisites:
 
 """Imports"""
 import argparse
+import os
 from typing import Optional
 
 import matplotlib.pyplot as plt
+import pandas as pd
 import scitex
 import numpy as np
 import umap
+from checkpoint import Checkpointer, fingerprint
+from config_compiler import load_config
+from dataset_host import load_array
+from feature_store import FeatureStore
+from io_paths import get_out_dir
+from plot_export import save_figure, wait_for_exports
+from sampling import stratified_subsample
+from sklearn.manifold import trustworthiness
+from sklearn.neighbors import NearestNeighbors
+from thread_budget import ThreadBudget, get_cpu_allowance
 
 """Parameters"""
-
+# All static values come from CFG; the session CONFIG only for ID and SDIR
+CFG = load_config()
 
 """Functions & Classes"""
 
 
-def create_umap_embedding(data: np.ndarray) -> np.ndarray:
-    reducer = umap.UMAP(random_state=CONFIG.MNIST.UMAP_RANDOM_STATE, n_jobs=-1)
+def create_umap_embedding(data: np.ndarray, n_jobs: int = -1) -> np.ndarray:
+    reducer = umap.UMAP(random_state=CFG.MNIST.UMAP_RANDOM_STATE, n_jobs=n_jobs)
     embedding = reducer.fit_transform(data)
     return embedding
 
 
+def create_umap_embedding_streamed(
+    data: np.ndarray,
+    labels: np.ndarray,
+    out_path: str,
+    subsample_size: int,
+    chunk_size: int,
+    n_jobs: int = -1,
+    ckpt: Optional[Checkpointer] = None,
+    state: Optional[dict] = None,
+) -> np.ndarray:
+    """Fits UMAP on a stratified subsample and transforms the rest in chunks.
+
+    The embedding is written into a .npy memmap at `out_path`, so neither
+    the full data nor the full embedding has to be held in memory. With
+    `ckpt`, progress is checkpointed as the fitted reducer, the rows it was
+    fit on and the next row to transform, never the embedding itself; pass
+    the loaded `state` to resume from it.
+    """
+    state = state or {}
+    reducer = state.get("reducer")
+    if reducer is not None and os.path.exists(out_path):
+        # The fit rows are already embedded; they must not be redrawn
+        fit_idx = state["fit_idx"]
+        embedding = np.load(out_path, mmap_mode="r+")
+        next_row = state["next_row"]
+    else:
+        fit_idx = stratified_subsample(
+            labels, subsample_size, random_state=CFG.MNIST.UMAP_RANDOM_STATE
+        )
+        reducer = umap.UMAP(
+            random_state=CFG.MNIST.UMAP_RANDOM_STATE, n_jobs=n_jobs
+        )
+        fit_embedding = reducer.fit_transform(np.asarray(data[fit_idx]))
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+        embedding = np.lib.format.open_memmap(
+            out_path, mode="w+", dtype=np.float32, shape=(len(data), 2)
+        )
+        embedding[fit_idx] = fit_embedding
+        next_row = 0
+
+    def progress(next_row: int) -> dict:
+        # Rows up to next_row must be on disk before they are recorded
+        embedding.flush()
+        return {"reducer": reducer, "fit_idx": fit_idx, "next_row": next_row}
+
+    if ckpt is not None and next_row == 0:
+        ckpt.save(progress(0))
+
+    is_fitted = np.zeros(len(data), dtype=bool)
+    is_fitted[fit_idx] = True
+    for start in range(next_row, len(data), chunk_size):
+        stop = min(start + chunk_size, len(data))
+        rows = start + np.flatnonzero(~is_fitted[start:stop])
+        if len(rows):
+            embedding[rows] = reducer.transform(np.asarray(data[rows]))
+        scitex.str.printc(f"Embedded {stop:,}/{len(data):,} rows", c="yellow")
+        if ckpt is not None:
+            ckpt.maybe_save(lambda: progress(stop), force=stop == len(data))
+    embedding.flush()
+    return embedding
+
+
+def knn_overlap(a: np.ndarray, b: np.ndarray, k: int = 15) -> float:
+    """Mean fraction of shared k-nearest neighbors between two embeddings."""
+    nn_a = NearestNeighbors(n_neighbors=k + 1).fit(a).kneighbors(a, return_distance=False)[:, 1:]
+    nn_b = NearestNeighbors(n_neighbors=k + 1).fit(b).kneighbors(b, return_distance=False)[:, 1:]
+    shared = (nn_a[:, :, None] == nn_b[:, None, :]).any(axis=2).sum(axis=1)
+    return float(np.mean(shared / k))
+
+
+def evaluate_preservation(
+    data: np.ndarray,
+    labels: np.ndarray,
+    n_samples: int,
+    subsample_size: int,
+    n_jobs: int = -1,
+) -> pd.DataFrame:
+    """Compares subsample-fit embedding with a full fit on a small data set."""
+    idx = stratified_subsample(
+        labels, n_samples, random_state=CFG.MNIST.UMAP_RANDOM_STATE
+    )
+    small_data = np.asarray(data[idx])
+    small_labels = np.asarray(labels)[idx]
+
+    full = create_umap_embedding(small_data, n_jobs=n_jobs)
+    streamed = create_umap_embedding_streamed(
+        small_data,
+        small_labels,
+        os.path.join(get_out_dir(__file__), "preservation_embedding.npy"),
+        subsample_size=min(subsample_size, n_samples // 5),
+        chunk_size=CFG.MNIST.UMAP.CHUNK_SIZE,
+        n_jobs=n_jobs,
+    )
+    return pd.DataFrame(
+        [
+            {
+                "n_samples": n_samples,
+                "trustworthiness_full": trustworthiness(small_data, full),
+                "trustworthiness_subsample": trustworthiness(small_data, streamed),
+                "knn_overlap_with_full": knn_overlap(full, streamed),
+            }
+        ]
+    )
+
+
 def plot_umap(embedding: np.ndarray, labels: np.ndarray) -> None:
     fig, ax = scitex.plt.subplots(figsize=(12, 8))
     scatter = ax.scatter(
@@ -49,14 +169,82 @@ def plot_umap(embedding: np.ndarray, labels: np.ndarray) -> None:
     ax.set_xlabel("UMAP 1")
     ax.set_ylabel("UMAP 2")
 
-    scitex.io.save(fig, CONFIG.PATH.MNIST.FIGURES + "umap.jpg", symlink_from_cwd=True)
+    save_figure(
+        fig,
+        CFG.PATH.MNIST.FIGURES + "umap.jpg",
+        out_dir=get_out_dir(__file__),
+        threshold_mb=CFG.PLOT.DATA_EXPORT.BINARY_THRESHOLD_MB,
+    )
 
 
 def main(args: argparse.Namespace) -> Optional[int]:
-    train_data = scitex.io.load(CONFIG.PATH.MNIST.FLATTENED.TRAIN)
-    train_labels = scitex.io.load(CONFIG.PATH.MNIST.LABELS.TRAIN)
-    embedding = create_umap_embedding(train_data)
+    if args.features == "raw":
+        train_data = load_array(
+            CFG.PATH.MNIST.FLATTENED.TRAIN, CFG.PATH.MNIST.SHM_REGISTRY
+        )
+    else:
+        train_data = FeatureStore(CFG.PATH.MNIST.FEATURES).load(
+            args.features, "train"
+        )
+    train_labels = load_array(
+        CFG.PATH.MNIST.LABELS.TRAIN, CFG.PATH.MNIST.SHM_REGISTRY
+    )
+
+    ckpt = Checkpointer(
+        __file__,
+        name=f"umap_embedding_{args.features}_{args.mode}",
+        resume=not args.no_resume,
+        current_id=CONFIG.ID,
+        key=fingerprint(
+            {
+                "features": args.features,
+                "mode": args.mode,
+                "subsample_size": (
+                    CFG.MNIST.UMAP.SUBSAMPLE_SIZE
+                    if args.mode == "subsample"
+                    else None
+                ),
+            },
+            CFG.MNIST.UMAP_RANDOM_STATE,
+            train_data,
+            train_labels,
+        ),
+    )
+    state = ckpt.load() or {}
+    embedding = state.get("embedding")
+    # UMAP's numba loops are the outer layer; BLAS beneath gets the rest
+    budget = ThreadBudget(get_cpu_allowance(CFG.RESOURCES.N_CPUS))
+    with budget.section("umap", outer=budget.n_cpus) as alloc:
+        if embedding is None and args.mode == "subsample":
+            embedding = create_umap_embedding_streamed(
+                train_data,
+                train_labels,
+                os.path.join(get_out_dir(__file__), "embedding.npy"),
+                subsample_size=CFG.MNIST.UMAP.SUBSAMPLE_SIZE,
+                chunk_size=CFG.MNIST.UMAP.CHUNK_SIZE,
+                n_jobs=alloc.outer,
+                ckpt=ckpt,
+                state=state,
+            )
+        elif embedding is None:
+            embedding = create_umap_embedding(train_data, n_jobs=alloc.outer)
+            ckpt.save({"embedding": embedding})
+
+    if args.evaluate_preservation:
+        with budget.section("umap_preservation", outer=budget.n_cpus) as alloc:
+            preservation = evaluate_preservation(
+                train_data,
+                train_labels,
+                n_samples=CFG.MNIST.UMAP.N_PRESERVATION,
+                subsample_size=CFG.MNIST.UMAP.SUBSAMPLE_SIZE,
+                n_jobs=alloc.outer,
+            )
+        scitex.io.save(preservation, "./preservation.csv", symlink_from_cwd=True)
+        scitex.str.printc(preservation.to_string(index=False), c="green")
+
     plot_umap(embedding, train_labels)
+    wait_for_exports()
+    ckpt.clear()
     return 0
 
 
@@ -64,6 +252,33 @@ def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Create UMAP visualization of MNIST"
     )
+    parser.add_argument(
+        "--features",
+        type=str,
+        choices=["raw", "pca", "hog", "pooled"],
+        default="raw",
+        help="Input representation; non-raw ones come from extract_features.py (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--mode",
+        type=str,
+        choices=["full", "subsample"],
+        default="full",
+        help="full: fit_transform on all rows; subsample: fit on CFG.MNIST.UMAP.SUBSAMPLE_SIZE "
+        "stratified rows and stream the rest through transform (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--evaluate-preservation",
+        action="store_true",
+        default=False,
+        help="Compare subsample mode with a full fit on CFG.MNIST.UMAP.N_PRESERVATION rows (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        default=False,
+        help="Ignore checkpoints left by an interrupted run (default: %(default)s)",
+    )
     args = parser.parse_args()
     scitex.str.printc(args, c="yellow")
     return args
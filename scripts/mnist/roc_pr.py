@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Timestamp: "2026-10-19 13:24:51 (ywatanabe)"
+# File: /home/ywatanabe/proj/scitex_template_research/scripts/mnist/roc_pr.py
+# ----------------------------------------
+from __future__ import annotations
+import os
+__FILE__ = (
+    "./scripts/mnist/roc_pr.py"
+)
+__DIR__ = os.path.dirname(__FILE__)
+# ----------------------------------------
+
+"""
+Functionality:
+    - Computes one-vs-rest ROC and precision-recall curves for all classes
+      from cached decision scores, without per-threshold loops
+Input:
+    - True labels (n,) and decision scores (n, n_classes)
+Output:
+    - Per-class curves, ROC AUC and average precision
+Prerequisites:
+    - numpy
+"""
+
+"""Imports"""
+from typing import Dict, Sequence
+
+import numpy as np
+
+"""Functions & Classes"""
+def one_vs_rest_curves(
+    labels: np.ndarray, scores: np.ndarray, classes: Sequence
+) -> Dict[object, Dict[str, np.ndarray]]:
+    """Returns {class: {fpr, tpr, precision, recall, thresholds, auc, ap}}.
+
+    All columns are sorted by one `argsort(axis=0)`; true/false positive
+    counts at every threshold are cumulative sums of the sorted one-hot
+    targets. Only the last position of each run of tied scores is kept,
+    matching `sklearn.metrics.roc_curve(drop_intermediate=False)` and
+    `precision_recall_curve`.
+    """
+    scores = np.asarray(scores)
+    order = np.argsort(-scores, axis=0, kind="stable")
+    sorted_scores = np.take_along_axis(scores, order, axis=0)
+    targets = np.asarray(labels)[order] == np.asarray(classes)[None, :]
+
+    tps = np.cumsum(targets, axis=0)
+    fps = np.arange(1, len(scores) + 1)[:, None] - tps
+    # Last index of each run of equal scores, per column
+    distinct = np.ones_like(targets)
+    distinct[:-1] = np.diff(sorted_scores, axis=0) != 0
+
+    curves = {}
+    for col, cls in enumerate(classes):
+        keep = distinct[:, col]
+        tp, fp = tps[keep, col], fps[keep, col]
+        n_pos, n_neg = tps[-1, col], fps[-1, col]
+
+        tpr = np.concatenate([[0.0], tp / max(n_pos, 1)])
+        fpr = np.concatenate([[0.0], fp / max(n_neg, 1)])
+        precision = tp / (tp + fp)
+        recall = tp / max(n_pos, 1)
+
+        curves[cls] = {
+            "fpr": fpr,
+            "tpr": tpr,
+            "precision": precision,
+            "recall": recall,
+            "thresholds": sorted_scores[keep, col],
+            "auc": float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2)),
+            "ap": float(np.sum(np.diff(recall, prepend=0.0) * precision)),
+        }
+    return curves
+
+# EOF
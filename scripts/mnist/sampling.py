@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Timestamp: "2026-10-19 10:12:41 (ywatanabe)"
+# File: /home/ywatanabe/proj/scitex_template_research/scripts/mnist/sampling.py
+# ----------------------------------------
+from __future__ import annotations
+import os
+__FILE__ = (
+    "./scripts/mnist/sampling.py"
+)
+__DIR__ = os.path.dirname(__FILE__)
+# ----------------------------------------
+
+"""
+Functionality:
+    - Selects per-class exemplar indices directly from a label array
+    - Draws class-stratified subsamples
+Input:
+    - Label array (in memory or memory-mapped)
+Output:
+    - Row indices grouped by class
+Prerequisites:
+    - numpy
+"""
+
+"""Imports"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+"""Functions & Classes"""
+def _rank_within_class(
+    labels: np.ndarray, random_state: Optional[int], shuffle: bool
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Groups rows by class and ranks them within their class.
+
+    Rows are (optionally) permuted and stably sorted by label so each class
+    is a contiguous run; the rank of a row is its offset from the start of
+    its run, given by `np.unique(..., return_index=True)`.
+
+    Returns the row order, the class index of each ordered row, and its rank.
+    """
+    labels = np.asarray(labels)
+    if shuffle:
+        order = np.random.default_rng(random_state).permutation(len(labels))
+    else:
+        order = np.arange(len(labels))
+    order = order[np.argsort(labels[order], kind="stable")]
+
+    _, starts, group, counts = np.unique(
+        labels[order], return_index=True, return_inverse=True, return_counts=True
+    )
+    rank = np.arange(len(order)) - np.repeat(starts, counts)
+    return order, group.ravel(), rank
+
+
+def select_exemplars(
+    labels: np.ndarray,
+    n_per_class: int = 1,
+    random_state: Optional[int] = None,
+    shuffle: bool = True,
+) -> np.ndarray:
+    """Returns up to `n_per_class` row indices for every class in `labels`.
+
+    Classes with fewer rows than requested contribute all of their rows.
+    The result is grouped by class in ascending label order.
+    """
+    order, _, rank = _rank_within_class(labels, random_state, shuffle)
+    return order[rank < n_per_class]
+
+
+def stratified_subsample(
+    labels: np.ndarray, n_samples: int, random_state: Optional[int] = None
+) -> np.ndarray:
+    """Returns `n_samples` sorted row indices with class proportions preserved.
+
+    Quotas are floor(n_samples * class_fraction); the remaining rows go to
+    the classes with the largest fractional parts.
+    """
+    order, group, rank = _rank_within_class(labels, random_state, shuffle=True)
+    counts = np.bincount(group)
+    n_samples = min(n_samples, len(order))
+
+    exact = counts * n_samples / len(order)
+    quotas = np.floor(exact).astype(np.int64)
+    remainder = n_samples - quotas.sum()
+    quotas[np.argsort(quotas - exact, kind="stable")[:remainder]] += 1
+    return np.sort(order[rank < quotas[group]])
+
+# EOF
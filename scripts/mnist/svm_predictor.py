@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Timestamp: "2026-10-19 15:31:20 (ywatanabe)"
+# File: /home/ywatanabe/proj/scitex_template_research/scripts/mnist/svm_predictor.py
+# ----------------------------------------
+from __future__ import annotations
+import os
+__FILE__ = (
+    "./scripts/mnist/svm_predictor.py"
+)
+__DIR__ = os.path.dirname(__FILE__)
+# ----------------------------------------
+
+"""
+Functionality:
+    - Predicts with a fitted RBF SVC without libsvm
+      - RBF kernels are computed block by block as GEMMs
+      - Basis vectors can be stored in float64, float32 or float16
+        (float16 storage is upcast per block and accumulated in float32)
+      - One-vs-one votes are combined with matrix products
+    - Verifies agreement with SVC.predict / decision_function
+Input:
+    - Fitted sklearn.svm.SVC (kernel="rbf")
+Output:
+    - BlockedRBFPredictor (predict/decision_function like SVC)
+Prerequisites:
+    - numpy
+    - scikit-learn
+"""
+
+"""Imports"""
+import copy
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Tuple
+
+import numpy as np
+from sklearn.svm import SVC
+
+"""Functions & Classes"""
+def ovo_pairs(n_classes: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Class indices (i, j), i < j, in libsvm's one-vs-one order."""
+    i_idx, j_idx = np.triu_indices(n_classes, k=1)
+    return i_idx, j_idx
+
+
+def ovo_votes(decisions: np.ndarray, n_classes: int) -> np.ndarray:
+    """(n, n_classes) vote counts from (n, n_pairs) one-vs-one decisions.
+
+    Pair (i, j) votes for i when its decision is > 0, otherwise for j, as in
+    libsvm. Votes are accumulated with incidence-matrix products instead of
+    a loop over pairs.
+    """
+    i_idx, j_idx = ovo_pairs(n_classes)
+    positive = decisions > 0
+    return positive @ np.eye(n_classes)[i_idx] + (~positive) @ np.eye(n_classes)[j_idx]
+
+
+def ovo_to_ovr(decisions: np.ndarray, n_classes: int) -> np.ndarray:
+    """Votes plus squashed confidences, as SVC(decision_function_shape="ovr").
+
+    The confidence term lies in (-1/3, 1/3), so rounding recovers the votes.
+    """
+    i_idx, j_idx = ovo_pairs(n_classes)
+    confidences = decisions @ (np.eye(n_classes)[i_idx] - np.eye(n_classes)[j_idx])
+    return ovo_votes(decisions, n_classes) + confidences / (
+        3 * (np.abs(confidences) + 1)
+    )
+
+
+def get_pair_dual_coefs(svc: SVC) -> np.ndarray:
+    """Returns (n_support_vectors, n_pairs) dual coefficients of each pair.
+
+    In sklearn's `dual_coef_` layout, the coefficients of class i's support
+    vectors for pair (i, j) are in row j - 1, and those of class j's support
+    vectors are in row i.
+    """
+    n_classes = len(svc.classes_)
+    bounds = np.concatenate([[0], np.cumsum(svc.n_support_)])
+    i_idx, j_idx = ovo_pairs(n_classes)
+
+    alphas = np.zeros((bounds[-1], len(i_idx)))
+    for pair, (i, j) in enumerate(zip(i_idx, j_idx)):
+        sv_i = slice(bounds[i], bounds[i + 1])
+        sv_j = slice(bounds[j], bounds[j + 1])
+        alphas[sv_i, pair] = svc.dual_coef_[j - 1, sv_i]
+        alphas[sv_j, pair] = svc.dual_coef_[i, sv_j]
+    return alphas
+
+
+class BlockedRBFPredictor:
+    """One-vs-one RBF decision functions over a set of basis vectors."""
+
+    def __init__(
+        self,
+        basis_vectors: np.ndarray,
+        pair_coef: np.ndarray,
+        intercept: np.ndarray,
+        gamma: float,
+        classes: np.ndarray,
+        dtype: str = "float64",
+        block_size: int = 2048,
+        n_jobs: int = 1,
+    ):
+        # float16 is a storage format only; GEMMs run in float32
+        self.storage_dtype = np.dtype(dtype)
+        self.compute_dtype = np.result_type(self.storage_dtype, np.float32)
+        self.basis_vectors = np.ascontiguousarray(basis_vectors, dtype=self.storage_dtype)
+        self.basis_sq_norms = np.einsum(
+            "ij,ij->i",
+            self.basis_vectors.astype(self.compute_dtype),
+            self.basis_vectors.astype(self.compute_dtype),
+        )
+        self.pair_coef = np.ascontiguousarray(pair_coef, dtype=self.compute_dtype)
+        self.intercept = np.asarray(intercept, dtype=self.compute_dtype)
+        self.gamma = gamma
+        self.classes_ = classes
+        self.block_size = block_size
+        self.n_jobs = n_jobs
+
+    @classmethod
+    def from_svc(cls, svc: SVC, **kwargs) -> "BlockedRBFPredictor":
+        return cls(
+            basis_vectors=svc.support_vectors_,
+            pair_coef=get_pair_dual_coefs(svc).T,
+            intercept=svc.intercept_,
+            gamma=svc._gamma,
+            classes=svc.classes_,
+            **kwargs,
+        )
+
+    @property
+    def n_basis(self) -> int:
+        return len(self.basis_vectors)
+
+    @property
+    def nbytes(self) -> int:
+        return self.basis_vectors.nbytes + self.pair_coef.nbytes
+
+    def _decision_block(self, X: np.ndarray) -> np.ndarray:
+        """OvO decisions for one block of samples, looping over basis blocks.
+
+        exp(-gamma * ||x - z||^2) with ||x - z||^2 = ||x||^2 + ||z||^2 - 2 x.z,
+        where x.z for the whole block is a single GEMM.
+        """
+        X = X.astype(self.compute_dtype, copy=False)
+        x_sq = np.einsum("ij,ij->i", X, X)
+        decisions = np.tile(self.intercept, (len(X), 1))
+        for start in range(0, self.n_basis, self.block_size):
+            stop = start + self.block_size
+            basis = self.basis_vectors[start:stop].astype(self.compute_dtype, copy=False)
+            kernel = X @ basis.T
+            kernel *= -2
+            kernel += x_sq[:, None]
+            kernel += self.basis_sq_norms[None, start:stop]
+            np.maximum(kernel, 0, out=kernel)
+            kernel *= -self.gamma
+            np.exp(kernel, out=kernel)
+            decisions += kernel @ self.pair_coef[:, start:stop].T
+        return decisions
+
+    def decision_function(self, X: np.ndarray, shape: str = "ovr") -> np.ndarray:
+        blocks = [
+            X[start : start + self.block_size]
+            for start in range(0, len(X), self.block_size)
+        ]
+        if self.n_jobs == 1:
+            decisions = [self._decision_block(block) for block in blocks]
+        else:
+            # numpy releases the GIL in GEMM and exp
+            with ThreadPoolExecutor(max_workers=self.n_jobs) as pool:
+                decisions = list(pool.map(self._decision_block, blocks))
+        decisions = np.concatenate(decisions).astype(np.float64)
+        if shape == "ovo":
+            return decisions
+        return ovo_to_ovr(decisions, len(self.classes_))
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        # argmax returns the first maximum, i.e. libsvm's tie-breaking
+        votes = ovo_votes(self.decision_function(X, shape="ovo"), len(self.classes_))
+        return self.classes_[votes.argmax(axis=1)]
+
+    def verify(self, svc: SVC, X: np.ndarray, atol: float = 1e-3) -> Dict[str, float]:
+        """Compares one-vs-one decisions, predictions and throughput with the SVC."""
+        svc_ovo = copy.copy(svc)
+        svc_ovo.decision_function_shape = "ovo"
+
+        # Speedup compares one kernel pass each: the OvO decision functions
+        start = time.perf_counter()
+        svc_decisions = svc_ovo.decision_function(X)
+        svc_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        decisions = self.decision_function(X, shape="ovo")
+        own_time = time.perf_counter() - start
+
+        svc_predictions = svc.predict(X)
+        votes = ovo_votes(decisions, len(self.classes_))
+        predictions = self.classes_[votes.argmax(axis=1)]
+
+        max_abs_diff = float(np.abs(decisions - svc_decisions).max())
+        agreement = float(np.mean(predictions == svc_predictions))
+        return {
+            "max_abs_diff": max_abs_diff,
+            "agreement": agreement,
+            "within_tolerance": max_abs_diff <= atol,
+            "speedup": svc_time / own_time,
+        }
+
+# EOF
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Timestamp: "2026-10-19 14:38:02 (ywatanabe)"
+# File: /home/ywatanabe/proj/scitex_template_research/scripts/mnist/svm_reduction.py
+# ----------------------------------------
+from __future__ import annotations
+import os
+__FILE__ = (
+    "./scripts/mnist/svm_reduction.py"
+)
+__DIR__ = os.path.dirname(__FILE__)
+# ----------------------------------------
+
+"""
+Functionality:
+    - Compresses a fitted RBF SVC into a reduced set of basis vectors
+      - Support vectors are clustered per class (k-means)
+      - Each one-vs-one decision function is projected onto the centers of
+        its two classes in the kernel feature space
+    - Predicts through the blocked RBF engine of svm_predictor.py
+Input:
+    - Fitted sklearn.svm.SVC (kernel="rbf")
+Output:
+    - ReducedSetSVC (picklable; predict/decision_function like SVC)
+Prerequisites:
+    - numpy
+    - scikit-learn
+"""
+
+"""Imports"""
+from typing import Optional
+
+import numpy as np
+from sklearn.cluster import KMeans
+from sklearn.metrics.pairwise import rbf_kernel
+from sklearn.svm import SVC
+from svm_predictor import BlockedRBFPredictor, get_pair_dual_coefs, ovo_pairs
+
+"""Functions & Classes"""
+class ReducedSetSVC(BlockedRBFPredictor):
+    """One-vs-one RBF classifier over a reduced set of basis vectors."""
+
+    @classmethod
+    def from_svc(
+        cls,
+        svc: SVC,
+        ratio: float = 0.1,
+        ridge: float = 1e-6,
+        random_state: Optional[int] = None,
+        **kwargs,
+    ) -> "ReducedSetSVC":
+        """Keeps about `ratio` of each class's support vectors as centers.
+
+        For pair (i, j) with dual coefficients a over support vectors S and
+        centers Z of classes i and j, the coefficients b minimizing
+        ||sum_s a_s phi(s) - sum_z b_z phi(z)|| in feature space solve
+        (K_zz + ridge * I) b = K_zS a.
+        """
+        gamma = svc._gamma
+        support_vectors = svc.support_vectors_
+        bounds = np.concatenate([[0], np.cumsum(svc.n_support_)])
+
+        centers, center_classes = [], []
+        for c in range(len(svc.classes_)):
+            class_svs = support_vectors[bounds[c] : bounds[c + 1]]
+            n_centers = min(len(class_svs), max(1, int(np.ceil(ratio * len(class_svs)))))
+            kmeans = KMeans(
+                n_clusters=n_centers, n_init=1, random_state=random_state
+            ).fit(class_svs)
+            centers.append(kmeans.cluster_centers_)
+            center_classes.append(np.full(n_centers, c))
+        centers = np.vstack(centers)
+        center_classes = np.concatenate(center_classes)
+
+        kernel_zz = rbf_kernel(centers, centers, gamma=gamma)
+        # (n_centers, n_pairs): projections of every pair's expansion at once
+        projected = rbf_kernel(centers, support_vectors, gamma=gamma) @ get_pair_dual_coefs(svc)
+
+        i_idx, j_idx = ovo_pairs(len(svc.classes_))
+        pair_coef = np.zeros((len(i_idx), len(centers)))
+        for pair, (i, j) in enumerate(zip(i_idx, j_idx)):
+            members = np.flatnonzero((center_classes == i) | (center_classes == j))
+            pair_coef[pair, members] = np.linalg.solve(
+                kernel_zz[np.ix_(members, members)] + ridge * np.eye(len(members)),
+                projected[members, pair],
+            )
+
+        return cls(
+            basis_vectors=centers,
+            pair_coef=pair_coef,
+            intercept=svc.intercept_.copy(),
+            gamma=gamma,
+            classes=svc.classes_.copy(),
+            **kwargs,
+        )
+
+# EOF
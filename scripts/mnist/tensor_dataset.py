@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Timestamp: "2026-10-19 17:20:31 (ywatanabe)"
+# File: /home/ywatanabe/proj/scitex_template_research/scripts/mnist/tensor_dataset.py
+# ----------------------------------------
+from __future__ import annotations
+import os
+__FILE__ = (
+    "./scripts/mnist/tensor_dataset.py"
+)
+__DIR__ = os.path.dirname(__FILE__)
+# ----------------------------------------
+
+"""
+Functionality:
+    - Holds MNIST as one pre-normalized float32 tensor instead of PIL images
+    - Serves whole batches per index (slice or index tensor), with no
+      per-item transform or collation
+    - Kept in its own module so pickled loaders unpickle in any script
+Input:
+    - torchvision.datasets.MNIST (uint8 `data`, `targets`)
+Output:
+    - None
+Prerequisites:
+    - PyTorch
+
+Usage:
+    dataset = NormalizedMNIST.from_mnist(mnist, mean=(0.1307,), std=(0.3081,))
+    loader = make_loader(dataset, batch_size=64, shuffle=True)
+    for images, labels in loader:  # images: (64, 1, 28, 28) float32
+        ...
+"""
+
+"""Imports"""
+from typing import Iterator, Optional, Sequence, Tuple, Union
+
+import torch
+from torch.utils.data import DataLoader, Dataset, Sampler
+
+"""Functions & Classes"""
+class NormalizedMNIST(Dataset):
+    """MNIST images normalized once, indexed a batch at a time.
+
+    `dataset[i]` returns one (1, 28, 28) image and its label, like the
+    torchvision dataset; `dataset[slice]` and `dataset[index_tensor]` return
+    a whole batch.
+    """
+
+    def __init__(self, data: torch.Tensor, targets: torch.Tensor):
+        self.data = data
+        self.targets = targets
+
+    @classmethod
+    def from_mnist(
+        cls,
+        dataset: Dataset,
+        mean: Sequence[float],
+        std: Sequence[float],
+    ) -> "NormalizedMNIST":
+        """Converts uint8 (N, 28, 28) images to normalized (N, 1, 28, 28)."""
+        if isinstance(dataset, cls):
+            return dataset
+        data = dataset.data.unsqueeze(1).to(torch.float32).div_(255.0)
+        mean = torch.as_tensor(mean, dtype=torch.float32).view(1, -1, 1, 1)
+        std = torch.as_tensor(std, dtype=torch.float32).view(1, -1, 1, 1)
+        data.sub_(mean).div_(std)
+        return cls(data.contiguous(), dataset.targets.clone())
+
+    def __len__(self) -> int:
+        return len(self.targets)
+
+    def __getitem__(
+        self, index: Union[int, slice, torch.Tensor]
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        return self.data[index], self.targets[index]
+
+
+class BatchIndexSampler(Sampler):
+    """Yields one index per batch: a slice in order, or a permutation chunk.
+
+    Used with `DataLoader(..., sampler=..., batch_size=None)`, so each yielded
+    index is passed straight to `NormalizedMNIST.__getitem__`.
+    """
+
+    def __init__(
+        self,
+        n_samples: int,
+        batch_size: int,
+        shuffle: bool = False,
+        drop_last: bool = False,
+        generator: Optional[torch.Generator] = None,
+    ):
+        self.n_samples = n_samples
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+        self.generator = generator
+
+    def __len__(self) -> int:
+        if self.drop_last:
+            return self.n_samples // self.batch_size
+        return -(-self.n_samples // self.batch_size)
+
+    def __iter__(self) -> Iterator[Union[slice, torch.Tensor]]:
+        stop = len(self) * self.batch_size
+        if not self.shuffle:
+            for start in range(0, stop, self.batch_size):
+                yield slice(start, min(start + self.batch_size, self.n_samples))
+            return
+        # A fresh permutation per epoch; batches gather rows by fancy indexing
+        order = torch.randperm(self.n_samples, generator=self.generator)
+        yield from order[:stop].split(self.batch_size)
+
+
+def make_loader(
+    dataset: NormalizedMNIST,
+    batch_size: int,
+    shuffle: bool = False,
+    **loader_kwargs,
+) -> DataLoader:
+    """Returns a DataLoader that fetches whole batches from `dataset`."""
+    sampler = BatchIndexSampler(len(dataset), batch_size, shuffle=shuffle)
+    return DataLoader(dataset, sampler=sampler, batch_size=None, **loader_kwargs)
+
+# EOF
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Timestamp: "2026-10-19 16:58:37 (ywatanabe)"
+# File: /home/ywatanabe/proj/scitex_template_research/scripts/mnist/thread_budget.py
+# ----------------------------------------
+from __future__ import annotations
+import os
+__FILE__ = (
+    "./scripts/mnist/thread_budget.py"
+)
+__DIR__ = os.path.dirname(__FILE__)
+# ----------------------------------------
+
+"""
+Functionality:
+    - Resolves the CPU allowance of a session (env, config, scheduler, affinity)
+    - Splits it per section of main between a library's own parallelism
+      (n_jobs, numba, torch intra-op) and the BLAS/OpenMP pools beneath it
+    - Logs wall time, CPU time, effective cores and peak RSS per section
+Input:
+    - N_CPUS environment variable or CFG.RESOURCES.N_CPUS
+Output:
+    - Resource usage logs
+Prerequisites:
+    - threadpoolctl
+    - (optional) PyTorch, numba
+
+Usage:
+    budget = ThreadBudget(get_cpu_allowance(CFG.RESOURCES.N_CPUS))
+    with budget.section("umap", outer=budget.n_cpus) as alloc:
+        umap.UMAP(n_jobs=alloc.outer).fit_transform(data)
+"""
+
+"""Imports"""
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from typing import Iterator, NamedTuple, Optional
+
+from scitex import logging
+from threadpoolctl import threadpool_limits
+
+logger = logging.getLogger(__name__)
+
+"""Functions & Classes"""
+def get_cpu_allowance(config_value: Optional[int] = None) -> int:
+    """N_CPUS env > config > SLURM_CPUS_PER_TASK > CPU affinity of the process."""
+    for value in (
+        os.environ.get("N_CPUS"),
+        config_value,
+        os.environ.get("SLURM_CPUS_PER_TASK"),
+    ):
+        if value not in (None, "", "null"):
+            return max(1, int(value))
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+class Allocation(NamedTuple):
+    outer: int
+    blas: int
+
+
+class ThreadBudget:
+    """Divides a fixed number of CPUs between nested thread pools."""
+
+    def __init__(self, n_cpus: int):
+        self.n_cpus = n_cpus
+        logger.info(f"Thread budget: {n_cpus} CPU(s)")
+
+    def allocate(self, outer: int = 1, blas: Optional[int] = None) -> Allocation:
+        """`outer` workers each get n_cpus // outer BLAS threads unless given."""
+        outer = max(1, min(outer, self.n_cpus))
+        if blas is None:
+            blas = max(1, self.n_cpus // outer)
+        return Allocation(outer=outer, blas=blas)
+
+    @contextmanager
+    def section(
+        self, name: str, outer: int = 1, blas: Optional[int] = None
+    ) -> Iterator[Allocation]:
+        """Applies an allocation to BLAS/OpenMP, torch and numba for a block."""
+        alloc = self.allocate(outer, blas)
+
+        restore = []
+        if "torch" in sys.modules:
+            import torch
+
+            restore.append((torch.set_num_threads, torch.get_num_threads()))
+            torch.set_num_threads(alloc.outer)
+        if "numba" in sys.modules:
+            import numba
+
+            restore.append((numba.set_num_threads, numba.get_num_threads()))
+            numba.set_num_threads(min(alloc.outer, numba.config.NUMBA_NUM_THREADS))
+
+        usage_start = _cpu_seconds()
+        wall_start = time.perf_counter()
+        try:
+            with threadpool_limits(limits=alloc.blas):
+                yield alloc
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = _cpu_seconds() - usage_start
+            for setter, value in restore:
+                setter(value)
+            logger.info(
+                f"[{name}] outer={alloc.outer} blas={alloc.blas}: "
+                f"wall {wall:.1f} s, cpu {cpu:.1f} s, "
+                f"~{cpu / max(wall, 1e-9):.1f}/{self.n_cpus} cores, "
+                f"peak RSS {_peak_rss_mb():.0f} MB"
+            )
+
+
+def _cpu_seconds() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+# EOF
@@ -39,6 +39,7 @@ IO:
 
 """Imports"""
 import argparse
+from typing import List
 
 import scitex as stx
 from scitex import logging
@@ -53,15 +54,60 @@ logger = logging.getLogger(__name__)
 
 """Parameters"""
 # CONFIG = stx.io.load_configs()
+# The helpers referenced below (load_config, Checkpointer, fingerprint,
+# ThreadBudget) live in ./scripts/mnist/ and are imported as siblings there;
+# copy the module next to this script to use them.
+# Resolved, frozen and cached; no eval() needed (config_compiler.py):
+# from config_compiler import load_config
+# CFG = load_config()  # static values; CONFIG only for session keys (ID, SDIR)
 
 """Functions & Classes"""
 def main(args):
     # Avoid printing/logging functions here. Instead, implement in delegated code as much as possible.
+    # Write outputs under args.out_dir; in --batch mode it is this call's own subdirectory.
+    # For long-running stages, resume from the last checkpoint of an interrupted run
+    # (checkpoint.py; needs io_paths.py alongside):
+    # from checkpoint import Checkpointer, fingerprint
+    # ckpt = Checkpointer(
+    #     __FILE__, name="main", current_id=CONFIG.ID, key=fingerprint(vars(args))
+    # )
+    # state = ckpt.load() or {"step": 0}
+    # ...
+    # ckpt.maybe_save(lambda: {"step": step, "results": results})
+    # ckpt.clear()
+    # To keep nested thread pools within the session's CPU allowance
+    # (thread_budget.py and ./config/RESOURCES.yaml):
+    # from thread_budget import ThreadBudget, get_cpu_allowance
+    # budget = ThreadBudget(get_cpu_allowance(CFG.RESOURCES.N_CPUS))
+    # with budget.section("fit", outer=n_jobs) as alloc:
+    #     model = Model(n_jobs=alloc.outer).fit(X)
     return 0
 
 
-def parse_args() -> argparse.Namespace:
-    """Parse command line arguments."""
+def import_run_batch():
+    """Imports run_batch from ./scripts/batch_runner.py.
+
+    Searched upwards from this file, so copies of the template in
+    subdirectories of ./scripts/ find it too.
+    """
+    import importlib.util
+
+    search_dir = os.path.dirname(os.path.abspath(__file__))
+    while not os.path.isfile(os.path.join(search_dir, "batch_runner.py")):
+        parent_dir = os.path.dirname(search_dir)
+        if parent_dir == search_dir:
+            raise ImportError(f"batch_runner.py not found above {__file__}")
+        search_dir = parent_dir
+    spec = importlib.util.spec_from_file_location(
+        "batch_runner", os.path.join(search_dir, "batch_runner.py")
+    )
+    batch_runner = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(batch_runner)
+    return batch_runner.run_batch
+
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    """Parse command line arguments (sys.argv[1:] unless argv is given)."""
     import scitex as stx
 
     parser = argparse.ArgumentParser(description="")
@@ -80,7 +126,18 @@ def parse_args() -> argparse.Namespace:
     #     default=False,
     #     help="(default: %%(default)s)",
     # )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--batch",
+        default=None,
+        help="Run main() once per line of this file ('-' for stdin), each line holding this script's arguments (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--batch-workers",
+        type=int,
+        default=1,
+        help="Warm worker processes for --batch (default: %(default)s)",
+    )
+    args = parser.parse_args(argv)
     return args
 
 
@@ -105,7 +162,18 @@ def run_session() -> None:
         agg=True,
     )
 
-    exit_status = main(args)
+    if args.batch:
+        run_batch = import_run_batch()
+        exit_status = run_batch(
+            args.batch,
+            main,
+            parse_args,
+            batch_dir=os.path.join(CONFIG.SDIR, "batch"),
+            n_workers=args.batch_workers,
+        )
+    else:
+        args.out_dir = CONFIG.SDIR
+        exit_status = main(args)
 
     stx.session.close(
         CONFIG,
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Timestamp: "2026-10-19 22:41:17 (ywatanabe)"
+# File: /home/ywatanabe/proj/scitex_template_research/tests/conftest.py
+# ----------------------------------------
+from __future__ import annotations
+import os
+__FILE__ = (
+    "./tests/conftest.py"
+)
+__DIR__ = os.path.dirname(__FILE__)
+# ----------------------------------------
+
+"""
+Functionality:
+    - Makes the script directories importable from tests, as the scripts
+      import their sibling helper modules (from checkpoint import ...)
+"""
+
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for script_dir in ("scripts/mnist", "paper/scripts/python"):
+    sys.path.insert(0, os.path.join(ROOT, script_dir))
+
+# EOF
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Timestamp: "2026-10-19 23:05:18 (ywatanabe)"
+# File: /home/ywatanabe/proj/scitex_template_research/tests/paper/scripts/python/test_bib_scoring.py
+# ----------------------------------------
+from __future__ import annotations
+import os
+__FILE__ = (
+    "./tests/paper/scripts/python/test_bib_scoring.py"
+)
+__DIR__ = os.path.dirname(__FILE__)
+# ----------------------------------------
+
+import datetime
+
+import pytest
+
+import numpy as np
+
+from bib_scoring import FORMULAS, Scoring, parse_term, parse_weights
+from explore_bibtex import Paper, Papers
+
+
+@pytest.fixture
+def papers():
+    return Papers(
+        [
+            Paper(key="old", year=2000, citation_count=100, journal_impact_factor=2.0),
+            Paper(key="new", year=2024, citation_count=3, journal_impact_factor=None),
+            Paper(key="future", year=2026, citation_count=6),
+            Paper(key="undated", year=None, citation_count=10),
+        ]
+    )
+
+
+def score(papers, formula, **weights):
+    return Scoring([formula], weights=weights)(papers)
+
+
+def test_linear_fills_missing_with_zero(papers):
+    assert score(papers, "linear").tolist() == [120.0, 3.0, 6.0, 10.0]
+    assert score(papers, "linear", citations=0.5, impact_factor=1).tolist() == [
+        52.0,
+        1.5,
+        3.0,
+        5.0,
+    ]
+
+
+def test_citations_per_year(papers):
+    scores = score(papers, "citations_per_year", reference_year=2025)
+    # 2025 - 2026 is clamped to min_age, not negative; an unknown year gives NaN
+    assert scores[:3].tolist() == [4.0, 3.0, 6.0]
+    assert np.isnan(scores[3])
+
+
+def test_citations_per_year_min_age_clamps(papers):
+    scores = score(papers, "citations_per_year", reference_year=2025, min_age=3)
+    assert scores[:3].tolist() == [4.0, 1.0, 2.0]
+
+
+def test_citations_per_year_defaults_to_this_year():
+    this_year = datetime.date.today().year
+    papers = Papers([Paper(year=this_year - 4, citation_count=8)])
+    assert score(papers, "citations_per_year").tolist() == [2.0]
+
+
+def test_log_citations_if_offset(papers):
+    scores = score(papers, "log_citations_if")
+    assert np.allclose(scores, np.log1p([100, 3, 6, 10]) * [3.0, 1.0, 1.0, 1.0])
+    # Without the offset, papers lacking an impact factor all score 0
+    scores = score(papers, "log_citations_if", impact_factor_offset=0)
+    assert np.allclose(scores, [np.log1p(100) * 2.0, 0.0, 0.0, 0.0])
+
+
+def test_weighted_sum_of_formulas(papers):
+    scoring = Scoring(["linear", "0.5*log_citations_if"])
+    expected = score(papers, "linear") + 0.5 * score(papers, "log_citations_if")
+    assert np.allclose(scoring(papers), expected)
+    assert repr(scoring) == "linear + 0.5*log_citations_if"
+
+
+@pytest.mark.parametrize(
+    "term, expected",
+    [
+        ("linear", (1.0, "linear")),
+        ("2.5*linear", (2.5, "linear")),
+        ("-1* linear", (-1.0, "linear")),
+    ],
+)
+def test_parse_term(term, expected):
+    assert parse_term(term) == expected
+
+
+@pytest.mark.parametrize("term", ["x*linear", "*2*linear"])
+def test_parse_term_invalid(term):
+    with pytest.raises(ValueError, match="Invalid scoring term"):
+        parse_term(term)
+
+
+def test_parse_weights():
+    assert parse_weights(["min_age=2", " citations = 0.5"]) == {
+        "min_age": 2.0,
+        "citations": 0.5,
+    }
+
+
+@pytest.mark.parametrize("item", ["min_age", "min_age=", "min_age=two"])
+def test_parse_weights_invalid(item):
+    with pytest.raises(ValueError, match="expected key=value"):
+        parse_weights([item])
+
+
+def test_scoring_rejects_unknown_formula():
+    with pytest.raises(ValueError, match="Unknown scoring formula"):
+        Scoring(["nonexistent"])
+
+
+def test_scoring_rejects_weight_of_unselected_formula():
+    # min_age belongs to citations_per_year, which is not selected
+    with pytest.raises(ValueError, match=r"Unknown weight\(s\) min_age"):
+        Scoring(["linear"], weights={"min_age": 2})
+    assert Scoring(["linear", "citations_per_year"], weights={"min_age": 2})
+
+
+def test_builtin_formulas_registered():
+    assert set(FORMULAS) >= {"linear", "citations_per_year", "log_citations_if"}
+
+# EOF
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Timestamp: "2026-10-19 22:43:02 (ywatanabe)"
+# File: /home/ywatanabe/proj/scitex_template_research/tests/paper/scripts/python/test_explore_bibtex.py
+# ----------------------------------------
+from __future__ import annotations
+import os
+__FILE__ = (
+    "./tests/paper/scripts/python/test_explore_bibtex.py"
+)
+__DIR__ = os.path.dirname(__FILE__)
+# ----------------------------------------
+
+import pickle
+
+import pytest
+
+import bibtexparser
+import numpy as np
+from bibtexparser.bparser import BibTexParser
+
+from explore_bibtex import (
+    AuthorIndex,
+    AuthorName,
+    TextIndex,
+    _bib_cache_path,
+    _parse_blocks,
+    _read_bib_cache,
+    _record_from_entry,
+    _top_k,
+    iter_bibtex_entries,
+    load_bib_records,
+    normalize_author,
+    parse_query,
+    scan_citations,
+)
+
+ENTRIES = [
+    ("string", '@string{ieee = "IEEE Transactions"}'),
+    (
+        "article",
+        "@article{nested,\n"
+        "  title = {A {Nested {Deep}} Title},\n"
+        "  journal = ieee,\n"
+        "}",
+    ),
+    ("misc", '@misc(paren, note = "a ( in quotes", title = {b (c) d})'),
+    ("comment", "@comment{ignored}"),
+    ("inproceedings", '@inproceedings{last, title = "Quoted {Braces}, (parens"}'),
+]
+# Implicit comments between the entries, including a mid-line "@"
+BIB = (
+    "% contact foo@bar (2020) for questions\n"
+    + ENTRIES[0][1]
+    + "\n\n"
+    + ENTRIES[1][1]
+    + "\n  "
+    + ENTRIES[2][1]
+    + "\nFree text, e.g. user@example.com {unbalanced\n"
+    + ENTRIES[3][1]
+    + "\n"
+    + ENTRIES[4][1]
+    + "\n"
+)
+
+
+def expected_entries():
+    return [(entry_type, text, BIB.index(text)) for entry_type, text in ENTRIES]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 16, 64, 1 << 20])
+def test_iter_bibtex_entries_across_chunk_boundaries(tmp_path, chunk_size):
+    path = tmp_path / "refs.bib"
+    path.write_text(BIB)
+    entries = list(iter_bibtex_entries(path, chunk_size=chunk_size))
+    assert [tuple(entry) for entry in entries] == expected_entries()
+
+
+def test_iter_bibtex_entries_ignores_mid_line_at(tmp_path):
+    path = tmp_path / "refs.bib"
+    path.write_text("see foo@bar (2020)\n@misc{only, title = {x}}\n")
+    assert [entry.type for entry in iter_bibtex_entries(path)] == ["misc"]
+
+
+def test_iter_bibtex_entries_unterminated(tmp_path):
+    path = tmp_path / "refs.bib"
+    path.write_text("@article{open, title = {never closed}\n")
+    with pytest.raises(ValueError, match="Unterminated @article"):
+        list(iter_bibtex_entries(path, chunk_size=4))
+
+
+DOCS = [
+    ["Seizure prediction from EEG", "We predict seizures."],
+    ["Ictal onset zones", "Seizures and the ictal onset."],
+    ["Sleep staging", "Onset of sleep; ictal activity absent."],
+    ["Seizure", "Seizure seizure seizure detection."],
+]
+
+
+@pytest.fixture
+def index():
+    return TextIndex.build(DOCS)
+
+
+def test_parse_query():
+    assert parse_query('seizure "ictal onset" OR EEG-based "exact*" ') == [
+        [(("seizure",), True), (("ictal", "onset"), False)],
+        [(("eeg", "based"), True), (("exact",), True)],
+    ]
+    assert parse_query("  ") == []
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("seizure", [0, 1, 3]),  # bare words match as prefixes
+        ('"seizure"', [0, 3]),
+        ('"seizure*"', [0, 1, 3]),
+        ("seizure ictal", [1]),
+        ('"ictal onset"', [1]),
+        ('"onset ictal"', []),
+        ("sleep OR detection", [2, 3]),
+        # A phrase never spans the title and the abstract
+        ('"eeg we"', []),
+        ("", [0, 1, 2, 3]),
+    ],
+)
+def test_text_index_search(index, query, expected):
+    matched, _ = index.search(query)
+    assert np.flatnonzero(matched).tolist() == expected
+
+
+def test_text_index_ranks_by_bm25(index):
+    matched, scores = index.search('"seizure"')
+    assert scores[~matched].tolist() == [0.0, 0.0]
+    # Four occurrences in a short document outrank one
+    assert scores[3] > scores[0] > 0
+
+
+def test_text_index_state_round_trip(index):
+    restored = TextIndex.from_state(index.state())
+    for query in ("seizure", '"ictal onset"', "sleep OR detection"):
+        expected, expected_scores = index.search(query)
+        matched, scores = restored.search(query)
+        assert np.array_equal(matched, expected)
+        assert np.allclose(scores, expected_scores)
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("Müller, Hans-J.", ("muller", "hj")),
+        ('M{\\"u}ller, Hans-J.', ("muller", "hj")),
+        ("Hans J. Müller", ("muller", "hj")),
+        ("Ludwig van Beethoven", ("van beethoven", "l")),
+        ("van Beethoven, Jr., Ludwig", ("van beethoven", "l")),
+        ("{WHO Consortium}", ("who consortium", "")),
+        ("Smith", ("smith", "")),
+    ],
+)
+def test_normalize_author(name, expected):
+    assert normalize_author(name) == AuthorName(*expected)
+
+
+@pytest.fixture
+def author_index():
+    return AuthorIndex.build(
+        [
+            ["Müller, Hans", "Smith, Jane"],
+            ["Smith, John"],
+            ["Mueller, Hans"],
+            ["Smith"],
+            [],
+        ]
+    )
+
+
+@pytest.mark.parametrize(
+    "names, fuzzy, expected",
+    [
+        (["H. Muller"], False, [0]),
+        (["Smith"], False, [0, 1, 3]),  # bare last name: every initial
+        (["Jane Smith"], False, [0, 1]),  # same first initial
+        (["Jane Smith"], True, [0, 1, 3]),  # fuzzy: also no first name
+        (["Muller, H."], True, [0, 2]),  # fuzzy: close spelling
+        (["Nobody", "Mueller, Hans"], False, [2]),
+        ([], False, []),
+    ],
+)
+def test_author_index_mask(author_index, names, fuzzy, expected):
+    mask = author_index.mask(names, fuzzy=fuzzy)
+    assert len(mask) == 5
+    assert np.flatnonzero(mask).tolist() == expected
+
+
+TEX = r"""
+As shown \cite{plain1, plain2} and \citep[p.~3]{withnote}.
+\citet*{starred} and \Citeauthor{capital} agree.
+\parencite[see][12]{prenote} \textcites(pre)(post)[a][b]{multi1}[c]{multi2}
+\footcitetext{foot} \nocite{nocited} \autocite{auto}
+\cite{split1,
+      split2}
+% \cite{commented}
+50\% of \cite{afterpercent} cases.
+\citestyle{numeric} \bibliographystyle{plain}
+"""
+
+
+def test_scan_citations():
+    assert scan_citations(TEX) == {
+        "plain1",
+        "plain2",
+        "withnote",
+        "starred",
+        "capital",
+        "prenote",
+        "multi1",
+        "multi2",
+        "foot",
+        "nocited",
+        "auto",
+        "split1",
+        "split2",
+        "afterpercent",
+    }
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_top_k_matches_stable_argsort(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(1, 200))
+    # Few distinct values, so most k-th values are tied
+    values = rng.integers(-3, 4, n).astype(np.float64)
+    values[rng.random(n) < 0.1] = np.inf
+    expected = np.argsort(values, kind="stable")
+    for k in range(n):
+        assert np.array_equal(_top_k(values, k), expected[:k])
+
+
+MIXED_BIB = """@string{jn = "Journal of Tests"}
+@article{first, title = {First}, journal = jn, year = {2020}}
+@online{web, title = {A web page}}
+@article{dup, title = {Dup one}}
+@misc{bad, title = {x}, author = }
+@article{dup, title = {Dup two}, citation_count = {5}}
+@software{tool, title = {A tool}}
+@book{last, title = {Last}, year = {n.d.}}
+"""
+
+
+def reference_records(text):
+    entries = bibtexparser.loads(text, parser=BibTexParser()).entries
+    return [_record_from_entry(entry) for entry in entries]
+
+
+def reparsed(path):
+    return _read_bib_cache(_bib_cache_path(path))["n_reparsed"]
+
+
+@pytest.mark.parametrize("use_cache", [False, True])
+def test_load_bib_records_matches_bibtexparser(tmp_path, use_cache):
+    path = tmp_path / "refs.bib"
+    path.write_text(MIXED_BIB)
+    records = load_bib_records(path, use_cache=use_cache)
+    # Non-standard and malformed blocks dropped, duplicates kept in order
+    assert [r["title"] for r in records] == ["First", "Dup one", "Dup two", "Last"]
+    assert records[0]["journal"] == "Journal of Tests"
+    assert records == reference_records(MIXED_BIB)
+
+
+def test_parse_blocks_maps_records_to_blocks():
+    blocks = [
+        "@article{dup, title = {One}}",
+        "@online{web, title = {Skipped}}",
+        "@misc{bad, title = {x}, author = }",
+        "@article{dup, title = {Two}}",
+    ]
+    per_block = _parse_blocks(blocks, "")
+    assert [[r["title"] for r in records] for records in per_block] == [
+        ["One"],
+        [],
+        [],
+        ["Two"],
+    ]
+    assert _parse_blocks(["@online{web, title = {x}}"], "") == [[]]
+
+
+def test_load_bib_records_reparses_changed_blocks_only(tmp_path):
+    path = tmp_path / "refs.bib"
+    path.write_text(MIXED_BIB)
+    load_bib_records(path)
+    # The @online/@software blocks are hashed too, so 7 entry blocks
+    assert reparsed(path) == 7
+
+    edited = MIXED_BIB.replace("{Dup two}", "{Dup two, revised}")
+    path.write_text(edited)
+    records = load_bib_records(path)
+    assert reparsed(path) == 1
+    assert records == reference_records(edited)
+    assert records[2]["title"] == "Dup two, revised"
+
+
+def test_load_bib_records_string_edit_invalidates_all(tmp_path):
+    path = tmp_path / "refs.bib"
+    path.write_text(MIXED_BIB)
+    load_bib_records(path)
+
+    edited = MIXED_BIB.replace("Journal of Tests", "Journal of Retests")
+    path.write_text(edited)
+    records = load_bib_records(path)
+    assert reparsed(path) == 7
+    assert records[0]["journal"] == "Journal of Retests"
+    assert records == reference_records(edited)
+
+
+def test_load_bib_records_touched_file_reuses_cache(tmp_path):
+    path = tmp_path / "refs.bib"
+    path.write_text(MIXED_BIB)
+    expected = load_bib_records(path)
+    cache_path = _bib_cache_path(path)
+    cache = _read_bib_cache(cache_path)
+    cache["n_reparsed"] = -1
+    with open(cache_path, "wb") as f:
+        pickle.dump(cache, f)
+
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert load_bib_records(path) == expected
+    # Same content: restamped, not reparsed
+    assert reparsed(path) == -1
+
+# EOF
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Timestamp: "2026-10-20 10:04:11 (ywatanabe)"
+# File: /home/ywatanabe/proj/scitex_template_research/tests/scripts/mnist/conftest.py
+# ----------------------------------------
+from __future__ import annotations
+import os
+__FILE__ = (
+    "./tests/scripts/mnist/conftest.py"
+)
+__DIR__ = os.path.dirname(__FILE__)
+# ----------------------------------------
+
+"""
+Functionality:
+    - Shared fixtures for the scripts/mnist tests
+"""
+
+import pytest
+from sklearn.datasets import load_digits
+from sklearn.svm import SVC
+
+
+@pytest.fixture(scope="session")
+def fitted_svc():
+    """RBF SVC fit on 1000 scikit-learn digits, plus the held-out rest."""
+    X, y = load_digits(return_X_y=True)
+    X = X / 16.0
+    svc = SVC(kernel="rbf", gamma="scale").fit(X[:1000], y[:1000])
+    return svc, X[1000:], y[1000:]
+
+# EOF
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Timestamp: "2026-10-19 23:14:26 (ywatanabe)"
+# File: /home/ywatanabe/proj/scitex_template_research/tests/scripts/mnist/test_bootstrap_metrics.py
+# ----------------------------------------
+from __future__ import annotations
+import os
+__FILE__ = (
+    "./tests/scripts/mnist/test_bootstrap_metrics.py"
+)
+__DIR__ = os.path.dirname(__FILE__)
+# ----------------------------------------
+
+import numpy as np
+import pytest
+from sklearn.metrics import accuracy_score, confusion_matrix, f1_score
+
+from bootstrap_metrics import (
+    batched_confusion_matrices,
+    bootstrap_metrics,
+    metrics_from_confusion,
+)
+
+
+@pytest.fixture
+def rows():
+    rng = np.random.default_rng(0)
+    labels = rng.integers(0, 4, size=(5, 60))
+    predictions = np.where(
+        rng.random(labels.shape) < 0.7, labels, rng.integers(0, 4, labels.shape)
+    )
+    # A resample where class 3 is neither a label nor a prediction
+    labels[0] %= 3
+    predictions[0] %= 3
+    return labels, predictions
+
+
+def test_batched_confusion_matrices(rows):
+    labels, predictions = rows
+    cms = batched_confusion_matrices(labels, predictions, 4)
+    for cm, y_true, y_pred in zip(cms, labels, predictions):
+        assert np.array_equal(
+            cm, confusion_matrix(y_true, y_pred, labels=range(4))
+        )
+
+
+def test_metrics_from_confusion_match_sklearn(rows):
+    labels, predictions = rows
+    metrics = metrics_from_confusion(
+        batched_confusion_matrices(labels, predictions, 4)
+    )
+    for i_row, (y_true, y_pred) in enumerate(zip(labels, predictions)):
+        assert metrics["accuracy"][i_row] == pytest.approx(
+            accuracy_score(y_true, y_pred)
+        )
+        assert np.allclose(
+            metrics["f1"][i_row],
+            f1_score(y_true, y_pred, labels=range(4), average=None, zero_division=0),
+        )
+        assert metrics["macro_f1"][i_row] == pytest.approx(
+            f1_score(y_true, y_pred, average="macro")
+        )
+
+
+def test_bootstrap_metrics(rows):
+    labels, predictions = rows[0][1], rows[1][1]
+    table = bootstrap_metrics(labels, predictions, n_boot=300, random_state=0)
+    assert table["metric"].tolist() == [
+        "accuracy", "macro_f1", "f1_0", "f1_1", "f1_2", "f1_3"
+    ]
+    estimates = table.set_index("metric")["estimate"]
+    assert estimates["accuracy"] == pytest.approx(accuracy_score(labels, predictions))
+    assert estimates["macro_f1"] == pytest.approx(
+        f1_score(labels, predictions, average="macro")
+    )
+    assert (table["ci_lower"] <= table["estimate"]).all()
+    assert (table["estimate"] <= table["ci_upper"]).all()
+
+
+def test_bootstrap_metrics_independent_of_n_jobs(rows):
+    labels, predictions = rows[0][1], rows[1][1]
+    kwargs = dict(n_boot=120, random_state=1, chunk_size=50)
+    serial = bootstrap_metrics(labels, predictions, n_jobs=1, **kwargs)
+    parallel = bootstrap_metrics(labels, predictions, n_jobs=2, **kwargs)
+    assert serial.equals(parallel)
+
+# EOF
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Timestamp: "2026-10-20 09:31:47 (ywatanabe)"
+# File: /home/ywatanabe/proj/scitex_template_research/tests/scripts/mnist/test_checkpoint.py
+# ----------------------------------------
+from __future__ import annotations
+import os
+__FILE__ = (
+    "./tests/scripts/mnist/test_checkpoint.py"
+)
+__DIR__ = os.path.dirname(__FILE__)
+# ----------------------------------------
+
+import random
+
+import numpy as np
+import pytest
+
+from checkpoint import Checkpointer, find_incomplete_sessions, fingerprint
+
+
+@pytest.fixture
+def script(tmp_path):
+    return str(tmp_path / "train.py")
+
+
+def test_save_load_round_trip(script):
+    ckpt = Checkpointer(script, name="train", key="abc")
+    path = ckpt.save({"epoch": 3, "weights": np.arange(4)})
+    assert path == os.path.join(str(script)[:-3] + "_out", "checkpoints", "train.pkl")
+
+    state = Checkpointer(script, name="train", key="abc").load()
+    assert state["epoch"] == 3
+    assert np.array_equal(state["weights"], np.arange(4))
+
+
+def test_missing_or_disabled_resume(script):
+    assert Checkpointer(script).load() is None
+    Checkpointer(script).save({"step": 1})
+    assert Checkpointer(script, resume=False).load() is None
+
+
+def test_key_mismatch_discards_checkpoint(script):
+    Checkpointer(script, key=fingerprint({"lr": 0.1})).save({"step": 5})
+    ckpt = Checkpointer(script, key=fingerprint({"lr": 0.01}))
+    assert ckpt.load() is None
+    assert not os.path.exists(ckpt.path)
+
+
+def test_failed_save_keeps_previous_checkpoint(script):
+    ckpt = Checkpointer(script)
+    ckpt.save({"step": 1})
+    with pytest.raises(Exception):
+        ckpt.save({"step": 2, "unpicklable": lambda: None})
+    assert Checkpointer(script).load() == {"step": 1}
+    assert os.listdir(os.path.dirname(ckpt.path)) == ["checkpoint.pkl"]
+
+
+def test_load_restores_rng_states(script):
+    random.seed(0)
+    np.random.seed(0)
+    Checkpointer(script).save({})
+    expected = (random.random(), np.random.rand(3))
+
+    random.seed(1)
+    np.random.seed(1)
+    Checkpointer(script).load()
+    assert random.random() == expected[0]
+    assert np.array_equal(np.random.rand(3), expected[1])
+
+
+def test_maybe_save_interval(script):
+    ckpt = Checkpointer(script, interval_sec=3600)
+    assert not ckpt.maybe_save(lambda: {"step": 1})
+    assert ckpt.load() is None
+    assert ckpt.maybe_save(lambda: {"step": 2}, force=True)
+    assert ckpt.load() == {"step": 2}
+
+    ckpt.interval_sec = 0
+    assert ckpt.maybe_save(lambda: {"step": 3})
+    assert ckpt.load() == {"step": 3}
+    ckpt.clear()
+    assert ckpt.load() is None
+
+
+def test_find_incomplete_sessions(tmp_path):
+    running = tmp_path / "RUNNING"
+    for name in ("2026Y-A", "2026Y-B", "current"):
+        (running / name).mkdir(parents=True)
+    (running / "stray.txt").write_text("")
+    assert find_incomplete_sessions(str(tmp_path), current_id="current") == [
+        str(running / "2026Y-A"),
+        str(running / "2026Y-B"),
+    ]
+    assert find_incomplete_sessions(str(tmp_path / "missing")) == []
+
+
+def test_fingerprint():
+    data = np.arange(6, dtype=np.float32)
+    base = fingerprint({"a": 1, "b": 2}, data)
+    assert fingerprint({"b": 2, "a": 1}, data.copy()) == base
+    assert fingerprint({"a": 1, "b": 3}, data) != base
+    assert fingerprint({"a": 1, "b": 2}, data.astype(np.float64)) != base
+    assert fingerprint({"a": 1, "b": 2}, data.reshape(2, 3)) != base
+    changed = data.copy()
+    changed[-1] += 1
+    assert fingerprint({"a": 1, "b": 2}, changed) != base
+    # Parts are delimited, so ("ab", "c") and ("a", "bc") differ
+    assert fingerprint("ab", "c") != fingerprint("a", "bc")
+
+# EOF
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Timestamp: "2026-10-19 23:34:12 (ywatanabe)"
+# File: /home/ywatanabe/proj/scitex_template_research/tests/scripts/mnist/test_chunked_array.py
+# ----------------------------------------
+from __future__ import annotations
+import os
+__FILE__ = (
+    "./tests/scripts/mnist/test_chunked_array.py"
+)
+__DIR__ = os.path.dirname(__FILE__)
+# ----------------------------------------
+
+import time
+
+import numpy as np
+import pytest
+
+from chunked_array import (
+    CODECS,
+    ChunkedArray,
+    chunked_path,
+    open_array,
+    resolve_array_path,
+    save_chunked,
+)
+
+
+@pytest.fixture
+def array():
+    rng = np.random.default_rng(0)
+    return rng.random((1003, 4, 3)).astype(np.float32)
+
+
+@pytest.mark.parametrize("codec", sorted(CODECS))
+@pytest.mark.parametrize("shuffle", [True, False])
+def test_round_trip(tmp_path, array, codec, shuffle):
+    path = str(tmp_path / "array.npc")
+    save_chunked(path, array, chunk_rows=100, codec=codec, shuffle=shuffle)
+    chunked = ChunkedArray(path)
+    assert chunked.shape == array.shape
+    assert chunked.dtype == array.dtype
+    assert len(chunked) == len(array)
+    assert np.array_equal(np.asarray(chunked), array)
+
+
+def test_round_trip_integer_and_1d(tmp_path):
+    labels = np.arange(257, dtype=np.uint8)
+    path = str(tmp_path / "labels.npc")
+    save_chunked(path, labels, chunk_rows=16)
+    assert np.array_equal(ChunkedArray(path).read(), labels)
+
+
+@pytest.mark.parametrize(
+    "key",
+    [
+        0,
+        -1,
+        np.int64(250),
+        slice(95, 305),
+        slice(None, None, 7),
+        slice(-10, None),
+        np.array([5, 999, 5, 0, -3]),
+        np.array([[1, 2], [300, 400]]),
+        (slice(10, 20), 2),
+        (np.array([3, 700]), slice(None), 1),
+        (Ellipsis, 0),
+    ],
+)
+def test_indexing_matches_numpy(tmp_path, array, key):
+    path = str(tmp_path / "array.npc")
+    save_chunked(path, array, chunk_rows=100)
+    chunked = ChunkedArray(path, cache_mb=0.01)
+    assert np.array_equal(chunked[key], array[key])
+
+
+def test_boolean_mask_and_bounds(tmp_path, array):
+    path = str(tmp_path / "array.npc")
+    save_chunked(path, array, chunk_rows=100)
+    chunked = ChunkedArray(path)
+    mask = np.arange(len(array)) % 3 == 0
+    assert np.array_equal(chunked[mask], array[mask])
+    with pytest.raises(IndexError):
+        chunked[len(array)]
+    with pytest.raises(IndexError):
+        chunked[np.array([0, len(array)])]
+
+
+def test_unknown_codec(tmp_path, array):
+    with pytest.raises(ValueError, match="Unknown codec"):
+        save_chunked(str(tmp_path / "array.npc"), array, codec="nope")
+
+
+def test_open_array_picks_newer_file(tmp_path, array):
+    npy_path = str(tmp_path / "array.npy")
+    np.save(npy_path, array * 0)
+    assert resolve_array_path(npy_path) == npy_path
+    assert isinstance(open_array(npy_path), np.memmap)
+
+    save_chunked(chunked_path(npy_path), array, chunk_rows=100)
+    # A kept .npy older than the .npc does not shadow it
+    past = time.time() - 60
+    os.utime(npy_path, (past, past))
+    assert resolve_array_path(npy_path) == chunked_path(npy_path)
+    assert np.array_equal(open_array(npy_path)[:], array)
+
+# EOF
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Timestamp: "2026-10-19 23:41:55 (ywatanabe)"
+# File: /home/ywatanabe/proj/scitex_template_research/tests/scripts/mnist/test_config_compiler.py
+# ----------------------------------------
+from __future__ import annotations
+import os
+__FILE__ = (
+    "./tests/scripts/mnist/test_config_compiler.py"
+)
+__DIR__ = os.path.dirname(__FILE__)
+# ----------------------------------------
+
+import pickle
+
+import pytest
+
+import config_compiler
+from config_compiler import ConfigError, FrozenConfig, compile_config, load_config
+
+PATH_YAML = """\
+PATH:
+  ROOT: "./data"
+  MNIST:
+    DIR: f"{CONFIG.PATH.ROOT}/mnist"
+    MODEL: f"{CONFIG.PATH.MNIST.DIR}/model_{CONFIG.MNIST.NAME}.pkl"
+    LITERAL: f"{{not a reference}}"
+"""
+MNIST_YAML = """\
+MNIST:
+  NAME: svm
+  MEAN: "(0.1307,)"
+  LABELS: [0, 1, 2]
+  TEXT: "(not a literal"
+"""
+
+
+@pytest.fixture
+def config_dir(tmp_path):
+    (tmp_path / "PATH.yaml").write_text(PATH_YAML)
+    (tmp_path / "MNIST.yaml").write_text(MNIST_YAML)
+    return tmp_path
+
+
+def test_resolves_references_and_literals(config_dir):
+    config = load_config(str(config_dir))
+    assert config.PATH.MNIST.DIR == "./data/mnist"
+    assert config.PATH.MNIST.MODEL == "./data/mnist/model_svm.pkl"
+    assert config.PATH.MNIST.LITERAL == "{not a reference}"
+    assert config.MNIST.MEAN == (0.1307,)
+    assert config.MNIST.LABELS == (0, 1, 2)
+    assert config.MNIST.TEXT == "(not a literal"
+    assert config["MNIST"]["NAME"] == "svm"
+
+
+def test_frozen(config_dir):
+    config = load_config(str(config_dir))
+    with pytest.raises(AttributeError, match="read-only"):
+        config.MNIST.NAME = "cnn"
+    with pytest.raises(AttributeError, match="No config key"):
+        config.MNIST.MISSING
+    assert pickle.loads(pickle.dumps(config)) == config
+    assert config.to_dict()["MNIST"]["LABELS"] == (0, 1, 2)
+
+
+@pytest.mark.parametrize(
+    "yaml_text, message",
+    [
+        ('A: f"{CONFIG.B}"\n', "Unknown reference"),
+        ('A: f"{CONFIG.B}"\nB: f"{CONFIG.A}"\n', "Circular reference"),
+        ('A: f"{__import__(\'os\')}"\n', "Only {CONFIG.KEY} references"),
+    ],
+)
+def test_rejects_bad_references(tmp_path, yaml_text, message):
+    path = tmp_path / "BAD.yaml"
+    path.write_text(yaml_text)
+    with pytest.raises(ConfigError, match=message):
+        compile_config([str(path)])
+
+
+def test_cache_skips_parsing_until_yaml_changes(config_dir, monkeypatch):
+    first = load_config(str(config_dir))
+    assert (config_dir / ".compiled.pkl").exists()
+
+    def fail(paths):
+        raise AssertionError("YAML parsed despite a valid cache")
+
+    monkeypatch.setattr(config_compiler, "compile_config", fail)
+    assert load_config(str(config_dir)) == first
+    # Touched but identical: confirmed by hash, still not parsed
+    os.utime(config_dir / "MNIST.yaml", ns=(0, 0))
+    assert load_config(str(config_dir)) == first
+
+    monkeypatch.undo()
+    (config_dir / "MNIST.yaml").write_text(MNIST_YAML.replace("svm", "cnn"))
+    assert load_config(str(config_dir)).PATH.MNIST.MODEL.endswith("model_cnn.pkl")
+
+
+def test_corrupt_cache_is_ignored(config_dir):
+    (config_dir / ".compiled.pkl").write_bytes(b"not a pickle")
+    assert load_config(str(config_dir)).MNIST.NAME == "svm"
+    (config_dir / ".compiled.pkl").write_bytes(pickle.dumps(["not", "a", "dict"]))
+    assert isinstance(load_config(str(config_dir)), FrozenConfig)
+
+# EOF
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Timestamp: "2026-10-20 09:52:26 (ywatanabe)"
+# File: /home/ywatanabe/proj/scitex_template_research/tests/scripts/mnist/test_feature_store.py
+# ----------------------------------------
+from __future__ import annotations
+import os
+__FILE__ = (
+    "./tests/scripts/mnist/test_feature_store.py"
+)
+__DIR__ = os.path.dirname(__FILE__)
+# ----------------------------------------
+
+import numpy as np
+import pytest
+
+from feature_store import FeatureStore
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    paths = {}
+    for split, seed in (("train", 0), ("test", 1)):
+        paths[split] = str(tmp_path / f"{split}.npy")
+        np.save(paths[split], np.random.default_rng(seed).random((20, 4)))
+    return paths
+
+
+def store_features(store, name, split, input_path, fit_inputs=None):
+    params = {"n_components": 2}
+    key = store.lookup(name, input_path, 1, params, fit_inputs)
+    if key is not None:
+        store.set_current(name, split, key)
+        return key
+    data = np.load(input_path)
+    out = store.create(
+        name, split, input_path, 1, params, shape=(len(data), 2),
+        fit_inputs=fit_inputs,
+    )
+    out[:] = data[:, :2]
+    store.commit(out)
+    return None
+
+
+def test_store_lookup_and_load(tmp_path, inputs):
+    store = FeatureStore(str(tmp_path / "features"))
+    assert store_features(store, "pooled", "train", inputs["train"]) is None
+    assert store_features(store, "pooled", "train", inputs["train"]) is not None
+    assert np.allclose(
+        store.load("pooled", "train"), np.load(inputs["train"])[:, :2]
+    )
+    with pytest.raises(KeyError, match="No 'pooled' features"):
+        store.load("pooled", "test")
+
+
+def test_load_refuses_changed_input(tmp_path, inputs):
+    store = FeatureStore(str(tmp_path / "features"))
+    store_features(store, "pooled", "test", inputs["test"])
+    np.save(inputs["test"], np.zeros((20, 4)))
+    with pytest.raises(ValueError, match="stale"):
+        store.load("pooled", "test")
+    os.remove(inputs["test"])
+    with pytest.raises(ValueError, match="missing"):
+        store.load("pooled", "test")
+
+
+def test_load_refuses_changed_fit_input(tmp_path, inputs):
+    store = FeatureStore(str(tmp_path / "features"))
+    fit_inputs = {"fit_on": inputs["train"]}
+    store_features(store, "pca", "test", inputs["test"], fit_inputs)
+    assert store.load("pca", "test").shape == (20, 2)
+
+    # Test features projected with a PCA fit on the old train data
+    np.save(inputs["train"], np.zeros((20, 4)))
+    with pytest.raises(ValueError, match="stale"):
+        store.load("pca", "test")
+    # Re-extracting against the new train data stores a new key
+    assert store_features(store, "pca", "test", inputs["test"], fit_inputs) is None
+    assert store.load("pca", "test").shape == (20, 2)
+
+# EOF
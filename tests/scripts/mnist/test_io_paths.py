@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Timestamp: "2026-10-20 09:18:04 (ywatanabe)"
+# File: /home/ywatanabe/proj/scitex_template_research/tests/scripts/mnist/test_io_paths.py
+# ----------------------------------------
+from __future__ import annotations
+import os
+__FILE__ = (
+    "./tests/scripts/mnist/test_io_paths.py"
+)
+__DIR__ = os.path.dirname(__FILE__)
+# ----------------------------------------
+
+from io_paths import get_out_dir, link_from_cwd
+
+
+def test_get_out_dir():
+    assert get_out_dir("./scripts/mnist/download.py") == "./scripts/mnist/download_out"
+
+
+def test_link_from_cwd_replaces_existing_link(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for content in ("old", "new"):
+        out_path = tmp_path / "script_out" / content / "array.npc"
+        out_path.parent.mkdir(parents=True)
+        out_path.write_text(content)
+        link_from_cwd("./data/array.npc", str(out_path))
+    assert os.path.islink("./data/array.npc")
+    assert open("./data/array.npc").read() == "new"
+
+# EOF
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Timestamp: "2026-10-19 23:20:03 (ywatanabe)"
+# File: /home/ywatanabe/proj/scitex_template_research/tests/scripts/mnist/test_roc_pr.py
+# ----------------------------------------
+from __future__ import annotations
+import os
+__FILE__ = (
+    "./tests/scripts/mnist/test_roc_pr.py"
+)
+__DIR__ = os.path.dirname(__FILE__)
+# ----------------------------------------
+
+import numpy as np
+import pytest
+from sklearn.metrics import (
+    average_precision_score,
+    f1_score,
+    precision_recall_curve,
+    roc_auc_score,
+    roc_curve,
+)
+
+from roc_pr import one_vs_rest_curves
+
+CLASSES = [0, 1, 2]
+
+
+@pytest.fixture(params=[0, 1])
+def scored(request):
+    rng = np.random.default_rng(request.param)
+    labels = rng.integers(0, 3, 300)
+    scores = rng.normal(size=(300, 3)) + 1.5 * np.eye(3)[labels]
+    if request.param:
+        # Coarse scores, so many thresholds are tied
+        scores = np.round(scores, 1)
+    return labels, scores
+
+
+def test_matches_sklearn_curves(scored):
+    labels, scores = scored
+    curves = one_vs_rest_curves(labels, scores, CLASSES)
+    for col, cls in enumerate(CLASSES):
+        target = labels == cls
+        curve = curves[cls]
+        fpr, tpr, _ = roc_curve(target, scores[:, col], drop_intermediate=False)
+        # sklearn prepends an (inf, 0, 0) point; the curves agree otherwise
+        assert np.allclose(curve["fpr"], fpr)
+        assert np.allclose(curve["tpr"], tpr)
+        assert curve["auc"] == pytest.approx(roc_auc_score(target, scores[:, col]))
+
+        precision, recall, thresholds = precision_recall_curve(
+            target, scores[:, col]
+        )
+        # sklearn orders by increasing threshold and appends (1, 0)
+        assert np.allclose(curve["precision"], precision[-2::-1])
+        assert np.allclose(curve["recall"], recall[-2::-1])
+        assert np.allclose(curve["thresholds"], thresholds[::-1])
+        assert curve["ap"] == pytest.approx(
+            average_precision_score(target, scores[:, col])
+        )
+
+
+def test_precision_recall_give_f1_at_each_threshold(scored):
+    labels, scores = scored
+    curve = one_vs_rest_curves(labels, scores, CLASSES)[1]
+    precision, recall = curve["precision"], curve["recall"]
+    for i_threshold in (0, len(precision) // 2, len(precision) - 1):
+        threshold = curve["thresholds"][i_threshold]
+        expected = f1_score(labels == 1, scores[:, 1] >= threshold)
+        p, r = precision[i_threshold], recall[i_threshold]
+        assert 2 * p * r / (p + r) == pytest.approx(expected)
+
+# EOF
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Timestamp: "2026-10-19 23:05:48 (ywatanabe)"
+# File: /home/ywatanabe/proj/scitex_template_research/tests/scripts/mnist/test_svm_predictor.py
+# ----------------------------------------
+from __future__ import annotations
+import os
+__FILE__ = (
+    "./tests/scripts/mnist/test_svm_predictor.py"
+)
+__DIR__ = os.path.dirname(__FILE__)
+# ----------------------------------------
+
+import numpy as np
+import pytest
+
+from svm_predictor import BlockedRBFPredictor, ovo_votes
+
+
+
+@pytest.mark.parametrize("block_size, n_jobs", [(2048, 1), (37, 1), (64, 3)])
+def test_matches_svc(fitted_svc, block_size, n_jobs):
+    svc, X, _ = fitted_svc
+    predictor = BlockedRBFPredictor.from_svc(
+        svc, block_size=block_size, n_jobs=n_jobs
+    )
+    assert np.array_equal(predictor.predict(X), svc.predict(X))
+    assert np.allclose(
+        predictor.decision_function(X), svc.decision_function(X), atol=1e-8
+    )
+    svc.decision_function_shape = "ovo"
+    try:
+        ovo = svc.decision_function(X)
+    finally:
+        svc.decision_function_shape = "ovr"
+    assert np.allclose(predictor.decision_function(X, shape="ovo"), ovo, atol=1e-8)
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float16"])
+def test_reduced_precision_storage(fitted_svc, dtype):
+    svc, X, _ = fitted_svc
+    predictor = BlockedRBFPredictor.from_svc(svc, dtype=dtype)
+    full = BlockedRBFPredictor.from_svc(svc)
+    assert predictor.nbytes < full.nbytes
+    assert np.mean(predictor.predict(X) == svc.predict(X)) >= 0.99
+
+
+def test_ovo_votes_break_ties_like_libsvm():
+    # Three classes, pairs (0, 1), (0, 2), (1, 2): one vote each
+    decisions = np.array([[1.0, -1.0, 1.0]])
+    votes = ovo_votes(decisions, 3)
+    assert votes.tolist() == [[1, 1, 1]]
+    assert votes.argmax(axis=1).tolist() == [0]
+
+
+def test_verify(fitted_svc):
+    svc, X, _ = fitted_svc
+    report = BlockedRBFPredictor.from_svc(svc).verify(svc, X)
+    assert report["agreement"] == 1.0
+    assert report["within_tolerance"]
+    assert report["speedup"] > 0
+
+# EOF
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Timestamp: "2026-10-19 23:26:40 (ywatanabe)"
+# File: /home/ywatanabe/proj/scitex_template_research/tests/scripts/mnist/test_svm_reduction.py
+# ----------------------------------------
+from __future__ import annotations
+import os
+__FILE__ = (
+    "./tests/scripts/mnist/test_svm_reduction.py"
+)
+__DIR__ = os.path.dirname(__FILE__)
+# ----------------------------------------
+
+import pickle
+
+import numpy as np
+
+from svm_reduction import ReducedSetSVC
+
+
+
+def test_full_ratio_reproduces_svc(fitted_svc):
+    svc, X, _ = fitted_svc
+    reduced = ReducedSetSVC.from_svc(svc, ratio=1.0, ridge=1e-10, random_state=0)
+    assert reduced.n_basis == len(svc.support_vectors_)
+    assert np.array_equal(reduced.predict(X), svc.predict(X))
+
+
+def test_reduced_set_keeps_accuracy(fitted_svc):
+    svc, X, y = fitted_svc
+    reduced = ReducedSetSVC.from_svc(svc, ratio=0.3, random_state=0)
+    assert reduced.n_basis <= 0.3 * len(svc.support_vectors_) + len(svc.classes_)
+    assert np.mean(reduced.predict(X) == svc.predict(X)) >= 0.95
+    assert np.mean(reduced.predict(X) == y) >= np.mean(svc.predict(X) == y) - 0.03
+
+
+def test_deterministic_and_picklable(fitted_svc):
+    svc, X, _ = fitted_svc
+    reduced = ReducedSetSVC.from_svc(svc, ratio=0.2, random_state=0)
+    again = ReducedSetSVC.from_svc(svc, ratio=0.2, random_state=0)
+    restored = pickle.loads(pickle.dumps(reduced))
+    assert np.array_equal(
+        reduced.decision_function(X), again.decision_function(X)
+    )
+    assert np.array_equal(restored.predict(X), reduced.predict(X))
+
+# EOF